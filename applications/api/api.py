@@ -0,0 +1,141 @@
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from applications import ingest
+from applications.api.serializers import (
+    ApplicationDetailSerializer, ApplicationSerializer, StageSerializer, SubmissionSerializer
+)
+from applications.models import Application
+from jobs.models import JobPosting
+from resume_builder.models import Resume
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This idempotency key was already used for a different posting or resume.'
+    default_code = 'idempotency_key_reused'
+
+
+class ApplicationViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin,
+                         viewsets.GenericViewSet):
+    """
+    Applications to job postings, visible to the applicant and the posting's owner.
+
+    POST {"posting", "resume", "idempotency_key", "cover_letter"} applies with a
+    snapshot of the resume (the key may also come in an ``Idempotency-Key``
+    header); resubmitting with the same key answers 200 with the original
+    application, reusing it for another posting or resume a 409. ``batch/`` takes up to ``batch_max_items`` of them at once.
+    Applicants withdraw with DELETE; posting owners move applications with
+    ``stage/`` and read the per-stage counts from ``pipeline/?posting=``.
+    """
+    queryset = Application.objects.all()
+    serializer_class = ApplicationSerializer
+    filterset_fields = ['posting', 'stage']
+    batch_max_items = 500
+
+    def get_queryset(self):
+        user = self.request.user
+        if self.action == 'destroy':
+            return Application.objects.filter(applicant=user)
+        if self.action == 'stage':
+            return Application.objects.filter(posting__owner=user)
+        queryset = Application.objects.filter(Q(applicant=user) | Q(posting__owner=user))
+        return queryset if self.action == 'retrieve' else queryset.defer('resume_snapshot')
+
+    def get_serializer_class(self):
+        return ApplicationDetailSerializer if self.action == 'retrieve' else ApplicationSerializer
+
+    def create(self, request, *args, **kwargs):
+        data = request.data.copy() if hasattr(request.data, 'copy') else dict(request.data)
+        if 'idempotency_key' not in data and 'Idempotency-Key' in request.headers:
+            data['idempotency_key'] = request.headers['Idempotency-Key']
+        submissions, errors = self.validate_submissions([data])
+        if errors[0]:
+            raise ValidationError(errors[0])
+        outcome, = ingest.buffer.submit(submissions)
+        if outcome.conflict:
+            raise IdempotencyKeyReused({'idempotency_key': [IdempotencyKeyReused.default_detail]})
+        if outcome.application_id is None:
+            raise ValidationError({'resume': ['Invalid resume.']})
+        application = Application.objects.defer('resume_snapshot').get(pk=outcome.application_id)
+        return Response(
+            ApplicationSerializer(application).data,
+            status=status.HTTP_201_CREATED if outcome.created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Submit ``{"items": [...]}``; answers each item's id and whether it was created, in order"""
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
+            raise ValidationError({'items': ['Expected a non-empty list.']})
+        if len(items) > self.batch_max_items:
+            raise ValidationError({'items': [f'At most {self.batch_max_items} entries per request.']})
+        submissions, errors = self.validate_submissions(items)
+        if any(errors):
+            raise ValidationError({'items': errors})
+        outcomes = ingest.buffer.submit(submissions)
+        if any(outcome.conflict for outcome in outcomes):
+            # The other items were applied; resubmitting them resolves to their applications
+            raise IdempotencyKeyReused({'items': [
+                {'idempotency_key': [IdempotencyKeyReused.default_detail]} if outcome.conflict else {}
+                for outcome in outcomes
+            ]})
+        return Response({'results': [
+            {'id': outcome.application_id, 'idempotency_key': submission.idempotency_key, 'created': outcome.created}
+            for submission, outcome in zip(submissions, outcomes)
+        ]})
+
+    @action(detail=True, methods=['post'], serializer_class=StageSerializer)
+    def stage(self, request, pk=None):
+        application = self.get_object()
+        serializer = StageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ingest.move(application, serializer.validated_data['stage'])
+        application.refresh_from_db()
+        return Response(ApplicationSerializer(application).data)
+
+    @action(detail=False, methods=['get'], filterset_fields=[])
+    def pipeline(self, request):
+        """Application counts per stage of one of the user's postings (``?posting=``), from the counters"""
+        posting_id = request.query_params.get('posting', '')
+        if not posting_id.isdigit():
+            raise ValidationError({'posting': ['This query parameter is required.']})
+        posting = get_object_or_404(JobPosting.objects.only('id'), pk=posting_id, owner=request.user)
+        stages = ingest.stage_counts(posting.pk)
+        return Response({'posting': posting.pk, 'total': sum(stages.values()), 'stages': stages})
+
+    def validate_submissions(self, items):
+        """``(submissions, errors)`` for the request items, with one query for postings and one for resumes"""
+        user = self.request.user
+        serializers = [SubmissionSerializer(data=item) if isinstance(item, dict) else None for item in items]
+        valid = [serializer.validated_data for serializer in serializers if serializer and serializer.is_valid()]
+        postings = set(JobPosting.objects.filter(
+            pk__in={data['posting'] for data in valid}, is_active=True
+        ).values_list('pk', flat=True))
+        resumes = set(Resume.objects.filter(
+            pk__in={data['resume'] for data in valid}, user=user
+        ).values_list('pk', flat=True))
+
+        submissions, errors = [], []
+        for serializer in serializers:
+            if serializer is None:
+                errors.append({'non_field_errors': ['Expected an object.']})
+                continue
+            if serializer.errors:
+                errors.append(serializer.errors)
+                continue
+            data, item_errors = serializer.validated_data, {}
+            if data['posting'] not in postings:
+                item_errors['posting'] = ['Unknown or closed job posting.']
+            if data['resume'] not in resumes:
+                item_errors['resume'] = ['Invalid resume.']
+            errors.append(item_errors)
+            submissions.append(ingest.Submission(
+                data['posting'], user.pk, data['resume'], data['idempotency_key'], data['cover_letter']
+            ))
+        return submissions, errors
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+
+from applications.models import Application
+
+
+class SubmissionSerializer(serializers.Serializer):
+    # Plain ids: postings and resumes of a whole batch are checked with one query each
+    posting = serializers.IntegerField()
+    resume = serializers.IntegerField()
+    idempotency_key = serializers.CharField(max_length=64)
+    cover_letter = serializers.CharField(allow_blank=True, required=False, default='')
+
+
+class ApplicationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'posting', 'applicant', 'resume', 'resume_version', 'cover_letter', 'idempotency_key',
+            'stage', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+
+class ApplicationDetailSerializer(ApplicationSerializer):
+    class Meta(ApplicationSerializer.Meta):
+        fields = [*ApplicationSerializer.Meta.fields, 'resume_snapshot']
+        read_only_fields = fields
+
+
+class StageSerializer(serializers.Serializer):
+    stage = serializers.ChoiceField(choices=Application.STAGES)
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from applications.api.api import ApplicationViewSet
+
+router = DefaultRouter()
+router.register(r'applications', ApplicationViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,236 @@
+"""
+Application ingestion.
+
+Submissions are validated in the request and handed to ``buffer``, which
+group-commits them: the first submitter of a batch waits up to
+``APPLICATION_BUFFER_MS`` (or until ``APPLICATION_BUFFER_SIZE`` applications
+are buffered) for concurrent submissions to join, then writes the whole batch
+with one ``INSERT ... ON CONFLICT DO NOTHING`` while the others wait for it.
+A reused idempotency key, or a second application to the same posting,
+inserts nothing and resolves to the existing application; a key reused for
+a different posting or resume is a conflict. Should a batch fail as a whole,
+each submitter's submissions are written on their own, so one bad item (say,
+for a posting deleted since it was validated) fails only its own request.
+
+Per-posting stage counters (StageCount) change in the same transaction as the
+applications, so pipeline views read a few counter rows instead of counting
+applications.
+"""
+import json
+import threading
+from collections import Counter, namedtuple
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from applications.models import Application, StageCount
+from resume_builder import cache
+from resume_builder.models import Resume
+
+Submission = namedtuple('Submission', 'posting_id applicant_id resume_id idempotency_key cover_letter')
+# Result of a submission; application_id is None when its resume was deleted meanwhile. conflict: the
+# idempotency key belongs to the application application_id, made with a different posting or resume
+Outcome = namedtuple('Outcome', 'application_id created conflict', defaults=[False])
+
+# Rows per INSERT statement
+INSERT_BATCH_SIZE = 1000
+COLUMNS = [
+    'posting_id', 'applicant_id', 'resume_id', 'resume_version', 'resume_snapshot', 'cover_letter',
+    'idempotency_key', 'stage', 'created_at', 'updated_at',
+]
+
+
+def write(submissions):
+    """Insert ``submissions`` in one transaction; returns their ``Outcome`` in order"""
+    snapshots = _snapshots({submission.resume_id for submission in submissions})
+    now = timezone.now()
+    rows = [
+        (
+            submission.posting_id, submission.applicant_id, submission.resume_id,
+            snapshots[submission.resume_id][0], json.dumps(snapshots[submission.resume_id][1], cls=DjangoJSONEncoder),
+            submission.cover_letter, submission.idempotency_key, 'APPLIED', now, now,
+        )
+        for submission in submissions if submission.resume_id in snapshots
+    ]
+    with transaction.atomic():
+        inserted = []
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            inserted.extend(_insert(rows[start:start + INSERT_BATCH_SIZE]))
+        increment(Counter((posting_id, 'APPLIED') for _, posting_id, _, _, _ in inserted))
+
+    by_key = {(applicant_id, key): pk for pk, _, applicant_id, _, key in inserted}
+    by_posting = {(posting_id, applicant_id): pk for pk, posting_id, applicant_id, _, _ in inserted}
+    applied = {pk: (posting_id, resume_id) for pk, posting_id, _, resume_id, _ in inserted}
+    # Keys resolve first, so a key reused for a posting applied to in this batch still conflicts
+    unresolved = [
+        submission for submission in submissions
+        if (submission.applicant_id, submission.idempotency_key) not in by_key
+    ]
+    if unresolved:
+        existing = Application.objects.filter(reduce(or_, (
+            models.Q(applicant_id=submission.applicant_id, idempotency_key=submission.idempotency_key)
+            | models.Q(applicant_id=submission.applicant_id, posting_id=submission.posting_id)
+            for submission in unresolved
+        ))).values_list('pk', 'posting_id', 'applicant_id', 'resume_id', 'idempotency_key')
+        for pk, posting_id, applicant_id, resume_id, key in existing:
+            by_key.setdefault((applicant_id, key), pk)
+            by_posting.setdefault((posting_id, applicant_id), pk)
+            applied[pk] = (posting_id, resume_id)
+
+    created = {pk for pk, *_ in inserted}
+    outcomes = []
+    for submission in submissions:
+        pk = by_key.get((submission.applicant_id, submission.idempotency_key))
+        if pk is not None and applied[pk] != (submission.posting_id, submission.resume_id):
+            outcomes.append(Outcome(pk, False, conflict=True))
+            continue
+        pk = pk or by_posting.get((submission.posting_id, submission.applicant_id))
+        # Only the first of several identical submissions in a batch created the row
+        outcomes.append(Outcome(pk, pk in created))
+        created.discard(pk)
+    return outcomes
+
+
+def _insert(rows):
+    """
+    INSERT ... ON CONFLICT DO NOTHING; returns ``(id, posting_id, applicant_id,
+    resume_id, key)`` of the inserted rows
+    """
+    quote = connection.ops.quote_name
+    placeholders = '({})'.format(', '.join('%s::jsonb' if name == 'resume_snapshot' else '%s' for name in COLUMNS))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(Application._meta.db_table)} ({", ".join(map(quote, COLUMNS))}) '
+            f'VALUES {", ".join([placeholders] * len(rows))} ON CONFLICT DO NOTHING '
+            f'RETURNING id, posting_id, applicant_id, resume_id, idempotency_key',
+            [value for row in rows for value in row],
+        )
+        return cursor.fetchall()
+
+
+def _snapshots(resume_ids):
+    """``{resume_id: (content_version, payload)}`` of the resumes that still exist"""
+    from resume_builder.api.serializers import ResumeSerializer
+
+    versions = dict(Resume.objects.filter(pk__in=resume_ids).values_list('pk', 'content_version'))
+    payloads = cache.get_payloads(versions)
+    snapshots = {pk: (versions[pk], payload) for pk, payload in payloads.items()}
+    missing = [pk for pk in versions if pk not in payloads]
+    if missing:
+        cache.technologies.revalidate()
+        for resume in Resume.objects.with_graph().filter(pk__in=missing):
+            payload = ResumeSerializer(resume).data
+            cache.set_payload(resume.pk, resume.content_version, payload)
+            snapshots[resume.pk] = (resume.content_version, payload)
+    return snapshots
+
+
+def increment(deltas):
+    """Add ``{(posting_id, stage): delta}`` to the stage counters, creating missing ones"""
+    deltas = sorted((key, delta) for key, delta in deltas.items() if delta)
+    if not deltas:
+        return
+    quote = connection.ops.quote_name
+    table = quote(StageCount._meta.db_table)
+    # Sorted keys keep concurrent batches from locking counter rows in opposite orders
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (posting_id, stage, count) VALUES {", ".join(["(%s, %s, %s)"] * len(deltas))} '
+            f'ON CONFLICT (posting_id, stage) DO UPDATE SET count = {table}.count + EXCLUDED.count',
+            [value for (posting_id, stage), delta in deltas for value in (posting_id, stage, delta)],
+        )
+
+
+def move(application, stage):
+    """Move ``application`` to ``stage``, updating the counters of both stages"""
+    with transaction.atomic():
+        current = Application.objects.select_for_update().values_list('stage', flat=True).get(pk=application.pk)
+        if current != stage:
+            Application.objects.filter(pk=application.pk).update(stage=stage, updated_at=timezone.now())
+            increment({(application.posting_id, current): -1, (application.posting_id, stage): 1})
+    application.stage = stage
+    return application
+
+
+def stage_counts(posting_id):
+    """``{stage: count}`` of a posting's applications, every stage included"""
+    counts = dict.fromkeys(dict(Application.STAGES), 0)
+    counts.update(StageCount.objects.filter(posting_id=posting_id).values_list('stage', 'count'))
+    return counts
+
+
+class GroupCommit:
+    """Coalesces concurrent ``submit`` calls into batches written by ``write``; see the module docstring"""
+
+    class Batch:
+        def __init__(self):
+            self.submissions = []
+            # (start, end) of each submitter's submissions
+            self.parts = []
+            self.full = threading.Event()
+            self.done = threading.Event()
+            # Outcomes, or the exception, of each part by its start
+            self.results = {}
+            self.error = None
+
+    def __init__(self, write):
+        self.write = write
+        self._lock = threading.Lock()
+        self._open = None
+
+    def submit(self, submissions):
+        """Buffer ``submissions`` and return their outcomes once their batch is written"""
+        with self._lock:
+            batch, leader = self._open, self._open is None
+            if leader:
+                batch = self._open = self.Batch()
+            start = len(batch.submissions)
+            batch.submissions.extend(submissions)
+            batch.parts.append((start, len(batch.submissions)))
+            if len(batch.submissions) >= settings.APPLICATION_BUFFER_SIZE:
+                # Later submitters start the next batch
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(settings.APPLICATION_BUFFER_MS / 1000)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            try:
+                self._write(batch)
+            except BaseException as exc:
+                batch.error = exc
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        result = batch.results[start]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _write(self, batch):
+        try:
+            outcomes = self.write(batch.submissions)
+        except Exception:
+            if len(batch.parts) == 1:
+                raise
+            # Another submitter's item may be the one failing; each part succeeds or fails on its own
+            for start, end in batch.parts:
+                try:
+                    batch.results[start] = self.write(batch.submissions[start:end])
+                except Exception as exc:
+                    batch.results[start] = exc
+        else:
+            batch.results = {start: outcomes[start:end] for start, end in batch.parts}
+
+
+buffer = GroupCommit(write)
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+        ('resume_builder', '0011_technicalskill_requirement_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Application',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume_version', models.PositiveBigIntegerField()),
+                ('resume_snapshot', models.JSONField(default=dict)),
+                ('cover_letter', models.TextField(blank=True)),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('stage', models.CharField(choices=[('APPLIED', 'Applied'), ('SCREENING', 'Screening'), ('INTERVIEW', 'Interview'), ('OFFER', 'Offer'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected')], default='APPLIED', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('applicant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to=settings.AUTH_USER_MODEL)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='jobs.jobposting')),
+                ('resume', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='applications', to='resume_builder.resume')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['posting', 'stage', '-created_at', '-id'], name='application_posting_244933_idx'), models.Index(fields=['applicant', '-created_at', '-id'], name='application_applica_fa390f_idx')],
+                'constraints': [models.UniqueConstraint(fields=('applicant', 'idempotency_key'), name='application_idempotency_key'), models.UniqueConstraint(fields=('posting', 'applicant'), name='one_application_per_posting')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StageCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(choices=[('APPLIED', 'Applied'), ('SCREENING', 'Screening'), ('INTERVIEW', 'Interview'), ('OFFER', 'Offer'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_counts', to='jobs.jobposting')),
+            ],
+            options={
+                'unique_together': {('posting', 'stage')},
+            },
+        ),
+    ]
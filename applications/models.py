@@ -1,3 +1,74 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from jobs.models import JobPosting
+from resume_builder.models import Resume
+
+
+class Application(models.Model):
+    """A user's application to a job posting, with the resume as it was when applying"""
+    STAGES = [
+        ('APPLIED', 'Applied'),
+        ('SCREENING', 'Screening'),
+        ('INTERVIEW', 'Interview'),
+        ('OFFER', 'Offer'),
+        ('HIRED', 'Hired'),
+        ('REJECTED', 'Rejected'),
+    ]
+
+    posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name='applications'
+    )
+    applicant = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='applications'
+    )
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='applications'
+    )
+    # Content version and serialized resume at the time of applying
+    resume_version = models.PositiveBigIntegerField()
+    resume_snapshot = models.JSONField(default=dict)
+    cover_letter = models.TextField(blank=True)
+    # Client-chosen key; resubmitting with the same key returns the original application
+    idempotency_key = models.CharField(max_length=64)
+    stage = models.CharField(max_length=10, choices=STAGES, default='APPLIED')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'idempotency_key'], name='application_idempotency_key'),
+            models.UniqueConstraint(fields=['posting', 'applicant'], name='one_application_per_posting'),
+        ]
+        indexes = [
+            models.Index(fields=['posting', 'stage', '-created_at', '-id']),
+            models.Index(fields=['applicant', '-created_at', '-id']),
+        ]
+
+    def __str__(self):
+        return f"Application of {self.applicant_id} to {self.posting_id} ({self.stage})"
+
+
+class StageCount(models.Model):
+    """Number of a posting's applications in one stage, kept current by applications.ingest"""
+    posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name='stage_counts'
+    )
+    stage = models.CharField(max_length=10, choices=Application.STAGES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('posting', 'stage')
+
+    def __str__(self):
+        return f"{self.posting_id} {self.stage}: {self.count}"
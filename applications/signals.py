@@ -0,0 +1,12 @@
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from applications.models import Application, StageCount
+
+
+@receiver(post_delete, sender=Application, dispatch_uid='applications_application_deleted')
+def application_deleted(sender, instance, **kwargs):
+    # Withdrawals and cascades from deleted users. An UPDATE only, so nothing is
+    # recreated for a posting whose counters are being deleted along with it.
+    StageCount.objects.filter(posting_id=instance.posting_id, stage=instance.stage).update(count=F('count') - 1)
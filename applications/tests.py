@@ -1,3 +1,217 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from applications import ingest
+from applications.models import Application, StageCount
+from jobs.models import JobPosting
+from resume_builder.models import Resume
+
+User = get_user_model()
+
+
+@override_settings(APPLICATION_BUFFER_MS=0)
+class ApplicationIngestionTests(APITestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user(email='hr@example.com', username='hr', password='testpass123')
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.posting = JobPosting.objects.create(owner=self.recruiter, title='Engineer', company='Co')
+        self.other_posting = JobPosting.objects.create(owner=self.recruiter, title='Designer', company='Co')
+        self.resume = Resume.objects.create(user=self.user, title='Mine', slug='mine', summary='Hello')
+
+    def apply(self, key='key-1', posting=None, **extra):
+        return self.client.post(reverse('application-list'), {
+            'posting': (posting or self.posting).id, 'resume': self.resume.id, 'idempotency_key': key, **extra,
+        }, format='json')
+
+    def counts(self, posting=None):
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.get(reverse('application-pipeline'), {'posting': (posting or self.posting).id})
+        self.client.force_authenticate(self.user)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_apply_with_resume_snapshot(self):
+        response = self.apply(cover_letter='Hi')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        application = Application.objects.get(pk=response.data['id'])
+        self.assertEqual((application.applicant, application.stage), (self.user, 'APPLIED'))
+        self.assertEqual(application.resume_version, self.resume.content_version)
+        self.assertEqual(application.resume_snapshot['summary'], 'Hello')
+
+        # Later edits do not change the snapshot
+        self.resume.summary = 'Changed'
+        self.resume.save()
+        response = self.client.get(reverse('application-detail', args=[application.id]))
+        self.assertEqual(response.data['resume_snapshot']['summary'], 'Hello')
+
+    def test_resubmissions_are_idempotent(self):
+        first = self.apply()
+        again = self.apply()
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+        self.assertEqual(again.data['id'], first.data['id'])
+        # A new key for a posting already applied to resolves to the same application
+        other_key = self.apply('key-2')
+        self.assertEqual((other_key.status_code, other_key.data['id']), (status.HTTP_200_OK, first.data['id']))
+        header = self.client.post(reverse('application-list'), {
+            'posting': self.posting.id, 'resume': self.resume.id,
+        }, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        self.assertEqual(header.data['id'], first.data['id'])
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertEqual(self.counts()['stages']['APPLIED'], 1)
+
+    def test_reusing_a_key_for_another_application_conflicts(self):
+        first = self.apply()
+        response = self.apply(posting=self.other_posting)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('idempotency_key', response.data)
+        other_resume = Resume.objects.create(user=self.user, title='Other', slug='other')
+        response = self.client.post(reverse('application-list'), {
+            'posting': self.posting.id, 'resume': other_resume.id, 'idempotency_key': 'key-1',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(list(Application.objects.values_list('pk', flat=True)), [first.data['id']])
+
+        # Within a batch, only the conflicting item is reported
+        response = self.client.post(reverse('application-batch'), {'items': [
+            {'posting': self.other_posting.id, 'resume': self.resume.id, 'idempotency_key': 'key-2'},
+            {'posting': self.other_posting.id, 'resume': self.resume.id, 'idempotency_key': 'key-1'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['items'][0], {})
+        self.assertIn('idempotency_key', response.data['items'][1])
+
+    def test_batch_is_written_in_one_statement(self):
+        postings = [JobPosting.objects.create(owner=self.recruiter, title=f'Job {i}', company='Co') for i in range(5)]
+        items = [
+            {'posting': posting.id, 'resume': self.resume.id, 'idempotency_key': f'batch-{index}'}
+            for index, posting in enumerate(postings)
+        ]
+        # A retried item within the batch
+        items.append(dict(items[0]))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('application-batch'), {'items': items}, format='json')
+        inserts = [query['sql'].split(' (')[0] for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(inserts, ['INSERT INTO "applications_application"', 'INSERT INTO "applications_stagecount"'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        results = response.data['results']
+        self.assertEqual([item['created'] for item in results], [True] * 5 + [False])
+        self.assertEqual(results[5]['id'], results[0]['id'])
+        self.assertEqual(StageCount.objects.filter(stage='APPLIED', count=1).count(), 5)
+
+    def test_batch_errors_are_reported_per_item(self):
+        self.posting.is_active = False
+        self.posting.save()
+        response = self.client.post(reverse('application-batch'), {'items': [
+            {'posting': self.other_posting.id, 'resume': self.resume.id, 'idempotency_key': 'ok'},
+            {'posting': self.posting.id, 'resume': self.resume.id, 'idempotency_key': 'closed'},
+            {'posting': self.other_posting.id, 'resume': 0},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['items']
+        self.assertEqual(errors[0], {})
+        self.assertIn('posting', errors[1])
+        self.assertIn('idempotency_key', errors[2])
+        self.assertFalse(Application.objects.exists())
+
+    def test_stage_counters_follow_moves_and_withdrawals(self):
+        mine = self.apply().data['id']
+        other = User.objects.create_user(email='o@example.com', username='o', password='testpass123')
+        resume = Resume.objects.create(user=other, title='Theirs', slug='theirs')
+        self.client.force_authenticate(other)
+        self.client.post(reverse('application-list'), {
+            'posting': self.posting.id, 'resume': resume.id, 'idempotency_key': 'k',
+        }, format='json')
+        self.client.force_authenticate(self.user)
+
+        # Only the posting's owner moves applications
+        url = reverse('application-stage', args=[mine])
+        self.assertEqual(self.client.post(url, {'stage': 'INTERVIEW'}).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.post(url, {'stage': 'INTERVIEW'})
+        self.assertEqual(response.data['stage'], 'INTERVIEW')
+        self.client.force_authenticate(self.user)
+        counts = self.counts()
+        self.assertEqual(counts['total'], 2)
+        self.assertEqual((counts['stages']['APPLIED'], counts['stages']['INTERVIEW']), (1, 1))
+
+        response = self.client.delete(reverse('application-detail', args=[mine]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        other.delete()
+        counts = self.counts()
+        self.assertEqual(counts['total'], 0)
+
+        with self.assertNumQueries(2):
+            self.client.force_authenticate(self.recruiter)
+            self.client.get(reverse('application-pipeline'), {'posting': self.posting.id})
+
+    def test_applications_are_private_to_applicant_and_recruiter(self):
+        mine = self.apply().data['id']
+        self.apply('k2', posting=self.other_posting)
+        stranger = User.objects.create_user(email='s@example.com', username='s', password='testpass123')
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(reverse('application-list')).data['results'], [])
+        self.assertEqual(self.client.get(reverse('application-detail', args=[mine])).status_code, 404)
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.get(reverse('application-list'), {'posting': self.posting.id})
+        self.assertEqual([item['id'] for item in response.data['results']], [mine])
+        self.assertNotIn('resume_snapshot', response.data['results'][0])
+
+
+@override_settings(APPLICATION_BUFFER_MS=1000, APPLICATION_BUFFER_SIZE=6)
+class GroupCommitTests(SimpleTestCase):
+    def test_concurrent_submissions_share_a_batch(self):
+        write = mock.Mock(side_effect=lambda submissions: [(item, True) for item in submissions])
+        buffer = ingest.GroupCommit(write)
+        results = {}
+
+        def submit(index):
+            results[index] = buffer.submit([f'{index}-a', f'{index}-b'])
+
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        # Six buffered submissions fill the batch, so it is written without waiting out the delay
+        write.assert_called_once()
+        self.assertEqual(results, {
+            index: [(f'{index}-a', True), (f'{index}-b', True)] for index in range(3)
+        })
+
+    def test_a_failing_item_fails_only_its_submitter(self):
+        def write(submissions):
+            if 'bad' in submissions:
+                raise RuntimeError('foreign key violation')
+            return [(item, True) for item in submissions]
+
+        buffer = ingest.GroupCommit(mock.Mock(side_effect=write))
+        results = {}
+
+        def submit(items):
+            try:
+                results[items[0]] = buffer.submit(items)
+            except RuntimeError as exc:
+                results[items[0]] = exc
+
+        threads = [threading.Thread(target=submit, args=(items,)) for items in [['a', 'b'], ['bad'], ['c', 'd', 'e']]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(results['a'], [('a', True), ('b', True)])
+        self.assertEqual(results['c'], [('c', True), ('d', True), ('e', True)])
+        self.assertIsInstance(results['bad'], RuntimeError)
+
+    def test_errors_reach_every_submitter(self):
+        buffer = ingest.GroupCommit(mock.Mock(side_effect=RuntimeError('down')))
+        with override_settings(APPLICATION_BUFFER_MS=0), self.assertRaises(RuntimeError):
+            buffer.submit(['x'])
@@ -0,0 +1,43 @@
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from ats import pipeline
+from ats.api.serializers import AtsScoreSerializer, ScoringRunSerializer
+from ats.models import AtsScore, ScoringRun
+
+
+class RunInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Resumes are already being scored against this posting.'
+    default_code = 'run_in_progress'
+
+
+class ScoringRunViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin,
+                        viewsets.GenericViewSet):
+    """
+    Batch ATS scoring of the public resumes against a job posting.
+
+    POST {"posting": id} starts a run in the background and answers 202; poll
+    the run for ``processed``/``total``, ``progress`` and ``resumes_per_second``,
+    and read the results from ``ats/scores/?posting=``.
+    """
+    queryset = ScoringRun.objects.all()
+    serializer_class = ScoringRunSerializer
+    filterset_fields = ['posting', 'status']
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            run = pipeline.start(serializer.validated_data['posting'])
+        except pipeline.RunInProgress:
+            raise RunInProgress
+        return Response(self.get_serializer(run).data, status=status.HTTP_202_ACCEPTED)
+
+
+class AtsScoreViewSet(viewsets.ReadOnlyModelViewSet):
+    """Latest score of each resume per posting, best first"""
+    queryset = AtsScore.objects.all()
+    serializer_class = AtsScoreSerializer
+    filterset_fields = {'posting': ['exact'], 'resume': ['exact'], 'score': ['gte']}
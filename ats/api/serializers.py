@@ -0,0 +1,43 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from ats.models import AtsScore, ScoringRun
+from jobs.models import JobPosting
+
+
+class ScoringRunSerializer(serializers.ModelSerializer):
+    posting = serializers.PrimaryKeyRelatedField(queryset=JobPosting.objects.all())
+    progress = serializers.SerializerMethodField()
+    resumes_per_second = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ScoringRun
+        fields = [
+            'id', 'posting', 'status', 'total', 'processed', 'progress', 'resumes_per_second',
+            'keywords', 'error', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = [name for name in fields if name != 'posting']
+
+    def validate_posting(self, value):
+        request = self.context.get('request')
+        if request is not None and value.owner_id != request.user.pk:
+            raise serializers.ValidationError('Only the owner of a posting can score resumes against it.')
+        return value
+
+    def get_progress(self, obj):
+        """Percentage of the resumes scored so far"""
+        if obj.status == 'DONE':
+            return 100.0
+        return round(100 * obj.processed / obj.total, 1) if obj.total else 0.0
+
+    def get_resumes_per_second(self, obj):
+        if obj.started_at is None:
+            return None
+        elapsed = ((obj.finished_at or timezone.now()) - obj.started_at).total_seconds()
+        return round(obj.processed / elapsed, 1) if elapsed > 0 else None
+
+
+class AtsScoreSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AtsScore
+        fields = ['id', 'posting', 'resume', 'run', 'score', 'section_scores', 'matched_keywords', 'scored_at']
@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from ats.api.api import AtsScoreViewSet, ScoringRunViewSet
+
+router = DefaultRouter()
+router.register(r'ats/runs', ScoringRunViewSet)
+router.register(r'ats/scores', AtsScoreViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,65 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ats import scoring
+
+WORDS = '''
+    python django postgresql redis kafka kubernetes docker terraform aws gcp react typescript node.js go rust
+    java spring graphql rest apis microservices distributed systems caching queues observability latency
+    throughput migrations schema design testing ci cd pipelines security oauth billing payments search
+    analytics reporting dashboards mobile backend frontend platform infrastructure reliability on-call
+'''.split()
+FILLER = 'led built shipped improved reduced designed owned migrated scaled automated the a of for with to'.split()
+
+
+def sentence(rng, length):
+    return ' '.join(rng.choice(WORDS) if rng.random() < 0.4 else rng.choice(FILLER) for _ in range(length))
+
+
+class Command(BaseCommand):
+    help = 'Measure ATS keyword scoring throughput (resumes/sec per core) over synthetic resumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=20000)
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument('--workers', type=int, nargs='+', help='Pool sizes to compare (default 1 up to all cores)')
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        keywords = scoring.extract_keywords(
+            ' . '.join(sentence(rng, 25) for _ in range(12)), ['Python', 'Django', 'PostgreSQL', 'Kubernetes']
+        )
+        documents = [
+            (index, {
+                'skills': ' . '.join(rng.sample(WORDS, 12)),
+                'experience': ' . '.join(sentence(rng, 30) for _ in range(8)),
+                'projects': ' . '.join(sentence(rng, 20) for _ in range(3)),
+            })
+            for index in range(options['resumes'])
+        ]
+        size = options['chunk_size']
+        chunks = [documents[start:start + size] for start in range(0, len(documents), size)]
+        cores = os.cpu_count() or 1
+        pools = options['workers'] or sorted({1, 2, cores // 2, cores} - {0})
+
+        started = time.perf_counter()
+        scoring.score_batch(keywords, documents[:size])
+        serial = size / (time.perf_counter() - started)
+        self.stdout.write(f'{len(documents)} resumes, {len(keywords)} keywords, {cores} cores')
+        self.stdout.write(f'in process    {serial:>9.0f} resumes/s')
+        for workers in pools:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                # Warm the workers up so process start-up is not timed
+                list(pool.map(scoring.score_batch, [keywords] * workers, [documents[:1]] * workers))
+                started = time.perf_counter()
+                list(pool.map(scoring.score_batch, [keywords] * len(chunks), chunks))
+                rate = len(documents) / (time.perf_counter() - started)
+            self.stdout.write(
+                f'{workers:>2} workers    {rate:>9.0f} resumes/s  {rate / workers:>7.0f} per core  '
+                f'{rate / serial:>5.1f}x'
+            )
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+        ('resume_builder', '0011_technicalskill_requirement_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('keywords', models.JSONField(blank=True, default=dict)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scoring_runs', to='jobs.jobposting')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AtsScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(default=0)),
+                ('section_scores', models.JSONField(blank=True, default=dict)),
+                ('matched_keywords', models.JSONField(blank=True, default=list)),
+                ('scored_at', models.DateTimeField()),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ats_scores', to='jobs.jobposting')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ats_scores', to='resume_builder.resume')),
+                ('run', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scores', to='ats.scoringrun')),
+            ],
+            options={
+                'ordering': ['-score'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='scoringrun',
+            index=models.Index(fields=['posting', '-created_at'], name='ats_scoring_posting_0deb9d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='atsscore',
+            index=models.Index(fields=['posting', '-score', '-id'], name='ats_atsscor_posting_6e671a_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='atsscore',
+            unique_together={('posting', 'resume')},
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:36
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scoringrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
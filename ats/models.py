@@ -1,3 +1,74 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from jobs.models import JobPosting
+from resume_builder.models import Resume
+
+
+class ScoringRun(models.Model):
+    """One batch scoring of resumes against a job posting, with its progress"""
+    STATUSES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name='scoring_runs'
+    )
+    status = models.CharField(max_length=10, choices=STATUSES, default='PENDING')
+    keywords = models.JSONField(default=dict, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Moved on every saved chunk; unfinished runs that stop moving were lost with their worker
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['posting', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"Scoring run {self.pk} for {self.posting_id} ({self.status})"
+
+
+class AtsScore(models.Model):
+    """Latest keyword score of a resume against a job posting"""
+    posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name='ats_scores'
+    )
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='ats_scores'
+    )
+    run = models.ForeignKey(
+        ScoringRun,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='scores'
+    )
+    score = models.FloatField(default=0)
+    section_scores = models.JSONField(default=dict, blank=True)
+    matched_keywords = models.JSONField(default=list, blank=True)
+    scored_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('posting', 'resume')
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['posting', '-score', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.resume_id} scored {self.score} for {self.posting_id}"
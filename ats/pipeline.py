@@ -0,0 +1,204 @@
+"""
+Batch scoring of resumes against a job posting.
+
+The ids of the resumes to score are streamed from the database in chunks; for
+each chunk the section texts are loaded with one query per section and handed
+to a process pool running ``ats.scoring``, while this process keeps loading the
+next chunks. Finished chunks are written back with ``bulk_update`` (and
+``bulk_create`` for resumes scored for the first time) and counted into the
+run's ``processed``, which is what the progress API reports.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+from django.utils import timezone
+
+from ats import scoring
+from ats.models import AtsScore, ScoringRun
+from jobs.models import JobPosting
+from resume_builder import cache
+from resume_builder.models import Project, Resume, TechnicalSkill, WorkExperience
+
+logger = logging.getLogger(__name__)
+
+# Keeps phrases from running across separate items, e.g. two achievements
+SEPARATOR = ' . '
+
+
+class RunInProgress(Exception):
+    """Raised when the posting already has an unfinished scoring run"""
+
+
+def scored_resumes():
+    """The resumes scored by a run: all public resumes"""
+    return Resume.objects.filter(visibility='PUBLIC')
+
+
+def keywords_for(posting):
+    required = [
+        technology.name for technology in (
+            cache.technologies.get(requirement.technology_id) for requirement in posting.requirements.all()
+        ) if technology is not None
+    ]
+    return scoring.extract_keywords(f'{posting.title}. {posting.description}', required)
+
+
+def start(posting):
+    """
+    Create a scoring run for ``posting`` and run it on a background thread once
+    the current transaction commits (in this thread when ATS_SCORING_EAGER).
+    """
+    with transaction.atomic():
+        # Serializes concurrent starts for the same posting
+        JobPosting.objects.select_for_update().filter(pk=posting.pk).exists()
+        fail_abandoned(posting.scoring_runs.all())
+        if posting.scoring_runs.filter(status__in=['PENDING', 'RUNNING']).exists():
+            raise RunInProgress
+        run = ScoringRun.objects.create(posting=posting, keywords=keywords_for(posting))
+    if settings.ATS_SCORING_EAGER:
+        execute(run, workers=0)
+    else:
+        thread = threading.Thread(target=_execute_in_background, args=(run.pk,), daemon=True)
+        transaction.on_commit(thread.start)
+    return run
+
+
+def fail_abandoned(runs):
+    """
+    Mark unfinished ``runs`` without progress for ATS_SCORING_STALE_SECONDS as
+    failed: their thread died with its worker (restart, crash, deploy).
+    """
+    now = timezone.now()
+    return runs.filter(
+        status__in=['PENDING', 'RUNNING'],
+        heartbeat_at__lt=now - timedelta(seconds=settings.ATS_SCORING_STALE_SECONDS),
+    ).update(status='FAILED', error='Abandoned without progress; the worker running it stopped.', finished_at=now)
+
+
+def _execute_in_background(run_id):
+    try:
+        execute(ScoringRun.objects.get(pk=run_id))
+    finally:
+        close_old_connections()
+
+
+def execute(run, workers=None, chunk_size=None):
+    """
+    Score every resume of ``scored_resumes`` for ``run``, using ``workers``
+    processes (ATS_SCORING_WORKERS by default, 0 to score in this process).
+    """
+    workers = settings.ATS_SCORING_WORKERS if workers is None else workers
+    chunk_size = chunk_size or settings.ATS_SCORING_CHUNK_SIZE
+    queryset = scored_resumes()
+    run.status, run.started_at, run.total, run.processed = 'RUNNING', timezone.now(), queryset.count(), 0
+    run.heartbeat_at = run.started_at
+    run.save(update_fields=['status', 'started_at', 'heartbeat_at', 'total', 'processed'])
+    try:
+        chunks = _document_chunks(queryset, chunk_size)
+        if workers:
+            _score_in_pool(run, chunks, workers)
+        else:
+            for documents in chunks:
+                save_scores(run, scoring.score_batch(run.keywords, documents))
+    except Exception as exc:
+        logger.exception('Scoring run %s failed', run.pk)
+        run.status, run.error = 'FAILED', str(exc)
+    else:
+        run.status = 'DONE'
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'error', 'finished_at'])
+    return run
+
+
+def _score_in_pool(run, chunks, workers):
+    # Spawned, so workers never inherit database connections; they only import ats.scoring
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = set()
+        for documents in chunks:
+            # Two chunks in flight per worker keep the pool busy while bounding memory
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    save_scores(run, future.result())
+            pending.add(executor.submit(scoring.score_batch, run.keywords, documents))
+        for future in pending:
+            save_scores(run, future.result())
+
+
+def _document_chunks(queryset, chunk_size):
+    ids = queryset.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(ids, chunk_size)):
+        yield load_documents(chunk)
+
+
+def load_documents(resume_ids):
+    """``[(resume_id, {section: text}), ...]`` with one query per section source"""
+    parts = {pk: {name: [] for name in scoring.SECTION_WEIGHTS} for pk in resume_ids}
+
+    def technology_names(relation, field):
+        through = relation.through
+        rows = through.objects.filter(**{f'{field}__resume_id__in': resume_ids}).values_list(
+            f'{field}__resume_id', 'technology_id'
+        )
+        return [(resume_id, _technology_name(technology_id)) for resume_id, technology_id in rows]
+
+    skills = TechnicalSkill.objects.filter(resume_id__in=resume_ids, is_visible=True)
+    for resume_id, technology_id in skills.values_list('resume_id', 'technology_id'):
+        parts[resume_id]['skills'].append(_technology_name(technology_id))
+
+    experiences = WorkExperience.objects.filter(resume_id__in=resume_ids).values_list(
+        'resume_id', 'job_title', 'description', 'achievements'
+    )
+    for resume_id, job_title, description, achievements in experiences:
+        parts[resume_id]['experience'].extend([job_title, description, *map(str, achievements or [])])
+    for resume_id, name in technology_names(WorkExperience.technologies, 'workexperience'):
+        parts[resume_id]['experience'].append(name)
+
+    projects = Project.objects.filter(resume_id__in=resume_ids).values_list(
+        'resume_id', 'title', 'role', 'description'
+    )
+    for resume_id, *texts in projects:
+        parts[resume_id]['projects'].extend(texts)
+    for resume_id, name in technology_names(Project.technologies, 'project'):
+        parts[resume_id]['projects'].append(name)
+
+    return [
+        (pk, {name: SEPARATOR.join(filter(None, texts)) for name, texts in sections.items()})
+        for pk, sections in parts.items()
+    ]
+
+
+def _technology_name(technology_id):
+    technology = cache.technologies.get(technology_id)
+    return technology.name if technology is not None else ''
+
+
+def save_scores(run, results):
+    """Write ``scoring.score_batch`` results and count them into the run's progress"""
+    now = timezone.now()
+    values = {
+        resume_id: dict(score=score, section_scores=sections, matched_keywords=matched)
+        for resume_id, score, sections, matched in results
+    }
+    existing = list(AtsScore.objects.filter(posting_id=run.posting_id, resume_id__in=values).only('id', 'resume_id'))
+    for obj in existing:
+        for name, value in values.pop(obj.resume_id).items():
+            setattr(obj, name, value)
+        obj.run_id, obj.scored_at = run.pk, now
+    with transaction.atomic():
+        AtsScore.objects.bulk_update(
+            existing, ['score', 'section_scores', 'matched_keywords', 'run', 'scored_at'], batch_size=1000
+        )
+        # Rows created since the lookup above by another run keep that run's equally recent score
+        AtsScore.objects.bulk_create([
+            AtsScore(posting_id=run.posting_id, resume_id=resume_id, run=run, scored_at=now, **attrs)
+            for resume_id, attrs in values.items()
+        ], batch_size=1000, ignore_conflicts=True)
+        ScoringRun.objects.filter(pk=run.pk).update(processed=models.F('processed') + len(results), heartbeat_at=now)
+    run.processed += len(results)
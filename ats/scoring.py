@@ -0,0 +1,124 @@
+"""
+ATS-style keyword scoring, free of Django so pool workers only import this
+module.
+
+A job description is reduced to weighted keywords: single terms and phrases
+of up to ``MAX_PHRASE`` words that do not cross a stop word or punctuation,
+weighted by how often they occur, with the posting's required technologies
+on top. A resume is scored by which keywords appear in which section; a
+keyword counts with the weight of the best section it appears in, so a
+technology listed as a skill counts more than one mentioned in a project.
+"""
+import re
+from collections import Counter
+
+MAX_PHRASE = 3
+MAX_KEYWORDS = 40
+# Relative value of finding a keyword in each section
+SECTION_WEIGHTS = {'skills': 1.0, 'experience': 0.8, 'projects': 0.5}
+# Required technologies weigh this much more than the most frequent description keyword
+REQUIRED_BOOST = 2.0
+# Keeps tokens such as c++, c# and node.js whole
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*|[^\sa-z0-9]')
+STOP_WORDS = frozenset('''
+    a an and are as at be by for from has have in into is it its of on or our that the their this to was
+    were will with we you your i my me us using used use able who what which while within across per
+    experience years year strong good great excellent skills skill knowledge work working team plus
+    must should can including etc required requirements preferred ideal
+'''.split())
+
+
+def runs(text):
+    """Lists of consecutive keyword tokens of ``text``, split at stop words and punctuation"""
+    run, result = [], []
+    for token in TOKEN.findall(text.lower()):
+        if token in STOP_WORDS or not token[0].isalnum():
+            if run:
+                result.append(run)
+            run = []
+        else:
+            run.append(token)
+    if run:
+        result.append(run)
+    return result
+
+
+def ngrams(text, longest=MAX_PHRASE):
+    """Counter of the terms and phrases of up to ``longest`` words in ``text``"""
+    counts = Counter()
+    for run in runs(text):
+        for size in range(1, longest + 1):
+            for start in range(len(run) - size + 1):
+                counts[' '.join(run[start:start + size])] += 1
+    return counts
+
+
+def extract_keywords(text, required=(), limit=MAX_KEYWORDS):
+    """
+    ``{keyword: weight}`` for a job description: its ``limit`` most frequent
+    terms and phrases (phrases only when they repeat, as one-off word pairs are
+    mostly noise), plus the ``required`` technology names.
+    """
+    counts = ngrams(text)
+    weights = {}
+    for keyword, count in counts.most_common():
+        words = keyword.count(' ') + 1
+        if words > 1 and count < 2:
+            continue
+        weights[keyword] = count * (1 + 0.5 * (words - 1))
+        if len(weights) == limit:
+            break
+    top = max(weights.values(), default=1)
+    for name in required:
+        for run in runs(name):
+            weights[' '.join(run)] = top * REQUIRED_BOOST
+    return weights
+
+
+def score_document(keywords, sections):
+    """
+    Score the ``sections`` texts of a resume ({section: text}) against
+    ``keywords``. Returns ``(score, section_scores, matched)``: the overall
+    score and each section's keyword coverage in 0-100, and the matched
+    keywords, heaviest first.
+    """
+    total = sum(keywords.values())
+    if not total:
+        return 0.0, {name: 0.0 for name in SECTION_WEIGHTS}, []
+    phrases = [keyword.split(' ') for keyword in keywords if ' ' in keyword]
+    starts = {words[0] for words in phrases}
+    longest = max(map(len, phrases), default=1)
+    found = {name: _terms(sections.get(name, ''), starts, longest) for name in SECTION_WEIGHTS}
+    best = max(SECTION_WEIGHTS.values())
+    earned, matched = 0.0, []
+    section_scores = dict.fromkeys(SECTION_WEIGHTS, 0.0)
+    for keyword, weight in keywords.items():
+        present = [name for name in SECTION_WEIGHTS if keyword in found[name]]
+        if not present:
+            continue
+        matched.append(keyword)
+        earned += weight * max(SECTION_WEIGHTS[name] for name in present) / best
+        for name in present:
+            section_scores[name] += weight
+    matched.sort(key=lambda keyword: (-keywords[keyword], keyword))
+    return (
+        round(100 * earned / total, 2),
+        {name: round(100 * value / total, 2) for name, value in section_scores.items()},
+        matched,
+    )
+
+
+def _terms(text, starts, longest):
+    """Set of the words of ``text`` and of its phrases beginning with one of ``starts``"""
+    terms = set()
+    for run in runs(text):
+        terms.update(run)
+        for index, token in enumerate(run):
+            if token in starts:
+                terms.update(' '.join(run[index:index + size]) for size in range(2, longest + 1))
+    return terms
+
+
+def score_batch(keywords, documents):
+    """``[(resume_id, score, section_scores, matched), ...]`` for ``[(resume_id, sections), ...]``"""
+    return [(resume_id, *score_document(keywords, sections)) for resume_id, sections in documents]
@@ -1,3 +1,129 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ats import pipeline, scoring
+from ats.models import AtsScore, ScoringRun
+from jobs.models import JobPosting, JobRequirement
+from resume_builder.models import Project, Resume, TechnicalSkill, Technology, WorkExperience
+
+User = get_user_model()
+
+
+class KeywordScoringTests(APITestCase):
+    def test_keywords_favour_repeated_phrases_and_required_technologies(self):
+        keywords = scoring.extract_keywords(
+            'Build distributed systems. Operate distributed systems and write docs.', ['Node.js']
+        )
+        self.assertIn('distributed systems', keywords)
+        self.assertNotIn('write docs', keywords)
+        self.assertNotIn('and', keywords)
+        self.assertEqual(keywords['node.js'], max(keywords.values()))
+
+    def test_sections_are_weighted(self):
+        keywords = {'python': 1.0, 'rest apis': 1.0}
+        as_skill = scoring.score_document(keywords, {'skills': 'Python', 'projects': 'REST APIs'})
+        as_project = scoring.score_document(keywords, {'projects': 'Python. REST APIs'})
+        self.assertEqual(as_skill[0], 75.0)
+        self.assertEqual(as_project[0], 50.0)
+        self.assertEqual(as_skill[1], {'skills': 50.0, 'experience': 0.0, 'projects': 50.0})
+        self.assertEqual(as_project[2], ['python', 'rest apis'])
+        # Phrases must not span separate items
+        self.assertEqual(scoring.score_document(keywords, {'experience': 'REST. APIs'})[2], [])
+
+
+@override_settings(ATS_SCORING_EAGER=True)
+class ScoringRunTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.kafka = Technology.objects.create(name='Kafka', category='TOOL')
+        self.posting = JobPosting.objects.create(
+            owner=self.user, title='Data engineer', company='Co',
+            description='Stream processing with Kafka. Stream processing pipelines in Python.',
+        )
+        JobRequirement.objects.create(posting=self.posting, technology=self.python)
+        self.strong = self.resume('strong', skills=[self.python, self.kafka],
+                                  experience='Built stream processing pipelines on Kafka.')
+        self.weak = self.resume('weak', project='A Python script.')
+        self.resume('private', skills=[self.python], visibility='PRIVATE')
+
+    def resume(self, slug, skills=(), experience='', project='', visibility='PUBLIC'):
+        resume = Resume.objects.create(user=self.user, title=slug, slug=slug, visibility=visibility)
+        for technology in skills:
+            TechnicalSkill.objects.create(resume=resume, technology=technology, proficiency=80)
+        if experience:
+            WorkExperience.objects.create(resume=resume, job_title='Engineer', company='Co',
+                                          start_date=date(2020, 1, 1), description=experience)
+        if project:
+            Project.objects.create(resume=resume, title='Tool', role='Author', start_date=date(2021, 1, 1),
+                                   description=project)
+        return resume
+
+    def start(self):
+        response = self.client.post(reverse('scoringrun-list'), {'posting': self.posting.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.data)
+        return response.data
+
+    def scores(self):
+        response = self.client.get(reverse('atsscore-list'), {'posting': self.posting.id})
+        return [(item['resume'], item['score']) for item in response.data['results']]
+
+    def test_public_resumes_are_scored_and_ranked(self):
+        run = self.start()
+        self.assertEqual((run['status'], run['total'], run['processed'], run['progress']), ('DONE', 2, 2, 100.0))
+        self.assertIn('stream processing', run['keywords'])
+
+        scores = self.scores()
+        self.assertEqual([resume for resume, _ in scores], [self.strong.id, self.weak.id])
+        self.assertGreater(scores[0][1], scores[1][1])
+        best = AtsScore.objects.get(resume=self.strong)
+        self.assertIn('kafka', best.matched_keywords)
+        self.assertGreater(best.section_scores['experience'], 0)
+
+    def test_rescoring_updates_scores_in_place(self):
+        first = self.start()
+        ids = set(AtsScore.objects.values_list('id', flat=True))
+        TechnicalSkill.objects.create(resume=self.weak, technology=self.kafka, proficiency=60)
+        second = self.start()
+        self.assertEqual(set(AtsScore.objects.values_list('id', flat=True)), ids)
+        self.assertEqual(set(AtsScore.objects.values_list('run', flat=True)), {second['id']})
+        self.assertNotEqual(first['id'], second['id'])
+        self.assertIn('kafka', AtsScore.objects.get(resume=self.weak).matched_keywords)
+
+    def test_process_pool_matches_in_process_scoring(self):
+        self.start()
+        expected = self.scores()
+        AtsScore.objects.all().delete()
+        run = ScoringRun.objects.create(posting=self.posting, keywords=pipeline.keywords_for(self.posting))
+        pipeline.execute(run, workers=2, chunk_size=1)
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.processed, run.total), ('DONE', 2, 2))
+        self.assertEqual(self.scores(), expected)
+
+    def test_only_one_run_per_posting_at_a_time(self):
+        ScoringRun.objects.create(posting=self.posting, status='RUNNING')
+        response = self.client.post(reverse('scoringrun-list'), {'posting': self.posting.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_abandoned_run_does_not_block_the_posting(self):
+        abandoned = ScoringRun.objects.create(posting=self.posting, status='RUNNING',
+                                              heartbeat_at=timezone.now() - timedelta(hours=1))
+        run = self.start()
+        self.assertEqual(run['status'], 'DONE')
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, 'FAILED')
+        self.assertIsNotNone(abandoned.finished_at)
+
+    def test_only_the_owner_can_start_a_run(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.client.force_authenticate(other)
+        response = self.client.post(reverse('scoringrun-list'), {'posting': self.posting.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ScoringRun.objects.exists())
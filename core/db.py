@@ -0,0 +1,299 @@
+"""
+Read replica routing.
+
+``ReplicaRoutingMiddleware`` marks safe-method requests (GET, HEAD, OPTIONS)
+as readable from a replica; ``ReplicaRouter`` then sends their reads to one of
+``DATABASE_REPLICAS``, picked round-robin and kept for the rest of the
+request. Everything else uses ``default``:
+
+* writes, and every read of a request after it wrote;
+* reads inside a transaction on ``default`` (locking reads, SET LOCAL);
+* reads of sessions, which change right before the requests reading them;
+* for ``DATABASE_PIN_SECONDS`` after a user's unsafe request, all of that
+  user's requests, so they read their own writes despite replication lag.
+  Pins live in the ``DATABASE_PIN_CACHE`` cache, which must be shared between
+  processes (e.g. Redis) when there are several; a system check warns about a
+  process-local one.
+
+A replica that cannot be connected to is skipped for
+``DATABASE_REPLICA_RETRY_SECONDS``. If one fails while a view runs, the view
+is run again on ``default``, which is safe as only safe-method requests read
+from replicas.
+"""
+import contextvars
+import inspect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, OperationalError, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Read from the primary whatever the request
+PRIMARY_ONLY_APPS = {'sessions'}
+# Cache backends whose entries other processes never see
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+class Routing:
+    """Per-request routing state"""
+
+    def __init__(self, readable):
+        self.readable = readable
+        self.replica = None
+        self.wrote = False
+
+
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+class ReplicaSet:
+    """Round-robin over the configured replicas, skipping ones that recently failed"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._down_until = {}
+
+    @property
+    def aliases(self):
+        return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+    def choose(self):
+        """A connected replica alias, or None when none is available"""
+        aliases = self.aliases
+        if not aliases:
+            return None
+        start = next(self._counter) % len(aliases)
+        now = time.monotonic()
+        for alias in aliases[start:] + aliases[:start]:
+            if self._down_until.get(alias, 0) > now:
+                continue
+            try:
+                connections[alias].ensure_connection()
+            except DatabaseError:
+                self.mark_down(alias)
+                continue
+            return alias
+        return None
+
+    def mark_down(self, alias):
+        with self._lock:
+            self._down_until[alias] = time.monotonic() + settings.DATABASE_REPLICA_RETRY_SECONDS
+
+    def reset(self):
+        with self._lock:
+            self._down_until.clear()
+
+
+replicas = ReplicaSet()
+
+
+def pin_key(user_id):
+    return f'db:pin:{user_id}'
+
+
+def is_pinned(user_id):
+    return user_id is not None and bool(caches[settings.DATABASE_PIN_CACHE].get(pin_key(user_id)))
+
+
+async def ais_pinned(user_id):
+    return user_id is not None and bool(await caches[settings.DATABASE_PIN_CACHE].aget(pin_key(user_id)))
+
+
+def pin(user_id):
+    """Route the user's requests to the primary for DATABASE_PIN_SECONDS"""
+    caches[settings.DATABASE_PIN_CACHE].set(pin_key(user_id), True, timeout=settings.DATABASE_PIN_SECONDS)
+
+
+async def apin(user_id):
+    await caches[settings.DATABASE_PIN_CACHE].aset(pin_key(user_id), True, timeout=settings.DATABASE_PIN_SECONDS)
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary within the block"""
+    token = _routing.set(Routing(readable=False))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def use_replica():
+    """Read from a replica within the block (outside requests: commands, tests)"""
+    token = _routing.set(Routing(readable=True))
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+@checks.register(checks.Tags.caches)
+def check_pin_cache(app_configs, **kwargs):
+    """Pins must reach every process serving the user's next request"""
+    if not getattr(settings, 'DATABASE_REPLICAS', ()):
+        return []
+    alias = settings.DATABASE_PIN_CACHE
+    if alias not in settings.CACHES:
+        return [checks.Error(
+            f"DATABASE_PIN_CACHE refers to the undefined cache '{alias}'.",
+            hint='Define it in CACHES, or set DATABASE_PIN_CACHE_URL.',
+            id='core.E001',
+        )]
+    if settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [checks.Warning(
+            f"DATABASE_PIN_CACHE '{alias}' is local to each process, so with several processes a user's "
+            f"reads after a write may go to a lagging replica.",
+            hint='Set DATABASE_PIN_CACHE_URL (e.g. redis://...) or DATABASE_PIN_CACHE to a shared cache.',
+            id='core.W001',
+        )]
+    return []
+
+
+def sqlstate(exc):
+    """The SQLSTATE code of the driver error behind a django.db ``exc``, if any"""
+    cause = exc.__cause__
+    # psycopg 3 names it sqlstate, psycopg2 pgcode
+    return getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)
+
+
+def current_database():
+    """The alias reads are routed to right now"""
+    return ReplicaRouter().db_for_read(None) or DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is None or not routing.readable:
+            return DEFAULT_DB_ALIAS
+        if model is not None and model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if routing.replica is None:
+            routing.replica = replicas.choose()
+            if routing.replica is None:
+                routing.readable = False
+                return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            # Later reads of the request must see this write
+            routing.readable, routing.wrote = False, True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def request_user_id(request):
+    """
+    The requesting user's id without touching the user table: from the JWT
+    access token, else from the session.
+    """
+    if has_token(request):
+        return token_user_id(request)
+    session = getattr(request, 'session', None)
+    return session.get('_auth_user_id') if session is not None else None
+
+
+async def arequest_user_id(request):
+    if has_token(request):
+        return token_user_id(request)
+    session = getattr(request, 'session', None)
+    return await session.aget('_auth_user_id') if session is not None else None
+
+
+def has_token(request):
+    return request.headers.get('Authorization', '').startswith('Bearer ')
+
+
+def token_user_id(request):
+    from rest_framework_simplejwt.exceptions import TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    try:
+        return AccessToken(request.headers['Authorization'][len('Bearer '):]).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Sets up replica routing for each request; see the module docstring"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replicas.aliases:
+            return self.get_response(request)
+        user_id = request_user_id(request)
+        safe = request.method in SAFE_METHODS
+        routing = Routing(readable=safe and not is_pinned(user_id))
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if user_id is not None and (routing.wrote or not safe):
+            pin(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not replicas.aliases:
+            return await self.get_response(request)
+        user_id = await arequest_user_id(request)
+        safe = request.method in SAFE_METHODS
+        routing = Routing(readable=safe and not await ais_pinned(user_id))
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if user_id is not None and (routing.wrote or not safe):
+            await apin(user_id)
+        return response
+
+    def process_exception(self, request, exception):
+        routing = _routing.get()
+        if routing is None or routing.replica is None or not isinstance(exception, OperationalError):
+            return None
+        connection = connections[routing.replica]
+        if connection.connection is not None and connection.is_usable():
+            return None  # the replica is fine; the error is the query's own
+        replicas.mark_down(routing.replica)
+        routing.readable, routing.replica = False, None
+        match = request.resolver_match
+        response = match.func(request, *match.args, **match.kwargs)
+        if inspect.isawaitable(response):
+            # An async view; Django runs process_exception in a sync thread
+            response = async_to_sync(wait)(response)
+        return response
+
+
+async def wait(awaitable):
+    return await awaitable
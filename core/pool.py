@@ -0,0 +1,63 @@
+"""
+Database connection pool statistics.
+
+Pooling itself is Django's (``OPTIONS['pool']``, see DATABASE_POOL in
+settings): under WSGI and ASGI alike, a request's connection goes back to
+the pool when the request finishes, and pools open on first use, so workers
+forked after loading the app (gunicorn --preload) each get their own.
+
+Pools belong to a process, so the statistics describe the worker that serves
+the request; a monitor polling ``/api/v1/database/pools/`` behind a load
+balancer samples one worker per poll. Counters run from the pool's start, or
+from the last ``?reset=1`` read.
+"""
+from django.db import connections
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Our names for psycopg_pool's statistics
+STATS = {
+    'min_size': 'pool_min',
+    'max_size': 'pool_max',
+    'size': 'pool_size',
+    'available': 'pool_available',
+    'waiting': 'requests_waiting',
+    'checkouts': 'requests_num',
+    'waits': 'requests_queued',
+    'wait_ms': 'requests_wait_ms',
+    'timeouts': 'requests_errors',
+    'connections_opened': 'connections_num',
+    'connect_ms': 'connections_ms',
+    'connect_errors': 'connections_errors',
+    'connections_lost': 'connections_lost',
+    'returned_bad': 'returns_bad',
+}
+
+
+def pool_stats(reset=False):
+    """``{alias: {statistic: value}}`` for every pooled database of this process"""
+    result = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        # Counters psycopg_pool has not incremented yet are missing
+        raw = pool.pop_stats() if reset else pool.get_stats()
+        result[alias] = {name: raw.get(key, 0) for name, key in STATS.items()}
+    return result
+
+
+class PoolStatsView(APIView):
+    """
+    Connection pool statistics of the worker serving the request, per
+    database alias; empty when pooling is off (``DATABASE_POOL=False``).
+    ``?reset=1`` restarts the counters.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request, *args, **kwargs):
+        return Response(pool_stats(reset=request.query_params.get('reset') in ('1', 'true')))
@@ -0,0 +1,208 @@
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import OperationalError, connection, connections
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core import db
+from core.pool import pool_stats
+from resume_builder.models import Technology
+
+User = get_user_model()
+
+
+class PinCacheCheckTests(SimpleTestCase):
+    def test_process_local_pin_cache_is_reported_with_replicas(self):
+        locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        shared = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379/1'}
+        with override_settings(DATABASE_REPLICAS=[], DATABASE_PIN_CACHE='default', CACHES={'default': locmem}):
+            self.assertEqual(db.check_pin_cache(None), [])
+        with override_settings(DATABASE_REPLICAS=['replica_0'], DATABASE_PIN_CACHE='default'):
+            with override_settings(CACHES={'default': locmem}):
+                self.assertEqual([issue.id for issue in db.check_pin_cache(None)], ['core.W001'])
+            with override_settings(CACHES={'default': shared}):
+                self.assertEqual(db.check_pin_cache(None), [])
+            with override_settings(CACHES={'other': shared}):
+                self.assertEqual([issue.id for issue in db.check_pin_cache(None)], ['core.E001'])
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'], DATABASE_PIN_SECONDS=5, DATABASE_REPLICA_RETRY_SECONDS=30)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = db.ReplicaRouter()
+        self.patcher = mock.patch.object(db.replicas, 'choose', return_value='replica_0')
+        self.choose = self.patcher.start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(db.replicas.reset)
+        caches[settings.DATABASE_PIN_CACHE].clear()
+
+    def middleware(self, view):
+        return db.ReplicaRoutingMiddleware(view)
+
+    def test_reads_use_replicas_only_when_allowed(self):
+        self.assertEqual(self.router.db_for_read(Technology), 'default')
+        with db.use_replica():
+            self.assertEqual(self.router.db_for_read(Technology), 'replica_0')
+            self.assertEqual(self.router.db_for_read(Session), 'default')
+            self.assertEqual(self.router.db_for_write(Technology), 'default')
+            # Read-your-writes within the request
+            self.assertEqual(self.router.db_for_read(Technology), 'default')
+        with db.use_replica(), db.use_primary():
+            self.assertEqual(self.router.db_for_read(Technology), 'default')
+        self.assertFalse(self.router.allow_migrate('replica_0', 'resume_builder'))
+
+    def test_no_replica_available_falls_back_to_primary(self):
+        self.choose.return_value = None
+        with db.use_replica():
+            self.assertEqual(self.router.db_for_read(Technology), 'default')
+
+    def test_unavailable_replicas_are_skipped_for_a_while(self):
+        self.patcher.stop()
+        broken, healthy = mock.Mock(), mock.Mock()
+        broken.ensure_connection.side_effect = OperationalError('connection refused')
+        with override_settings(DATABASE_REPLICAS=['replica_0', 'replica_1']), \
+                mock.patch.object(db, 'connections', {'replica_0': broken, 'replica_1': healthy}):
+            self.assertEqual({db.replicas.choose() for _ in range(4)}, {'replica_1'})
+        self.assertEqual(broken.ensure_connection.call_count, 1)
+
+    def test_safe_requests_read_from_replicas_until_the_user_writes(self):
+        token = str(AccessToken.for_user(User(pk=42)))
+        factory = RequestFactory()
+        seen = []
+
+        def view(request):
+            seen.append(db.current_database())
+            if request.method == 'POST':
+                db.ReplicaRouter().db_for_write(Technology)
+            return HttpResponse()
+
+        middleware = self.middleware(view)
+        middleware(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        middleware(factory.get('/'))
+        middleware(factory.post('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        # Pinned to the primary after writing; anonymous clients are not
+        middleware(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        middleware(factory.get('/'))
+        self.assertEqual(seen, ['replica_0', 'replica_0', 'default', 'default', 'replica_0'])
+
+        with override_settings(DATABASE_PIN_SECONDS=0):
+            middleware(factory.post('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        middleware(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+        self.assertEqual(seen[-1], 'replica_0')
+
+    async def test_async_requests_are_routed_too(self):
+        token = str(AccessToken.for_user(User(pk=42)))
+        factory = AsyncRequestFactory()
+        seen = []
+
+        async def view(request):
+            seen.append(db.current_database())
+            if request.method == 'POST':
+                db.ReplicaRouter().db_for_write(Technology)
+            return HttpResponse()
+
+        middleware = self.middleware(view)
+        headers = {'Authorization': f'Bearer {token}'}
+        await middleware(factory.get('/', headers=headers))
+        await middleware(factory.post('/', headers=headers))
+        await middleware(factory.get('/', headers=headers))
+        self.assertEqual(seen, ['replica_0', 'default', 'default'])
+
+    def test_views_failing_on_a_replica_are_retried_on_the_primary(self):
+        seen = []
+
+        def view(request):
+            seen.append(db.current_database())
+            if len(seen) == 1:
+                raise OperationalError('server closed the connection unexpectedly')
+            return HttpResponse('ok')
+
+        request = RequestFactory().get('/')
+        request.resolver_match = mock.Mock(func=view, args=(), kwargs={})
+        middleware = self.middleware(lambda request: middleware.process_exception(request, self.call(view, request)))
+        replica = mock.Mock(connection=None)
+        with mock.patch.object(db, 'connections', {'replica_0': replica, 'default': connections['default']}):
+            response = middleware(request)
+        self.assertEqual(response.content, b'ok')
+        self.assertEqual(seen, ['replica_0', 'default'])
+
+    def call(self, view, request):
+        try:
+            view(request)
+        except OperationalError as exc:
+            return exc
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'No read replica configured (DATABASE_REPLICA_URLS)')
+class ReplicaIntegrationTests(TransactionTestCase):
+    databases = '__all__'
+
+    @classmethod
+    def tearDownClass(cls):
+        # Replicas mirror the test database; their pools must let go of it before it is dropped
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            connections[alias].close_pool()
+        super().tearDownClass()
+
+    def test_api_reads_go_to_the_replica(self):
+        user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        Technology.objects.create(name='Python', category='LANG')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+        alias = settings.DATABASE_REPLICAS[0]
+        with self.assertNumQueries(0, using='default'), self.assertNumQueries(2, using=alias):
+            response = client.get(reverse('technology-list'))
+        self.assertEqual(response.data['results'][0]['name'], 'Python')
+
+        with self.assertNumQueries(0, using=alias):
+            response = client.post(reverse('technology-list'), {'name': 'Go', 'category': 'LANG'})
+        self.assertEqual(response.status_code, 201)
+        # Pinned to the primary after writing
+        with self.assertNumQueries(0, using=alias):
+            response = client.get(reverse('technology-list'))
+        self.assertEqual(len(response.data['results']), 2)
+
+
+@skipUnless(settings.DATABASE_POOL, 'Connection pooling is off (DATABASE_POOL=False)')
+class ConnectionPoolTests(TestCase):
+    def test_connections_come_from_the_pool(self):
+        pool = connection.pool
+        self.assertEqual((pool.min_size, pool.max_size), (settings.DATABASE_POOL_MIN_SIZE, settings.DATABASE_POOL_MAX_SIZE))
+        before = pool_stats()['default']['checkouts']
+        with pool.connection() as pooled:
+            pooled.execute('SELECT 1')
+        self.assertEqual(pool_stats()['default']['checkouts'], before + 1)
+
+    def test_dead_connections_are_replaced_before_reuse(self):
+        pool = connection.pool
+        with pool.connection():
+            pass
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_terminate_backend(pid) FROM pg_stat_activity '
+                'WHERE datname = current_database() AND pid <> pg_backend_pid()'
+            )
+        lost = pool_stats()['default']['connections_lost']
+        with pool.connection() as pooled:
+            self.assertEqual(pooled.execute('SELECT 1').fetchone(), (1,))
+        self.assertGreater(pool_stats()['default']['connections_lost'], lost)
+
+    def test_statistics_are_for_admins(self):
+        client = APIClient()
+        user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        client.force_authenticate(user)
+        self.assertEqual(client.get(reverse('database-pools')).status_code, 403)
+        user.is_staff = True
+        user.save()
+        response = client.get(reverse('database-pools'), {'reset': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('checkouts', response.data['default'])
+        self.assertEqual(pool_stats()['default']['checkouts'], 0)
@@ -20,6 +20,8 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, Spec
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.pool import PoolStatsView
+
 web_patterns = [
     path('admin/', admin.site.urls),
     # resume_builder web URLs
@@ -35,6 +37,18 @@ apis_patterns = [
     path('api/v1/', include('resume_builder.api.urls')),
     # accounts API URLs
     path('api/v1/', include('accounts.api.urls')),
+    # recommendations API URLs
+    path('api/v1/', include('recommendations.api.urls')),
+    # jobs API URLs
+    path('api/v1/', include('jobs.api.urls')),
+    # ats API URLs
+    path('api/v1/', include('ats.api.urls')),
+    # applications API URLs
+    path('api/v1/', include('applications.api.urls')),
+    # interviews API URLs
+    path('api/v1/', include('interviews.api.urls')),
+    # Connection pool statistics
+    path('api/v1/database/pools/', PoolStatsView.as_view(), name='database-pools'),
 ]
 
 urlpatterns = web_patterns + apis_patterns
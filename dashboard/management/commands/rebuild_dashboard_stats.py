@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized dashboard statistics of every user (or the given ones)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='User id; may be repeated')
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['users']:
+            users = users.filter(pk__in=options['users'])
+            missing = set(options['users']) - set(users.values_list('pk', flat=True))
+            if missing:
+                raise CommandError(f"Unknown user id(s): {', '.join(map(str, sorted(missing)))}")
+
+        count = 0
+        for user_id in users.values_list('pk', flat=True).iterator(chunk_size=500):
+            stats.refresh(user_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt dashboard stats for {count} user(s).'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('resume_count', models.PositiveIntegerField(default=0)),
+                ('public_resume_count', models.PositiveIntegerField(default=0)),
+                ('resumes', models.JSONField(blank=True, default=list)),
+                ('experience_spans', models.JSONField(blank=True, default=list)),
+                ('top_technologies', models.JSONField(blank=True, default=list)),
+                ('certifications', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'User stats',
+            },
+        ),
+    ]
@@ -1,3 +1,48 @@
+import datetime
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class UserStats(models.Model):
+    """Denormalized dashboard figures of one user, kept current by dashboard.stats"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='dashboard_stats'
+    )
+    resume_count = models.PositiveIntegerField(default=0)
+    public_resume_count = models.PositiveIntegerField(default=0)
+    # [{"id", "title", "sections": [section types], "completeness": 0-100}, ...]
+    resumes = models.JSONField(default=list, blank=True)
+    # Merged work experience date spans: [["2019-01-01", "2021-06-30" or null], ...]
+    experience_spans = models.JSONField(default=list, blank=True)
+    # [[technology id, number of skills/experiences/projects/certifications using it], ...]
+    top_technologies = models.JSONField(default=list, blank=True)
+    # Unexpired certifications, soonest expiry first
+    certifications = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'User stats'
+
+    def __str__(self):
+        return f"Stats of user {self.user_id}"
+
+    def experience_years(self, today=None):
+        """Years covered by the spans; open spans (current jobs) run until today"""
+        today = today or datetime.date.today()
+        days = 0
+        for start, end in self.experience_spans:
+            end = datetime.date.fromisoformat(end) if end else today
+            days += max((end - datetime.date.fromisoformat(start)).days, 0)
+        return round(days / 365.25, 1)
+
+    def expiring_certifications(self, within_days=90, today=None):
+        today = today or datetime.date.today()
+        horizon = today + datetime.timedelta(days=within_days)
+        return [
+            certification for certification in self.certifications
+            if today <= datetime.date.fromisoformat(certification['expiration_date']) <= horizon
+        ]
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dashboard import stats
+from resume_builder.models import Resume
+from resume_builder.signals import resume_content_changed
+
+
+@receiver(post_save, sender=Resume, dispatch_uid='dashboard_resume_saved')
+def resume_saved(sender, instance, **kwargs):
+    stats.schedule({'resumes'}, user_ids=[instance.user_id])
+
+
+@receiver(post_delete, sender=Resume, dispatch_uid='dashboard_resume_deleted')
+def resume_deleted(sender, instance, **kwargs):
+    # Its children went with it, so every component may have changed
+    stats.schedule(set(stats.COMPONENTS), user_ids=[instance.user_id])
+
+
+@receiver(resume_content_changed, dispatch_uid='dashboard_resume_content_changed')
+def content_changed(sender, resume_ids, **kwargs):
+    stats.schedule(stats.MODEL_COMPONENTS.get(sender, set()), resume_ids=resume_ids)
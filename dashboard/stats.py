@@ -0,0 +1,160 @@
+"""
+Maintenance of the per-user dashboard statistics (dashboard.models.UserStats).
+
+Each figure belongs to a component that is recomputed for one user with a
+handful of indexed, user-scoped queries. Changes to resume_builder records
+schedule only the components they affect; the refresh runs once per user
+after the transaction commits.
+"""
+import datetime
+import threading
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from dashboard.models import UserStats
+from resume_builder.models import (
+    Award, Certification, Education, Language, Project, Resume, ResumeSection, TechnicalSkill, Technology,
+    WorkExperience
+)
+
+TOP_TECHNOLOGIES = 10
+MAX_CERTIFICATIONS = 20
+
+
+def _resumes(user_id):
+    resumes = list(Resume.objects.filter(user_id=user_id).order_by('-last_modified', '-id')
+                   .values_list('id', 'title', 'visibility', 'completeness'))
+    sections = {}
+    for resume_id, section_type in (ResumeSection.objects.filter(resume__user_id=user_id)
+                                    .values_list('resume_id', 'section_type').distinct()):
+        sections.setdefault(resume_id, set()).add(section_type)
+    return {
+        'resume_count': len(resumes),
+        'public_resume_count': sum(visibility == 'PUBLIC' for _, _, visibility, _ in resumes),
+        'resumes': [
+            {
+                'id': resume_id,
+                'title': title,
+                'sections': sorted(sections.get(resume_id, ())),
+                'completeness': completeness,
+            }
+            for resume_id, title, _, completeness in resumes
+        ],
+    }
+
+
+def _experience(user_id):
+    rows = (WorkExperience.objects.filter(resume__user_id=user_id).order_by('start_date')
+            .values_list('start_date', 'end_date', 'is_current'))
+    spans = []
+    for start, end, is_current in rows:
+        end = None if is_current or end is None else end
+        if spans and (spans[-1][1] is None or start <= spans[-1][1]):
+            # Overlaps the previous span: extend it (an open end stays open)
+            if spans[-1][1] is not None and (end is None or end > spans[-1][1]):
+                spans[-1][1] = end
+        else:
+            spans.append([start, end])
+    return {'experience_spans': [[start.isoformat(), end and end.isoformat()] for start, end in spans]}
+
+
+def _technologies(user_id):
+    counts = Counter()
+    queries = [
+        TechnicalSkill.objects.filter(resume__user_id=user_id).values_list('technology_id'),
+        WorkExperience.technologies.through.objects.filter(workexperience__resume__user_id=user_id)
+        .values_list('technology_id'),
+        Project.technologies.through.objects.filter(project__resume__user_id=user_id).values_list('technology_id'),
+        Certification.skills.through.objects.filter(certification__resume__user_id=user_id)
+        .values_list('technology_id'),
+    ]
+    for queryset in queries:
+        counts.update(dict(queryset.annotate(uses=Count('*')).order_by().values_list('technology_id', 'uses')))
+    top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:TOP_TECHNOLOGIES]
+    return {'top_technologies': [[technology_id, uses] for technology_id, uses in top]}
+
+
+def _certifications(user_id):
+    rows = (Certification.objects.filter(resume__user_id=user_id, expiration_date__gte=datetime.date.today())
+            .order_by('expiration_date', 'id')
+            .values('id', 'name', 'issuer', 'resume_id', 'expiration_date')[:MAX_CERTIFICATIONS])
+    return {'certifications': [{**row, 'expiration_date': row['expiration_date'].isoformat()} for row in rows]}
+
+
+COMPONENTS = {
+    'resumes': _resumes,
+    'experience': _experience,
+    'technologies': _technologies,
+    'certifications': _certifications,
+}
+
+# Components affected by changes to rows of each resume_builder model; every
+# child model feeds the resumes' completeness scores
+MODEL_COMPONENTS = {
+    ResumeSection: {'resumes'},
+    WorkExperience: {'resumes', 'experience', 'technologies'},
+    TechnicalSkill: {'resumes', 'technologies'},
+    Education: {'resumes'},
+    Project: {'resumes', 'technologies'},
+    Certification: {'resumes', 'certifications', 'technologies'},
+    Award: {'resumes'},
+    Language: {'resumes'},
+    Technology: set(),  # names are resolved from the Technology cache when rendering
+}
+
+
+def refresh(user_id, components=None):
+    """
+    Recompute ``components`` (all by default) of the user's stats row. A user
+    without a row gets a complete one, which is returned.
+    """
+    if components is not None:
+        values = {key: value for name in components for key, value in COMPONENTS[name](user_id).items()}
+        if UserStats.objects.filter(user_id=user_id).update(**values, updated_at=timezone.now()):
+            return None
+    values = {key: value for compute in COMPONENTS.values() for key, value in compute(user_id).items()}
+    stats, _ = UserStats.objects.update_or_create(user_id=user_id, defaults=values)
+    return stats
+
+
+def get_stats(user):
+    """The user's stats row, built on first use"""
+    return UserStats.objects.filter(user=user).first() or refresh(user.pk)
+
+
+_pending = threading.local()
+
+
+def schedule(components, user_ids=(), resume_ids=()):
+    """Refresh ``components`` for the given users/resumes' owners after commit"""
+    if not components:
+        return
+    pending = getattr(_pending, 'changes', None)
+    if pending is None:
+        pending = _pending.changes = {'users': {}, 'resumes': {}}
+    for user_id in user_ids:
+        pending['users'].setdefault(user_id, set()).update(components)
+    for resume_id in resume_ids:
+        pending['resumes'].setdefault(resume_id, set()).update(components)
+    # Every schedule registers a flush, the first one to run does the work. If
+    # the transaction rolls back, the next commit flushes the leftovers, which
+    # only recomputes from committed data.
+    transaction.on_commit(flush)
+
+
+def flush():
+    changes, _pending.changes = getattr(_pending, 'changes', None), None
+    if not changes:
+        return
+    by_user = changes['users']
+    if changes['resumes']:
+        owners = Resume.objects.filter(pk__in=changes['resumes']).values_list('pk', 'user_id')
+        for resume_id, user_id in owners:
+            by_user.setdefault(user_id, set()).update(changes['resumes'][resume_id])
+    existing = get_user_model().objects.filter(pk__in=by_user).values_list('pk', flat=True)
+    for user_id in existing:
+        refresh(user_id, by_user[user_id])
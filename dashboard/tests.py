@@ -1,3 +1,84 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import UserStats
+from resume_builder.models import Certification, Resume, ResumeSection, TechnicalSkill, Technology, WorkExperience
+
+User = get_user_model()
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.django = Technology.objects.create(name='Django', category='FRAMEWORK')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume = Resume.objects.create(user=self.user, title='Backend', slug='backend', visibility='PUBLIC')
+
+    def stats(self):
+        return UserStats.objects.get(user=self.user)
+
+    def test_row_follows_resume_changes(self):
+        self.assertEqual(self.stats().resume_count, 1)
+        self.assertEqual(self.stats().public_resume_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            ResumeSection.objects.create(resume=self.resume, section_type='SUMMARY', title='Summary')
+            ResumeSection.objects.create(resume=self.resume, section_type='SKILLS', title='Skills')
+        self.assertEqual(self.stats().resumes[0]['sections'], ['SKILLS', 'SUMMARY'])
+        # 2 of 6 expected sections, weighted 15%
+        self.assertEqual(self.stats().resumes[0]['completeness'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Resume.objects.create(user=self.user, title='Frontend', slug='frontend')
+        self.assertEqual(self.stats().resume_count, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.delete()
+        self.assertEqual((self.stats().resume_count, self.stats().public_resume_count), (1, 0))
+
+    def test_experience_spans_are_merged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            WorkExperience.objects.create(resume=self.resume, job_title='A', company='Co',
+                                          start_date='2018-01-01', end_date='2020-01-01')
+            WorkExperience.objects.create(resume=self.resume, job_title='B', company='Co',
+                                          start_date='2019-01-01', end_date='2021-01-01')
+            WorkExperience.objects.create(resume=self.resume, job_title='C', company='Co',
+                                          start_date='2022-01-01', is_current=True)
+        stats = self.stats()
+        self.assertEqual(stats.experience_spans, [['2018-01-01', '2021-01-01'], ['2022-01-01', None]])
+        self.assertEqual(stats.experience_years(today=datetime.date(2024, 1, 1)), 5.0)
+
+    def test_top_technologies_and_expiring_certifications(self):
+        soon = datetime.date.today() + datetime.timedelta(days=30)
+        with self.captureOnCommitCallbacks(execute=True):
+            TechnicalSkill.objects.create(resume=self.resume, technology=self.django, proficiency=80)
+            experience = WorkExperience.objects.create(resume=self.resume, job_title='Dev', company='Co',
+                                                       start_date='2020-01-01')
+            experience.technologies.set([self.python, self.django])
+            certification = Certification.objects.create(resume=self.resume, name='AWS', issuer='Amazon',
+                                                         issue_date='2022-01-01', expiration_date=soon)
+            certification.skills.set([self.python])
+            Certification.objects.create(resume=self.resume, name='Old', issuer='Org',
+                                         issue_date='2010-01-01', expiration_date='2012-01-01')
+        stats = self.stats()
+        self.assertEqual(stats.top_technologies, [[self.python.id, 2], [self.django.id, 2]])
+        self.assertEqual([c['name'] for c in stats.expiring_certifications()], ['AWS'])
+
+    def test_dashboard_renders_from_one_row(self):
+        self.client.force_login(self.user)
+        # session + user + the stats row
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Backend')
 
-# Create your tests here.
+    def test_rebuild_command(self):
+        UserStats.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_dashboard_stats', stdout=out)
+        self.assertIn('1 user(s)', out.getvalue())
+        self.assertEqual(self.stats().resume_count, 1)
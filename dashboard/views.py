@@ -1,6 +1,20 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 
+from dashboard.stats import get_stats
+from resume_builder.cache import technologies
+
+
 @login_required(login_url='/web/accounts/login/')
 def dashboard(request):
-    return render(request, 'dashboard/dashboard.html')
\ No newline at end of file
+    # One primary key lookup; all figures are maintained by dashboard.stats
+    stats = get_stats(request.user)
+    top_technologies = [
+        (technologies.get(technology_id), uses) for technology_id, uses in stats.top_technologies
+    ]
+    return render(request, 'dashboard/dashboard.html', {
+        'stats': stats,
+        'experience_years': stats.experience_years(),
+        'top_technologies': [(technology, uses) for technology, uses in top_technologies if technology],
+        'expiring_certifications': stats.expiring_certifications(),
+    })
@@ -0,0 +1,94 @@
+import datetime
+
+from django.db.models import Q
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from interviews import booking
+from interviews.api.serializers import (
+    AvailabilityRuleSerializer, InterviewSerializer, SlotSearchSerializer, SlotSerializer
+)
+from interviews.models import AvailabilityRule, Interview
+
+
+class SlotTaken(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A participant already has an interview at that time.'
+    default_code = 'slot_taken'
+
+
+class Unavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A participant is not available at that time.'
+    default_code = 'participant_unavailable'
+
+
+class AvailabilityRuleViewSet(viewsets.ModelViewSet):
+    """The user's weekly availability, in their local time zone"""
+    queryset = AvailabilityRule.objects.all()
+    serializer_class = AvailabilityRuleSerializer
+
+    def get_queryset(self):
+        return super().get_queryset().filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class InterviewViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                       viewsets.GenericViewSet):
+    """
+    Interviews the user organizes or takes part in. Creating one books it
+    (409 if a participant is no longer free or outside their availability
+    rules); ``slots/`` finds the earliest
+    times every participant is free.
+    """
+    queryset = Interview.objects.prefetch_related('participants')
+    serializer_class = InterviewSerializer
+    filterset_fields = ['status', 'application']
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = super().get_queryset()
+        if self.action == 'cancel':
+            return queryset.filter(organizer=user)
+        return queryset.filter(Q(organizer=user) | Q(participants__user=user)).distinct()
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        try:
+            serializer.instance = booking.book(
+                self.request.user,
+                [(participant['user'].pk, participant['role']) for participant in data['participants']],
+                data['period']['lower'], data['period']['upper'], data['title'], data.get('application'),
+            )
+        except booking.Unavailable as exc:
+            raise Unavailable({'participants': [
+                f'User {user_id} is not available at that time.' for user_id in exc.user_ids
+            ]})
+        except booking.SlotTaken:
+            raise SlotTaken
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        interview = booking.cancel(self.get_object())
+        return Response(self.get_serializer(interview).data)
+
+    @action(detail=False, methods=['post'], serializer_class=SlotSearchSerializer)
+    def slots(self, request):
+        """
+        POST {"participants": [user ids], "start", "end" (default start + 7 days),
+        "duration" (minutes), "limit"}: the earliest slots free for all of them.
+        """
+        serializer = SlotSearchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        found = booking.find_slots(
+            data['participants'], data['start'], data['end'], datetime.timedelta(minutes=data['duration']),
+            data['limit'],
+        )
+        return Response({'results': SlotSerializer(
+            [{'start': start, 'end': end} for start, end in found], many=True
+        ).data})
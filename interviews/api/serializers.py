@@ -0,0 +1,62 @@
+import datetime
+
+from rest_framework import serializers
+
+from interviews.models import AvailabilityRule, Interview, InterviewParticipant
+
+MAX_SEARCH_DAYS = 31
+
+
+class AvailabilityRuleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AvailabilityRule
+        fields = ['id', 'user', 'weekday', 'start_time', 'end_time', 'time_zone']
+        read_only_fields = ['id', 'user']
+
+
+class ParticipantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InterviewParticipant
+        fields = ['user', 'role']
+
+
+class InterviewSerializer(serializers.ModelSerializer):
+    start = serializers.DateTimeField(source='period.lower')
+    end = serializers.DateTimeField(source='period.upper')
+    participants = ParticipantSerializer(many=True, allow_empty=False, max_length=20)
+
+    class Meta:
+        model = Interview
+        fields = ['id', 'title', 'application', 'organizer', 'start', 'end', 'status', 'participants', 'created_at']
+        read_only_fields = ['id', 'organizer', 'status', 'created_at']
+
+    def validate(self, attrs):
+        period = attrs['period']
+        if period['upper'] <= period['lower']:
+            raise serializers.ValidationError({'end': ['Must be after start.']})
+        users = [participant['user'].pk for participant in attrs['participants']]
+        if len(set(users)) != len(users):
+            raise serializers.ValidationError({'participants': ['Each user may only take part once.']})
+        return attrs
+
+
+class SlotSearchSerializer(serializers.Serializer):
+    participants = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=20)
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField(required=False)
+    duration = serializers.IntegerField(min_value=5, max_value=8 * 60, help_text='Minutes')
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+    def validate(self, attrs):
+        attrs.setdefault('end', attrs['start'] + datetime.timedelta(days=7))
+        if attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': ['Must be after start.']})
+        if attrs['end'] - attrs['start'] > datetime.timedelta(days=MAX_SEARCH_DAYS):
+            raise serializers.ValidationError({'end': [f'Search at most {MAX_SEARCH_DAYS} days at a time.']})
+        attrs['participants'] = list(dict.fromkeys(attrs['participants']))
+        return attrs
+
+
+class SlotSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from interviews.api.api import AvailabilityRuleViewSet, InterviewViewSet
+
+router = DefaultRouter()
+router.register(r'interviews/availability', AvailabilityRuleViewSet)
+router.register(r'interviews', InterviewViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
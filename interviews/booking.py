@@ -0,0 +1,124 @@
+"""
+Slot search and booking on top of interviews.scheduler.
+
+Searches load the participants' rules and their interviews overlapping the
+searched range (two queries, the second served by the exclusion constraint's
+GiST index) and plan in memory. Booking does not trust the search: it
+checks the period against every participant's free time first (Unavailable
+outside their availability rules), and the ``participant_no_overlap``
+constraint still rejects a slot taken in the meantime, which surfaces as
+SlotTaken.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+
+from core.db import sqlstate
+from interviews import scheduler
+from interviews.models import AvailabilityRule, Interview, InterviewParticipant
+
+EXCLUSION_VIOLATION = '23P01'
+
+
+class SlotTaken(Exception):
+    """Raised when a participant already has an interview within the buffer of the slot"""
+
+
+class Unavailable(Exception):
+    """Raised when the slot falls outside the availability rules of the participants in ``user_ids``"""
+
+    def __init__(self, user_ids):
+        super().__init__(user_ids)
+        self.user_ids = user_ids
+
+
+def buffer():
+    return datetime.timedelta(minutes=settings.INTERVIEW_BUFFER_MINUTES)
+
+
+def granularity():
+    return datetime.timedelta(minutes=settings.INTERVIEW_SLOT_MINUTES)
+
+
+def schedules(user_ids, start, end):
+    """``{user_id: (rules, busy)}`` for interviews.scheduler, busy periods sorted"""
+    result = {user_id: ([], []) for user_id in user_ids}
+    for rule in AvailabilityRule.objects.filter(user_id__in=user_ids):
+        result[rule.user_id][0].append(rule.as_rule())
+    margin = buffer()
+    busy = InterviewParticipant.objects.filter(
+        user_id__in=user_ids, is_cancelled=False, blocked__overlap=DateTimeTZRange(start - margin, end + margin),
+    ).values_list('user_id', 'interview__period').order_by('interview__period')
+    for user_id, period in busy:
+        result[user_id][1].append((period.lower, period.upper))
+    return result
+
+
+def find_slots(user_ids, start, end, duration, limit=None):
+    """Earliest slots in [start, end) in which every one of ``user_ids`` is free"""
+    loaded = schedules(user_ids, start, end)
+    return scheduler.common_slots(
+        [loaded[user_id] for user_id in user_ids], start, end, duration, buffer(), granularity(), limit
+    )
+
+
+def plan(user_ids, start, end, duration):
+    """``{user_id: [slot, ...]}``: every slot each user could take in [start, end), e.g. a recruiter's week"""
+    margin, step = buffer(), granularity()
+    return {
+        user_id: scheduler.slots(scheduler.free_time(rules, busy, start, end, margin), duration, step)
+        for user_id, (rules, busy) in schedules(user_ids, start, end).items()
+    }
+
+
+def book(organizer, participants, start, end, title, application=None):
+    """
+    Schedule an interview for ``participants`` (``[(user_id, role), ...]``);
+    raises Unavailable when [start, end) is outside a participant's
+    availability, SlotTaken when it would overlap, buffer included, another
+    interview of any of them.
+    """
+    check_free([user_id for user_id, _ in participants], start, end)
+    try:
+        with transaction.atomic():
+            interview = Interview.objects.create(
+                organizer=organizer, title=title, application=application, period=DateTimeTZRange(start, end)
+            )
+            blocked = DateTimeTZRange(start, end + buffer())
+            InterviewParticipant.objects.bulk_create([
+                InterviewParticipant(interview=interview, user_id=user_id, role=role, blocked=blocked)
+                for user_id, role in participants
+            ])
+    except IntegrityError as exc:
+        if sqlstate(exc) == EXCLUSION_VIOLATION:
+            raise SlotTaken from exc
+        raise
+    return interview
+
+
+def check_free(user_ids, start, end):
+    """
+    Raise unless [start, end) is free time for every one of ``user_ids``;
+    an overlap found here is SlotTaken early, without the failed insert.
+    """
+    margin, unavailable, taken = buffer(), [], False
+    for user_id, (rules, busy) in schedules(user_ids, start, end).items():
+        if scheduler.free_time(rules, [], start, end, margin) != [(start, end)]:
+            unavailable.append(user_id)
+        elif scheduler.free_time(rules, busy, start, end, margin) != [(start, end)]:
+            taken = True
+    if unavailable:
+        raise Unavailable(unavailable)
+    if taken:
+        raise SlotTaken
+
+
+def cancel(interview):
+    """Cancel ``interview``, releasing its participants' time"""
+    with transaction.atomic():
+        Interview.objects.filter(pk=interview.pk).update(status='CANCELLED')
+        InterviewParticipant.objects.filter(interview=interview).update(is_cancelled=True)
+    interview.status = 'CANCELLED'
+    return interview
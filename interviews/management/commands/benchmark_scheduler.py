@@ -0,0 +1,67 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from interviews import scheduler
+
+TIME_ZONES = ['UTC', 'Europe/Berlin', 'Europe/London', 'America/New_York', 'America/Los_Angeles', 'Asia/Kolkata',
+              'Asia/Tokyo', 'Australia/Sydney']
+
+
+class Command(BaseCommand):
+    help = 'Measure planning a week of interview slots for many recruiters over synthetic calendars'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=500)
+        parser.add_argument('--interviews', type=int, default=20, help='Booked interviews per recruiter and week')
+        parser.add_argument('--duration', type=int, default=60, help='Slot length in minutes')
+        parser.add_argument('--participants', type=int, default=3, help='Recruiters per common-slot search')
+        parser.add_argument('--iterations', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        start = datetime.datetime(2026, 3, 2, tzinfo=datetime.timezone.utc)
+        end = start + datetime.timedelta(days=7)
+        buffer, granularity = datetime.timedelta(minutes=15), datetime.timedelta(minutes=15)
+        duration = datetime.timedelta(minutes=options['duration'])
+
+        calendars = []
+        for _ in range(options['recruiters']):
+            zone = rng.choice(TIME_ZONES)
+            # Mornings and afternoons around a lunch break, Monday to Friday
+            rules = [
+                (weekday, datetime.time(hour), datetime.time(until), zone)
+                for weekday in range(5) for hour, until in ((9, 12), (13, 17))
+            ]
+            busy = sorted(
+                (moment, moment + datetime.timedelta(minutes=rng.choice([30, 45, 60])))
+                for moment in (
+                    start + datetime.timedelta(minutes=15 * rng.randrange(7 * 24 * 4))
+                    for _ in range(options['interviews'])
+                )
+            )
+            calendars.append((rules, busy))
+
+        timings, total = [], 0
+        for _ in range(options['iterations']):
+            started = time.perf_counter()
+            planned = [
+                scheduler.slots(scheduler.free_time(rules, busy, start, end, buffer), duration, granularity)
+                for rules, busy in calendars
+            ]
+            timings.append(time.perf_counter() - started)
+            total = sum(map(len, planned))
+        best = min(timings) * 1000
+        self.stdout.write(
+            f'{len(calendars)} recruiters, a week of {options["duration"]} minute slots: '
+            f'{best:.1f} ms ({best * 1000 / len(calendars):.0f} us per recruiter, {total} slots)'
+        )
+
+        searches = [rng.sample(calendars, options['participants']) for _ in range(200)]
+        started = time.perf_counter()
+        for participants in searches:
+            scheduler.common_slots(participants, start, end, duration, buffer, granularity, limit=10)
+        elapsed = (time.perf_counter() - started) * 1000 / len(searches)
+        self.stdout.write(f'earliest 10 common slots of {options["participants"]} recruiters: {elapsed:.2f} ms')
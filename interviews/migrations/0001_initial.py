@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:38
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+import django.contrib.postgres.fields.ranges
+import django.db.models.deletion
+import interviews.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name='Interview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('status', models.CharField(choices=[('SCHEDULED', 'Scheduled'), ('CANCELLED', 'Cancelled')], default='SCHEDULED', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='interviews', to='applications.application')),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='organized_interviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['period__startswith'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AvailabilityRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('time_zone', models.CharField(default='UTC', max_length=64, validators=[interviews.models.validate_time_zone])),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_rules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['weekday', 'start_time'],
+                'indexes': [models.Index(fields=['user', 'weekday'], name='interviews__user_id_2b8da3_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='InterviewParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('CANDIDATE', 'Candidate'), ('RECRUITER', 'Recruiter'), ('INTERVIEWER', 'Interviewer')], default='INTERVIEWER', max_length=12)),
+                ('blocked', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('is_cancelled', models.BooleanField(default=False)),
+                ('interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='interviews.interview')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interview_participations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('is_cancelled', False)), expressions=[('user', '='), ('blocked', '&&')], name='participant_no_overlap')],
+                'unique_together': {('interview', 'user')},
+            },
+        ),
+    ]
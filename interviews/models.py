@@ -1,3 +1,122 @@
+import zoneinfo
+
+from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.core.exceptions import ValidationError
 from django.db import models
 
-# Create your models here.
+from applications.models import Application
+
+
+def validate_time_zone(value):
+    if value not in zoneinfo.available_timezones():
+        raise ValidationError(f'Unknown time zone: {value}')
+
+
+class AvailabilityRule(models.Model):
+    """Weekly window in which a user can interview, in their local time"""
+    WEEKDAYS = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='availability_rules'
+    )
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAYS)
+    start_time = models.TimeField()
+    # At or before start_time for windows running past midnight
+    end_time = models.TimeField()
+    time_zone = models.CharField(max_length=64, default='UTC', validators=[validate_time_zone])
+
+    class Meta:
+        ordering = ['weekday', 'start_time']
+        indexes = [
+            models.Index(fields=['user', 'weekday']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.get_weekday_display()} {self.start_time}-{self.end_time} {self.time_zone}"
+
+    def as_rule(self):
+        """The ``(weekday, start_time, end_time, time_zone)`` tuple interviews.scheduler works with"""
+        return self.weekday, self.start_time, self.end_time, self.time_zone
+
+
+class Interview(models.Model):
+    STATUSES = [
+        ('SCHEDULED', 'Scheduled'),
+        ('CANCELLED', 'Cancelled'),
+    ]
+
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='interviews'
+    )
+    organizer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='organized_interviews'
+    )
+    title = models.CharField(max_length=255)
+    period = DateTimeRangeField()
+    status = models.CharField(max_length=10, choices=STATUSES, default='SCHEDULED')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['period__startswith']
+
+    def __str__(self):
+        return f"{self.title} ({self.period.lower:%Y-%m-%d %H:%M})"
+
+
+class InterviewParticipant(models.Model):
+    """
+    A user taking part in an interview. ``blocked`` is the interview's period
+    extended by the buffer that must follow it, so the exclusion constraint
+    keeps every user's interviews apart by at least that buffer.
+    """
+    ROLES = [
+        ('CANDIDATE', 'Candidate'),
+        ('RECRUITER', 'Recruiter'),
+        ('INTERVIEWER', 'Interviewer'),
+    ]
+
+    interview = models.ForeignKey(
+        Interview,
+        on_delete=models.CASCADE,
+        related_name='participants'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='interview_participations'
+    )
+    role = models.CharField(max_length=12, choices=ROLES, default='INTERVIEWER')
+    blocked = DateTimeRangeField()
+    # Copy of the interview's status, so the constraint can ignore cancelled interviews
+    is_cancelled = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('interview', 'user')
+        constraints = [
+            ExclusionConstraint(
+                name='participant_no_overlap',
+                expressions=[('user', RangeOperators.EQUAL), ('blocked', RangeOperators.OVERLAPS)],
+                condition=models.Q(is_cancelled=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in {self.interview_id} ({self.role})"
@@ -0,0 +1,138 @@
+"""
+In-memory interval arithmetic for finding interview slots.
+
+Every participant's free time is a sorted list of disjoint, half-open
+``(start, end)`` intervals of aware datetimes: their weekly availability
+rules expanded in their own time zone, minus their interviews widened by the
+buffer. Lists are combined with linear sweeps over sorted input (merge,
+subtract, intersect), so planning is O(intervals) per participant with no
+per-minute grids.
+"""
+import datetime
+from zoneinfo import ZoneInfo
+
+UTC = datetime.timezone.utc
+
+
+def merge(intervals):
+    """Union of ``intervals`` (any order) as sorted, disjoint intervals; touching ones are joined"""
+    merged = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract(intervals, removed):
+    """Parts of sorted disjoint ``intervals`` outside sorted disjoint ``removed``"""
+    result, index = [], 0
+    for start, end in intervals:
+        # Skip what ends before this interval; ``removed`` is sorted, so never revisit it
+        while index < len(removed) and removed[index][1] <= start:
+            index += 1
+        cursor, probe = start, index
+        while probe < len(removed) and removed[probe][0] < end:
+            if removed[probe][0] > cursor:
+                result.append((cursor, removed[probe][0]))
+            cursor = max(cursor, removed[probe][1])
+            probe += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def intersect(first, second):
+    """Intersection of two sorted disjoint interval lists"""
+    result, i, j = [], 0, 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def intersect_all(lists):
+    """Intersection of several sorted disjoint interval lists, shortest first to shrink early"""
+    lists = sorted(lists, key=len)
+    if not lists:
+        return []
+    common = lists[0]
+    for intervals in lists[1:]:
+        if not common:
+            break
+        common = intersect(common, intervals)
+    return common
+
+
+def expand_rules(rules, start, end):
+    """
+    Concrete availability in [start, end) for weekly rules given as
+    ``(weekday, start_time, end_time, time_zone)`` in local time. Days are
+    walked in each rule's own zone, so windows keep their wall-clock times
+    across DST changes; an end time at or before the start time runs past
+    midnight.
+    """
+    windows = []
+    for weekday, start_time, end_time, time_zone in rules:
+        zone = ZoneInfo(time_zone)
+        day = start.astimezone(zone).date() - datetime.timedelta(days=1)
+        last = end.astimezone(zone).date()
+        day += datetime.timedelta(days=(weekday - day.weekday()) % 7)
+        while day <= last:
+            opens = datetime.datetime.combine(day, start_time, zone)
+            closes = datetime.datetime.combine(
+                day + datetime.timedelta(days=end_time <= start_time), end_time, zone
+            )
+            opens, closes = max(opens.astimezone(UTC), start), min(closes.astimezone(UTC), end)
+            if opens < closes:
+                windows.append((opens, closes))
+            day += datetime.timedelta(days=7)
+    return merge(windows)
+
+
+def free_time(rules, busy, start, end, buffer):
+    """A participant's free intervals: availability minus ``busy`` widened by ``buffer`` on both sides"""
+    blocked = merge((busy_start - buffer, busy_end + buffer) for busy_start, busy_end in busy)
+    return subtract(expand_rules(rules, start, end), blocked)
+
+
+def align(moment, granularity):
+    """``moment`` rounded up to a multiple of ``granularity`` since the epoch"""
+    epoch = datetime.datetime(1970, 1, 1, tzinfo=UTC)
+    remainder = (moment - epoch) % granularity
+    return moment if not remainder else moment + (granularity - remainder)
+
+
+def slots(free, duration, granularity, limit=None):
+    """
+    Earliest ``(start, end)`` slots of ``duration`` within sorted ``free``
+    intervals, starting on ``granularity`` boundaries, every boundary that fits.
+    """
+    found = []
+    for start, end in free:
+        cursor = align(start, granularity)
+        while cursor + duration <= end:
+            found.append((cursor, cursor + duration))
+            if limit is not None and len(found) >= limit:
+                return found
+            cursor += granularity
+    return found
+
+
+def common_slots(participants, start, end, duration, buffer, granularity, limit=None):
+    """
+    Earliest slots free for every participant, where ``participants`` holds
+    ``(rules, busy)`` per participant.
+    """
+    free = intersect_all([free_time(rules, busy, start, end, buffer) for rules, busy in participants])
+    return slots(free, duration, granularity, limit)
@@ -1,3 +1,164 @@
-from django.test import TestCase
+import datetime
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from interviews import booking, scheduler
+from interviews.models import AvailabilityRule, Interview, InterviewParticipant
+
+User = get_user_model()
+UTC = datetime.timezone.utc
+
+
+def at(day, hour, minute=0):
+    return datetime.datetime(2026, 3, day, hour, minute, tzinfo=UTC)
+
+
+class IntervalTests(SimpleTestCase):
+    def test_merge_subtract_intersect(self):
+        self.assertEqual(scheduler.merge([(at(2, 11), at(2, 12)), (at(2, 9), at(2, 10)), (at(2, 10), at(2, 11))]),
+                         [(at(2, 9), at(2, 12))])
+        self.assertEqual(
+            scheduler.subtract([(at(2, 9), at(2, 17))], [(at(2, 8), at(2, 10)), (at(2, 12), at(2, 13))]),
+            [(at(2, 10), at(2, 12)), (at(2, 13), at(2, 17))],
+        )
+        self.assertEqual(
+            scheduler.intersect_all([
+                [(at(2, 9), at(2, 12)), (at(2, 14), at(2, 18))],
+                [(at(2, 11), at(2, 15))],
+                [(at(2, 8), at(2, 20))],
+            ]),
+            [(at(2, 11), at(2, 12)), (at(2, 14), at(2, 15))],
+        )
+
+    def test_rules_follow_local_time_across_dst(self):
+        # New York moves to daylight time on Sunday 2026-03-08
+        rules = [(0, datetime.time(9), datetime.time(17), 'America/New_York')]
+        windows = scheduler.expand_rules(rules, at(1, 0), at(17, 0))
+        self.assertEqual(windows, [(at(2, 14), at(2, 22)), (at(9, 13), at(9, 21)), (at(16, 13), at(16, 21))])
+        overnight = scheduler.expand_rules([(4, datetime.time(22), datetime.time(2), 'UTC')], at(6, 0), at(8, 0))
+        self.assertEqual(overnight, [(at(6, 22), at(7, 2))])
+
+    def test_slots_respect_buffer_and_granularity(self):
+        rules = [(0, datetime.time(9), datetime.time(12), 'UTC')]
+        busy = [(at(2, 9, 50), at(2, 10, 30))]
+        free = scheduler.free_time(rules, busy, at(2, 9, 5), at(3, 0), datetime.timedelta(minutes=15))
+        self.assertEqual(free, [(at(2, 9, 5), at(2, 9, 35)), (at(2, 10, 45), at(2, 12))])
+        found = scheduler.slots(free, datetime.timedelta(minutes=30), datetime.timedelta(minutes=15), limit=3)
+        self.assertEqual([start for start, _ in found], [at(2, 10, 45), at(2, 11), at(2, 11, 15)])
+
+
+@override_settings(INTERVIEW_BUFFER_MINUTES=15, INTERVIEW_SLOT_MINUTES=15)
+class InterviewSchedulingTests(APITestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user(email='hr@example.com', username='hr', password='testpass123')
+        self.candidate = User.objects.create_user(email='c@example.com', username='c', password='testpass123')
+        self.client.force_authenticate(self.recruiter)
+        # Monday 2026-03-02: recruiter 9-12 UTC, candidate 11-17 in Berlin (10-16 UTC)
+        AvailabilityRule.objects.create(user=self.recruiter, weekday=0, start_time=datetime.time(9),
+                                        end_time=datetime.time(12))
+        AvailabilityRule.objects.create(user=self.candidate, weekday=0, start_time=datetime.time(11),
+                                        end_time=datetime.time(17), time_zone='Europe/Berlin')
+
+    def search(self, **extra):
+        response = self.client.post(reverse('interview-slots'), {
+            'participants': [self.recruiter.id, self.candidate.id], 'start': at(2, 0).isoformat(),
+            'duration': 60, **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [(item['start'], item['end']) for item in response.data['results']]
+
+    def book(self, start, end):
+        return self.client.post(reverse('interview-list'), {
+            'title': 'Screening', 'start': start.isoformat(), 'end': end.isoformat(),
+            'participants': [{'user': self.recruiter.id, 'role': 'RECRUITER'},
+                             {'user': self.candidate.id, 'role': 'CANDIDATE'}],
+        }, format='json')
+
+    def test_earliest_common_slots(self):
+        self.assertEqual(self.search(limit=3), [
+            ('2026-03-02T10:00:00Z', '2026-03-02T11:00:00Z'),
+            ('2026-03-02T10:15:00Z', '2026-03-02T11:15:00Z'),
+            ('2026-03-02T10:30:00Z', '2026-03-02T11:30:00Z'),
+        ])
+
+    def test_booking_removes_slot_including_buffer(self):
+        response = self.book(at(2, 10), at(2, 11))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['start'], '2026-03-02T10:00:00Z')
+        # 11:00 + 15 minutes of buffer leaves 11:15-12:00 for a 30 minute slot
+        self.assertEqual(self.search(duration=30, limit=2)[:2], [
+            ('2026-03-02T11:15:00Z', '2026-03-02T11:45:00Z'),
+            ('2026-03-02T11:30:00Z', '2026-03-02T12:00:00Z'),
+        ])
+
+    def test_overlap_is_rejected_by_the_database(self):
+        self.assertEqual(self.book(at(2, 10), at(2, 11)).status_code, status.HTTP_201_CREATED)
+        # Within the buffer of the first interview
+        response = self.book(at(2, 11, 10), at(2, 11, 40))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Interview.objects.count(), 1)
+        self.assertEqual(self.book(at(2, 11, 15), at(2, 11, 45)).status_code, status.HTTP_201_CREATED)
+
+        interview = Interview.objects.create(organizer=self.recruiter, title='Raw', period=DateTimeTZRange(
+            at(2, 10, 30), at(2, 10, 45)))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            InterviewParticipant.objects.create(interview=interview, user=self.candidate,
+                                                blocked=DateTimeTZRange(at(2, 10, 30), at(2, 11)))
+
+    def test_booking_outside_availability_is_rejected(self):
+        # 9:00-10:00 UTC is before the candidate's 11:00 in Berlin
+        response = self.book(at(2, 9), at(2, 10))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['participants'], [f'User {self.candidate.id} is not available at that time.'])
+        # Tuesday: neither has a rule
+        self.assertEqual(len(self.book(at(3, 10), at(3, 11)).data['participants']), 2)
+        # Runs past the recruiter's noon
+        self.assertEqual(self.book(at(2, 11, 30), at(2, 12, 30)).status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Interview.objects.exists())
+        with self.assertRaises(booking.Unavailable):
+            booking.book(self.recruiter, [(self.candidate.id, 'CANDIDATE')], at(2, 3), at(2, 4), 'Late')
+
+    def test_cancelling_frees_the_time(self):
+        interview_id = self.book(at(2, 10), at(2, 11)).data['id']
+        self.client.force_authenticate(self.candidate)
+        self.assertEqual(self.client.post(reverse('interview-cancel', args=[interview_id])).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse('interview-list')).data['results'][0]['id'], interview_id)
+        self.client.force_authenticate(self.recruiter)
+        response = self.client.post(reverse('interview-cancel', args=[interview_id]))
+        self.assertEqual(response.data['status'], 'CANCELLED')
+        self.assertEqual(self.search(limit=1)[0][0], '2026-03-02T10:00:00Z')
+        self.assertEqual(self.book(at(2, 10), at(2, 11)).status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(reverse('interview-list'), {'page_size': 1})
+        self.assertEqual(response.data['results'][0]['id'], interview_id)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['status'], 'SCHEDULED')
+
+    def test_plan_a_week_per_user(self):
+        self.book(at(2, 10), at(2, 11))
+        planned = booking.plan([self.recruiter.id, self.candidate.id], at(2, 0), at(9, 0),
+                               datetime.timedelta(hours=1))
+        # 9:00-9:45 and 11:15-12:00 are left around the interview, both too short
+        self.assertEqual(planned[self.recruiter.id], [])
+        self.assertEqual(planned[self.candidate.id][0][0], at(2, 11, 15))
+
+    def test_availability_rules_are_per_user(self):
+        response = self.client.post(reverse('availabilityrule-list'), {
+            'weekday': 1, 'start_time': '09:00', 'end_time': '12:00', 'time_zone': 'Asia/Tokyo',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['user'], self.recruiter.id)
+        bad = self.client.post(reverse('availabilityrule-list'), {
+            'weekday': 1, 'start_time': '09:00', 'end_time': '12:00', 'time_zone': 'Mars/Olympus',
+        })
+        self.assertEqual(bad.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(self.candidate)
+        self.assertEqual(len(self.client.get(reverse('availabilityrule-list')).data['results']), 1)
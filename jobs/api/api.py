@@ -0,0 +1,55 @@
+from django.db.models import Prefetch
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+
+from jobs import matching
+from jobs.api.serializers import CandidateSerializer, JobPostingSerializer
+from jobs.models import JobPosting
+from resume_builder.models import TechnicalSkill
+
+
+class MatchTimedOut(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Matching candidates took too long; narrow the requirements or try again shortly.'
+    default_code = 'match_timeout'
+
+
+class JobPostingViewSet(viewsets.ModelViewSet):
+    queryset = JobPosting.objects.prefetch_related('requirements')
+    serializer_class = JobPostingSerializer
+    filterset_fields = ['owner', 'is_active', 'company']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in SAFE_METHODS:
+            # Postings are readable by everyone but only changed by their owner
+            queryset = queryset.filter(owner=self.request.user)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    @action(detail=True, methods=['get'], serializer_class=CandidateSerializer, filterset_fields=[])
+    def candidates(self, request, pk=None):
+        """
+        Public resumes meeting every requirement of the posting, most recently
+        updated first, each with its skills in the required technologies.
+        """
+        requirements = list(self.get_object().requirements.all())
+        try:
+            with matching.latency_budget():
+                queryset = matching.candidates(requirements).only(
+                    'id', 'user_id', 'title', 'slug', 'language', 'last_modified'
+                ).prefetch_related(Prefetch(
+                    'technical_skills',
+                    queryset=TechnicalSkill.objects.filter(
+                        technology__in=[requirement.technology_id for requirement in requirements], is_visible=True,
+                    ).order_by('technology_id'),
+                    to_attr='matched_skills',
+                ))
+                page = self.paginate_queryset(queryset)
+        except matching.MatchTimeout:
+            raise MatchTimedOut
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
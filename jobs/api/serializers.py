@@ -0,0 +1,79 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from jobs.models import JobPosting, JobRequirement
+from resume_builder import cache
+from resume_builder.models import Resume, TechnicalSkill
+
+
+class JobRequirementSerializer(serializers.ModelSerializer):
+    # Checked against the Technology cache instead of a query per requirement
+    technology = serializers.IntegerField(source='technology_id')
+    technology_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JobRequirement
+        fields = ['technology', 'technology_name', 'min_proficiency', 'min_years']
+
+    def validate_technology(self, value):
+        if cache.technologies.get(value) is None:
+            raise serializers.ValidationError('Unknown technology.')
+        return value
+
+    def get_technology_name(self, obj):
+        technology = cache.technologies.get(obj.technology_id)
+        return technology.name if technology else None
+
+
+class JobPostingSerializer(serializers.ModelSerializer):
+    requirements = JobRequirementSerializer(many=True, allow_empty=False, max_length=20)
+
+    class Meta:
+        model = JobPosting
+        fields = '__all__'
+        read_only_fields = ['id', 'owner', 'created_at', 'updated_at']
+
+    def validate_requirements(self, value):
+        if len({item['technology_id'] for item in value}) != len(value):
+            raise serializers.ValidationError('Each technology may only be required once.')
+        return value
+
+    @transaction.atomic
+    def create(self, validated_data):
+        requirements = validated_data.pop('requirements')
+        posting = super().create(validated_data)
+        self.set_requirements(posting, requirements)
+        return posting
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        requirements = validated_data.pop('requirements', None)
+        posting = super().update(instance, validated_data)
+        if requirements is not None:
+            posting.requirements.all().delete()
+            self.set_requirements(posting, requirements)
+        return posting
+
+    def set_requirements(self, posting, requirements):
+        JobRequirement.objects.bulk_create([JobRequirement(posting=posting, **attrs) for attrs in requirements])
+
+
+class CandidateSkillSerializer(serializers.ModelSerializer):
+    technology_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TechnicalSkill
+        fields = ['technology', 'technology_name', 'proficiency', 'years_experience', 'last_used']
+
+    def get_technology_name(self, obj):
+        technology = cache.technologies.get(obj.technology_id)
+        return technology.name if technology else None
+
+
+class CandidateSerializer(serializers.ModelSerializer):
+    """A matching resume with its skills for the posting's required technologies"""
+    skills = CandidateSkillSerializer(source='matched_skills', many=True, read_only=True)
+
+    class Meta:
+        model = Resume
+        fields = ['id', 'user', 'title', 'slug', 'language', 'last_modified', 'skills']
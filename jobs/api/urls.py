@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+
+from jobs.api.api import JobPostingViewSet
+
+router = DefaultRouter()
+router.register(r'jobs', JobPostingViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,91 @@
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from jobs import matching
+from jobs.models import JobRequirement
+from resume_builder.models import Resume, TechnicalSkill, Technology
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure requirement matching over synthetic skills, inserted in a rolled-back transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=70000)
+        parser.add_argument('--technologies', type=int, default=2000)
+        parser.add_argument('--skills-per-resume', type=int, default=15)
+        parser.add_argument('--required', type=int, default=3, help='Requirements of each queried posting')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--iterations', type=int, default=100)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = np.random.default_rng(0)
+        started = time.perf_counter()
+        user = get_user_model().objects.create_user(
+            email='benchmark@example.com', username='benchmark-job-matching', password=None
+        )
+        technologies = Technology.objects.bulk_create([
+            Technology(name=f'benchmark-{index}', category='TOOL') for index in range(options['technologies'])
+        ])
+        resumes = Resume.objects.bulk_create([
+            Resume(user=user, title=f'Benchmark {index}', slug=f'benchmark-job-matching-{index}',
+                   visibility='PUBLIC' if index % 10 else 'PRIVATE')
+            for index in range(options['resumes'])
+        ], batch_size=5000)
+
+        # Zipf-like popularity, so common technologies have long posting lists as in real data
+        popularity = 1 / np.arange(1, len(technologies) + 1)
+        per_resume = options['skills_per_resume']
+        skills = [
+            TechnicalSkill(resume=resume, technology=technologies[index], proficiency=int(proficiency),
+                           years_experience=int(years))
+            for resume in resumes
+            for index, proficiency, years in zip(
+                rng.choice(len(technologies), size=per_resume, replace=False, p=popularity / popularity.sum()),
+                rng.choice([20, 40, 60, 80, 100], size=per_resume), rng.integers(0, 15, per_resume),
+            )
+        ]
+        TechnicalSkill.objects.bulk_create(skills, batch_size=10000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {TechnicalSkill._meta.db_table}')
+            cursor.execute(f'ANALYZE {Resume._meta.db_table}')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{len(resumes)} resumes, {len(skills)} skills inserted in {elapsed:.1f}s')
+
+        timings, found = [], []
+        for _ in range(options['iterations']):
+            requirements = [
+                JobRequirement(technology_id=technologies[index].pk, min_proficiency=int(proficiency),
+                               min_years=int(years))
+                for index, proficiency, years in zip(
+                    rng.choice(50, size=options['required'], replace=False),
+                    rng.choice([20, 40, 60], size=options['required']), rng.integers(0, 4, options['required']),
+                )
+            ]
+            started = time.perf_counter()
+            with matching.latency_budget():
+                page = list(matching.candidates(requirements).only('id')[:options['page_size']])
+            timings.append(time.perf_counter() - started)
+            found.append(len(page))
+
+        timings = np.array(timings) * 1000
+        self.stdout.write(
+            f'page of {options["page_size"]} for {options["required"]} requirements '
+            f'(mean {np.mean(found):.1f} found): p50 {np.percentile(timings, 50):.2f} ms  '
+            f'p95 {np.percentile(timings, 95):.2f} ms  max {timings.max():.2f} ms'
+        )
@@ -0,0 +1,67 @@
+"""
+Requirement matching: the public resumes whose visible skills satisfy every
+requirement of a job posting.
+
+Each requirement is one range scan of its technology's posting list in
+``skill_requirement_idx`` (technology, proficiency >= min, years >= min), the
+scans are OR-ed together and counted per resume, and the resumes matching as
+many requirements as the posting has qualify. Resume rows are only visited
+for the candidates of the requested page.
+"""
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connection, models, transaction
+
+from core.db import sqlstate
+from resume_builder.models import Resume, TechnicalSkill
+
+QUERY_CANCELED = '57014'
+
+
+class MatchTimeout(Exception):
+    pass
+
+
+def matching_skills(requirements):
+    """Visible skills meeting any of ``requirements``"""
+    condition = models.Q()
+    for requirement in requirements:
+        condition |= models.Q(
+            technology_id=requirement.technology_id,
+            proficiency__gte=requirement.min_proficiency,
+            years_experience__gte=requirement.min_years,
+        )
+    return TechnicalSkill.objects.filter(condition, is_visible=True)
+
+
+def candidates(requirements):
+    """Public resumes meeting all of ``requirements``, in the default resume ordering"""
+    requirements = list(requirements)
+    if not requirements:
+        return Resume.objects.none()
+    # (resume, technology) is unique, so a resume matches once per requirement at most
+    qualified = (
+        matching_skills(requirements).order_by().values('resume')
+        .annotate(matched=models.Count('*')).filter(matched=len(requirements)).values('resume')
+    )
+    return Resume.objects.filter(visibility='PUBLIC', pk__in=qualified)
+
+
+@contextmanager
+def latency_budget(milliseconds=None):
+    """
+    Run the block's queries in a transaction whose statements are cancelled
+    after ``milliseconds`` (``JOB_MATCH_TIMEOUT_MS`` by default), raising
+    MatchTimeout instead of holding a connection on a pathological posting.
+    """
+    milliseconds = settings.JOB_MATCH_TIMEOUT_MS if milliseconds is None else milliseconds
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL statement_timeout = %s', [int(milliseconds)])
+            yield
+    except OperationalError as exc:
+        if sqlstate(exc) == QUERY_CANCELED:
+            raise MatchTimeout from exc
+        raise
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('resume_builder', '0011_technicalskill_requirement_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('company', models.CharField(max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_postings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRequirement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('min_proficiency', models.PositiveIntegerField(choices=[(20, 'Basic'), (40, 'Beginner'), (60, 'Intermediate'), (80, 'Advanced'), (100, 'Expert')], default=20)),
+                ('min_years', models.PositiveIntegerField(default=0)),
+                ('posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='requirements', to='jobs.jobposting')),
+                ('technology', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_requirements', to='resume_builder.technology')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['-created_at', '-id'], name='jobs_jobpos_created_fa7ce5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['owner', 'is_active'], name='jobs_jobpos_owner_i_c9a84c_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobrequirement',
+            unique_together={('posting', 'technology')},
+        ),
+    ]
@@ -1,3 +1,59 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from resume_builder.models import TechnicalSkill, Technology
+
+
+class JobPosting(models.Model):
+    """Open position with the technologies a candidate must have"""
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='job_postings'
+    )
+    title = models.CharField(max_length=255)
+    company = models.CharField(max_length=255)
+    location = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['owner', 'is_active']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} at {self.company}"
+
+
+class JobRequirement(models.Model):
+    """A technology a posting requires, with the minimum proficiency and years"""
+    posting = models.ForeignKey(
+        JobPosting,
+        on_delete=models.CASCADE,
+        related_name='requirements'
+    )
+    technology = models.ForeignKey(
+        Technology,
+        on_delete=models.CASCADE,
+        related_name='job_requirements'
+    )
+    min_proficiency = models.PositiveIntegerField(choices=TechnicalSkill.PROGRESS_LEVELS, default=20)
+    min_years = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('posting', 'technology')
+        ordering = ['id']
+
+    def __str__(self):
+        from resume_builder.cache import technologies
+
+        technology = technologies.get(self.technology_id)
+        return (
+            f"{technology.name if technology else self.technology_id} – "
+            f"{self.get_min_proficiency_display()}, {self.min_years}+ years"
+        )
@@ -1,3 +1,117 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from jobs import matching
+from jobs.models import JobPosting, JobRequirement
+from resume_builder.models import Resume, TechnicalSkill, Technology
+
+User = get_user_model()
+
+
+class JobMatchingTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.django = Technology.objects.create(name='Django', category='FRAMEWORK')
+        self.rust = Technology.objects.create(name='Rust', category='LANG')
+        self.posting = JobPosting.objects.create(owner=self.user, title='Backend engineer', company='Co')
+        JobRequirement.objects.create(posting=self.posting, technology=self.python, min_proficiency=80, min_years=3)
+        JobRequirement.objects.create(posting=self.posting, technology=self.django, min_proficiency=60)
+
+    def resume(self, slug, skills, visibility='PUBLIC'):
+        resume = Resume.objects.create(user=self.user, title=slug, slug=slug, visibility=visibility)
+        for technology, proficiency, years, *visible in skills:
+            TechnicalSkill.objects.create(resume=resume, technology=technology, proficiency=proficiency,
+                                          years_experience=years, is_visible=visible[0] if visible else True)
+        return resume
+
+    def candidates(self, **params):
+        response = self.client.get(reverse('jobposting-candidates', args=[self.posting.id]), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_only_resumes_meeting_every_requirement_match(self):
+        match = self.resume('match', [(self.python, 100, 5), (self.django, 60, 0), (self.rust, 20, 1)])
+        self.resume('junior', [(self.python, 60, 5), (self.django, 80, 2)])
+        self.resume('new', [(self.python, 80, 2), (self.django, 80, 2)])
+        self.resume('partial', [(self.python, 100, 10)])
+        self.resume('hidden', [(self.python, 100, 10, False), (self.django, 80, 2)])
+        self.resume('private', [(self.python, 100, 10), (self.django, 80, 2)], visibility='PRIVATE')
+
+        results = self.candidates()['results']
+        self.assertEqual([item['id'] for item in results], [match.id])
+        self.assertEqual(
+            [(skill['technology_name'], skill['proficiency']) for skill in results[0]['skills']],
+            [('Python', 100), ('Django', 60)],
+        )
+
+    def test_hidden_skills_are_not_shown(self):
+        match = self.resume('match', [(self.python, 100, 5), (self.django, 60, 0)])
+        # Hidden after the match was computed, before the skills were fetched
+        TechnicalSkill.objects.filter(resume=match, technology=self.django).update(is_visible=False)
+        with mock.patch.object(matching, 'candidates', return_value=Resume.objects.filter(pk=match.pk)):
+            results = self.candidates()['results']
+        self.assertEqual([skill['technology_name'] for skill in results[0]['skills']], ['Python'])
+
+    def test_candidates_are_paginated(self):
+        resumes = [self.resume(f'match-{index}', [(self.python, 80, 3), (self.django, 60, 1)]) for index in range(5)]
+        data = self.candidates(page_size=2)
+        self.assertEqual([item['id'] for item in data['results']], [resumes[4].id, resumes[3].id])
+        response = self.client.get(data['next'])
+        self.assertEqual([item['id'] for item in response.data['results']], [resumes[2].id, resumes[1].id])
+
+    def test_requirements_are_served_by_the_skill_index(self):
+        for index in range(3):
+            self.resume(f'match-{index}', [(self.python, 80, 3), (self.django, 60, 1)])
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = matching.candidates(self.posting.requirements.all()).order_by().explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = on')
+        self.assertIn('skill_requirement_idx', plan)
+        self.assertNotIn('Seq Scan on resume_builder_technicalskill', plan)
+
+    def test_slow_matches_are_cut_off(self):
+        self.resume('match', [(self.python, 80, 3), (self.django, 60, 1)])
+        with self.assertRaises(matching.MatchTimeout):
+            with matching.latency_budget(1):
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_sleep(0.1)')
+        with override_settings(JOB_MATCH_TIMEOUT_MS=1000):
+            self.assertEqual(len(self.candidates()['results']), 1)
+
+    def test_postings_with_nested_requirements(self):
+        response = self.client.post(reverse('jobposting-list'), {
+            'title': 'Rustacean', 'company': 'Co',
+            'requirements': [{'technology': self.rust.id, 'min_proficiency': 60, 'min_years': 2}],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data['owner'], self.user.id)
+        self.assertEqual(response.data['requirements'][0]['technology_name'], 'Rust')
+
+        url = reverse('jobposting-detail', args=[response.data['id']])
+        response = self.client.patch(url, {'requirements': [
+            {'technology': self.python.id}, {'technology': self.django.id, 'min_years': 1},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual([item['technology'] for item in response.data['requirements']],
+                         [self.python.id, self.django.id])
+
+        response = self.client.post(reverse('jobposting-list'), {
+            'title': 'Dup', 'company': 'Co', 'requirements': [{'technology': self.rust.id}] * 2,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,56 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from recommendations import matrix, similarity
+from recommendations.api.serializers import CandidateSerializer, SimilarResumeSerializer, SkillProfileSerializer
+from resume_builder.models import Resume
+
+
+class CandidateRecommendationView(generics.GenericAPIView):
+    """
+    Rank the public resumes against a required-skills profile.
+
+    POST {"skills": [{"technology": id, "weight": 1.0}, ...], "limit": 20}
+
+    Scores are computed in memory over the whole skill matrix (see
+    recommendations.matrix); only the returned resumes are read from the
+    database.
+    """
+    serializer_class = SkillProfileSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        weights = {item['technology']: item['weight'] for item in serializer.validated_data['skills']}
+        matches, ranked = matrix.recommend(weights, serializer.validated_data['limit'])
+        results = [
+            {'resume': resume, 'score': round(score, 4), 'matched_skills': matched}
+            for resume, score, matched in ranked
+        ]
+        return Response({'count': matches, 'results': CandidateSerializer(results, many=True).data})
+
+
+class SimilarResumeView(generics.GenericAPIView):
+    """
+    Public resumes whose text (summary, job and project descriptions,
+    achievements) is most similar to the given resume's, by TF-IDF cosine.
+    ``?limit=`` defaults to 10, at most 50.
+    """
+    serializer_class = SimilarResumeSerializer
+    max_limit = 50
+
+    def get(self, request, pk, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': [f'Expected an integer between 1 and {self.max_limit}.']})
+        resume = get_object_or_404(Resume.objects.only('id'), pk=pk)
+        results = [
+            {'resume': similar, 'score': round(score, 4)}
+            for similar, score in similarity.similar_resumes(resume.pk, limit)
+        ]
+        return Response({'results': self.get_serializer(results, many=True).data})
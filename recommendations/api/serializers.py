@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from resume_builder.cache import technologies
+
+
+class SkillRequirementSerializer(serializers.Serializer):
+    technology = serializers.IntegerField()
+    weight = serializers.FloatField(min_value=0.01, max_value=100, default=1.0,
+                                    help_text='Relative importance of the skill.')
+
+    def validate_technology(self, value):
+        # Checked against the Technology cache instead of a query per skill
+        if technologies.get(value) is None:
+            raise serializers.ValidationError('Unknown technology.')
+        return value
+
+
+class SkillProfileSerializer(serializers.Serializer):
+    skills = SkillRequirementSerializer(many=True, allow_empty=False, max_length=50)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_skills(self, value):
+        if len({item['technology'] for item in value}) != len(value):
+            raise serializers.ValidationError('Each technology may only be listed once.')
+        return value
+
+
+class CandidateSerializer(serializers.Serializer):
+    resume = serializers.IntegerField(source='resume.pk')
+    user = serializers.IntegerField(source='resume.user_id')
+    title = serializers.CharField(source='resume.title')
+    slug = serializers.CharField(source='resume.slug')
+    score = serializers.FloatField()
+    matched_skills = serializers.IntegerField()
+
+
+class SimilarResumeSerializer(serializers.Serializer):
+    resume = serializers.IntegerField(source='resume.pk')
+    user = serializers.IntegerField(source='resume.user_id')
+    title = serializers.CharField(source='resume.title')
+    slug = serializers.CharField(source='resume.slug')
+    score = serializers.FloatField()
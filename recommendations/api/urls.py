@@ -0,0 +1,8 @@
+from django.urls import path
+
+from recommendations.api.api import CandidateRecommendationView, SimilarResumeView
+
+urlpatterns = [
+    path('recommendations/candidates/', CandidateRecommendationView.as_view(), name='recommendation-candidates'),
+    path('recommendations/similar/<int:pk>/', SimilarResumeView.as_view(), name='recommendation-similar'),
+]
@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from recommendations.matrix import SkillMatrix, skill_weights
+
+
+class Command(BaseCommand):
+    help = 'Measure top-k candidate ranking over a synthetic skill matrix'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=100000)
+        parser.add_argument('--technologies', type=int, default=2000)
+        parser.add_argument('--skills-per-resume', type=int, default=15)
+        parser.add_argument('--required', type=int, default=5, help='Skills in each queried profile')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(0)
+        resumes, per_resume = options['resumes'], options['skills_per_resume']
+        count = resumes * per_resume
+        # Zipf-like popularity, so common technologies match many resumes as in real data
+        popularity = 1 / np.arange(1, options['technologies'] + 1)
+        technology_ids = rng.choice(options['technologies'], size=count, p=popularity / popularity.sum())
+        weights = skill_weights(
+            rng.choice([20, 40, 60, 80, 100], size=count).astype(np.float32),
+            rng.integers(0, 15, size=count).astype(np.float32),
+            rng.integers(730000, 740000, size=count), 740000,
+        )
+
+        matrix = SkillMatrix()
+        started = time.perf_counter()
+        # Duplicate (resume, technology) pairs are summed, which is fine for timing
+        matrix.load(np.repeat(np.arange(resumes), per_resume), technology_ids, weights)
+        build = time.perf_counter() - started
+
+        profiles = [
+            {int(pk): float(weight) for pk, weight in zip(
+                rng.choice(50, size=options['required'], replace=False), rng.uniform(0.5, 2, options['required'])
+            )}
+            for _ in range(options['iterations'])
+        ]
+        timings = []
+        with override_settings(RECOMMENDATION_MATRIX_TTL=float('inf')):
+            entries = matrix.state().matrix.nnz
+            for profile in profiles:
+                started = time.perf_counter()
+                matrix.top_k(profile, options['limit'])
+                timings.append(time.perf_counter() - started)
+
+        timings = np.array(timings) * 1000
+        self.stdout.write(f'{resumes} resumes, {entries} skill entries, built in {build:.2f}s')
+        self.stdout.write(
+            f'top-{options["limit"]} of {options["required"]} skills: '
+            f'p50 {np.percentile(timings, 50):.2f} ms  p95 {np.percentile(timings, 95):.2f} ms  '
+            f'max {timings.max():.2f} ms'
+        )
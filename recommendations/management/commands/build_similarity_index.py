@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from recommendations.similarity import documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF similarity index from the database and save it for workers to start from'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', help='Write here instead of RECOMMENDATION_SIMILARITY_INDEX')
+
+    def handle(self, *args, **options):
+        state = documents.rebuild()
+        path = documents.save(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {len(state.rows)} resumes ({state.matrix.nnz} terms) into {path}.'
+        ))
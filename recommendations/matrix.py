@@ -0,0 +1,391 @@
+"""
+In-memory sparse matrices with one row per public resume, used to score
+candidates in bulk with NumPy/SciPy instead of per-resume Python loops.
+
+A matrix is built from one streamed query and then kept current from the
+resumes' ``last_modified`` watermark: at most every
+``RECOMMENDATION_MATRIX_TTL`` seconds (right away after local writes) only the
+rows of resumes modified since are reloaded, which also picks up the writes of
+other workers. Reloaded rows go to a small tail segment and the base rows they
+supersede are only marked dead, so an update costs the changed rows, not a
+copy of the matrix; the tail is merged into the base once it outgrows
+``tail_size`` rows. Matrices with a ``path_setting`` are saved after a full
+build and restored from that file on first use, so workers start warm and only
+catch up on what changed since the file was written.
+"""
+import datetime
+import os
+import threading
+import time
+from collections import namedtuple
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Max
+from scipy import sparse
+
+from resume_builder.models import Resume, TechnicalSkill
+
+CHUNK_SIZE = 10000
+# Resumes modified this long before the watermark are re-read as well, so a
+# write whose transaction commits after a later one is not missed
+WATERMARK_OVERLAP = datetime.timedelta(minutes=1)
+
+# ``rows``/``matrix`` is the base from the last full build or merge and
+# ``tail_rows``/``tail`` the rows reloaded since, both sorted by resume id;
+# ``dead`` holds the sorted base positions superseded by the tail or dropped.
+# ``fitted`` is what ``ResumeMatrix.fit`` derived from the last full build.
+State = namedtuple('State', 'rows matrix watermark checked_at built_at fitted tail_rows tail dead')
+
+NO_ROWS = np.empty(0, dtype=np.int64)
+
+
+def build(resume_ids, columns, values, width=0):
+    """Return ``(row_resume_ids, csr_matrix)`` with one row per distinct resume, sorted by id"""
+    rows, inverse = np.unique(resume_ids, return_inverse=True)
+    width = max(width, int(columns.max()) + 1 if len(columns) else 0)
+    matrix = sparse.csr_matrix((values, (inverse, columns)), shape=(len(rows), width), dtype=np.float32)
+    return rows, matrix
+
+
+def empty(width):
+    return sparse.csr_matrix((0, width), dtype=np.float32)
+
+
+def widen(matrix, width):
+    """``matrix`` with at least ``width`` columns, sharing its arrays"""
+    if matrix.shape[1] >= width:
+        return matrix
+    return sparse.csr_matrix(
+        (matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width), copy=False
+    )
+
+
+def locate(rows, resume_ids):
+    """Positions in sorted ``rows`` of those of ``resume_ids`` it holds"""
+    resume_ids = np.asarray(resume_ids, dtype=np.int64)
+    positions = np.searchsorted(rows, resume_ids)
+    found = positions < len(rows)
+    found[found] = rows[positions[found]] == resume_ids[found]
+    return positions[found]
+
+
+def segments(state):
+    """``(rows, matrix, dead)`` of the base and the tail; each resume has one live row across them"""
+    return [(state.rows, state.matrix, state.dead), (state.tail_rows, state.tail, NO_ROWS)]
+
+
+def merge(state):
+    """``state`` with the tail merged into the base and the dead rows dropped"""
+    if not len(state.tail_rows) and not len(state.dead):
+        return state
+    keep = np.ones(len(state.rows), dtype=bool)
+    keep[state.dead] = False
+    rows = np.concatenate([state.rows[keep], state.tail_rows])
+    order = np.argsort(rows, kind='stable')
+    matrix = sparse.vstack([state.matrix[keep], state.tail], format='csr')[order]
+    return state._replace(
+        rows=rows[order], matrix=matrix, tail_rows=NO_ROWS, tail=empty(matrix.shape[1]), dead=NO_ROWS
+    )
+
+
+def stream(queryset, fields, convert):
+    """
+    Stream ``fields`` of ``queryset`` in chunks through ``convert`` (one tuple
+    of column values in, a tuple of arrays out) and concatenate the arrays.
+    """
+    rows = queryset.order_by().values_list(*fields).iterator(chunk_size=CHUNK_SIZE)
+    parts = []
+    while chunk := list(islice(rows, CHUNK_SIZE)):
+        parts.append(convert(*zip(*chunk)))
+    if not parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+
+class ResumeMatrix:
+    """
+    Process-local resume x feature matrix; see the module docstring.
+    Subclasses implement ``read``.
+    """
+    ttl_setting = 'RECOMMENDATION_MATRIX_TTL'
+    default_ttl = 5
+    # Setting naming the file the matrix is saved to and restored from
+    path_setting = None
+    # Seconds after which the matrix is rebuilt instead of updated
+    rebuild_interval = None
+    # Reloaded rows kept apart from the base before they are merged into it
+    tail_size = 4096
+    # Minimum number of columns
+    width = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = None
+
+    def read(self, resume_ids=None):
+        """``(resume_ids, columns, values)`` arrays of the given resumes' entries, all when None"""
+        raise NotImplementedError
+
+    def fit(self, matrix):
+        """Parameters derived from the rows of a full build, kept until the next one"""
+        return None
+
+    def transform(self, matrix, fitted):
+        """Stored form of rows just read, given what ``fit`` returned"""
+        return matrix
+
+    @property
+    def path(self):
+        value = getattr(settings, self.path_setting, None) if self.path_setting else None
+        return Path(value) if value else None
+
+    def state(self):
+        return self._load()
+
+    def rebuild(self):
+        """Rebuild the matrix from the database"""
+        with self._lock:
+            self._state = self._build(time.monotonic())
+            return self._state
+
+    def load(self, resume_ids, columns, values, watermark=None):
+        """Replace the matrix with the given entries instead of reading them from the database"""
+        rows, matrix = build(resume_ids, columns, values, self.width)
+        with self._lock:
+            self._state = self._built_state(rows, matrix, watermark, time.monotonic(), time.time())
+
+    def mark_stale(self):
+        """Look for modified resumes on the next access instead of after the TTL"""
+        with self._lock:
+            if self._state is not None:
+                self._state = self._state._replace(checked_at=float('-inf'))
+
+    def invalidate(self):
+        with self._lock:
+            self._state = None
+
+    def discard(self, resume_ids):
+        """Drop the rows of deleted resumes, which leave no modification behind"""
+        with self._lock:
+            state = self._state
+            if state is None:
+                return
+            self._state = self._replace_rows(state, resume_ids, NO_ROWS, empty(state.matrix.shape[1]))
+
+    def save(self, path=None):
+        """Write the current matrix to ``path`` (the configured one by default) atomically"""
+        return self._write(self._load(), Path(path) if path else self.path)
+
+    def _write(self, state, path):
+        state = merge(state)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'wb') as file:
+            np.savez(
+                file, rows=state.rows, data=state.matrix.data, indices=state.matrix.indices,
+                indptr=state.matrix.indptr, shape=np.array(state.matrix.shape),
+                watermark=np.array(state.watermark.isoformat() if state.watermark else ''),
+                built_at=np.array(state.built_at),
+                fitted=np.empty(0) if state.fitted is None else state.fitted,
+            )
+        os.replace(tmp, path)
+        return path
+
+    def restore(self, path):
+        """State read from a file written by ``save``, due for a catch-up update"""
+        with np.load(path) as saved:
+            matrix = sparse.csr_matrix(
+                (saved['data'], saved['indices'], saved['indptr']), shape=tuple(saved['shape'])
+            )
+            watermark = str(saved['watermark'])
+            fitted = saved['fitted']
+            return State(
+                saved['rows'], widen(matrix, self.width),
+                datetime.datetime.fromisoformat(watermark) if watermark else None,
+                float('-inf'), float(saved['built_at']), fitted if fitted.size else None,
+                NO_ROWS, empty(max(matrix.shape[1], self.width)), NO_ROWS,
+            )
+
+    def _built_state(self, rows, matrix, watermark, checked_at, built_at):
+        fitted = self.fit(matrix)
+        return State(
+            rows, self.transform(matrix, fitted), watermark, checked_at, built_at, fitted,
+            NO_ROWS, empty(matrix.shape[1]), NO_ROWS,
+        )
+
+    def _replace_rows(self, state, resume_ids, delta_rows, delta):
+        """
+        ``state`` with the rows of ``resume_ids`` replaced by ``delta`` (rows
+        of ``delta_rows``, sorted): superseded base rows are marked dead and
+        the tail is rebuilt, leaving the base arrays untouched.
+        """
+        resume_ids = np.asarray(list(resume_ids), dtype=np.int64)
+        width = max(state.matrix.shape[1], delta.shape[1])
+        keep = ~np.isin(state.tail_rows, resume_ids)
+        tail_rows = np.concatenate([state.tail_rows[keep], delta_rows])
+        order = np.argsort(tail_rows, kind='stable')
+        tail = sparse.vstack([widen(state.tail[keep], width), widen(delta, width)], format='csr')[order]
+        state = state._replace(
+            matrix=widen(state.matrix, width), tail_rows=tail_rows[order], tail=tail,
+            dead=np.union1d(state.dead, locate(state.rows, resume_ids)),
+        )
+        return merge(state) if len(state.tail_rows) > self.tail_size else state
+
+    def _load(self):
+        state = self._state
+        now = time.monotonic()
+        ttl = getattr(settings, self.ttl_setting, self.default_ttl)
+        if state is not None and now - state.checked_at < ttl:
+            return state
+        with self._lock:
+            state = self._state
+            if state is not None and now - state.checked_at < ttl:
+                return state
+            if state is None and self.path is not None and self.path.exists():
+                try:
+                    state = self.restore(self.path)
+                except (OSError, ValueError, KeyError):
+                    state = None  # unreadable; rebuilt below
+            expired = self.rebuild_interval is not None and state is not None and (
+                time.time() - state.built_at >= self.rebuild_interval
+            )
+            if state is None or state.watermark is None or expired:
+                self._state = self._build(now)
+                if self.path is not None:
+                    self._save_built(self._state)
+            else:
+                self._state = self._update(state, now)
+            return self._state
+
+    def _save_built(self, state):
+        try:
+            self._write(state, self.path)
+        except OSError:
+            pass  # workers without write access simply start cold
+
+    def _build(self, now):
+        # Taken first, so writes made while the rows stream in are re-read by the next update
+        watermark = Resume.objects.aggregate(watermark=Max('last_modified'))['watermark']
+        rows, matrix = build(*self.read(), width=self.width)
+        return self._built_state(rows, matrix, watermark, now, time.time())
+
+    def _update(self, state, now):
+        changed = list(Resume.objects.filter(last_modified__gte=state.watermark - WATERMARK_OVERLAP)
+                       .values_list('pk', 'last_modified'))
+        if not changed:
+            return state._replace(checked_at=now)
+        changed_ids = [pk for pk, _ in changed]
+        watermark = max(state.watermark, *(modified for _, modified in changed))
+        delta_rows, delta = build(*self.read(changed_ids), width=state.matrix.shape[1])
+        delta = self.transform(delta, state.fitted)
+        return self._replace_rows(state, changed_ids, delta_rows, delta)._replace(watermark=watermark, checked_at=now)
+
+
+def public_resumes(index, resume_ids):
+    """
+    Load the listed resumes that are still public, keyed by id. Rows of
+    resumes deleted by another worker are dropped from ``index`` so they stop
+    taking up result slots.
+    """
+    resumes = Resume.objects.filter(pk__in=resume_ids, visibility='PUBLIC').only(
+        'id', 'title', 'slug', 'user_id', 'last_modified'
+    ).in_bulk()
+    missing = [pk for pk in resume_ids if pk not in resumes]
+    if missing:
+        index.discard(missing)
+    return resumes
+
+
+# -----------------------------
+# Skill matching
+# -----------------------------
+MAX_YEARS = 10
+RECENCY_HALF_LIFE_DAYS = 3 * 365
+
+
+def skill_weights(proficiency, years_experience, last_used, today):
+    """
+    Entry weights in (0, 1] for arrays of skill attributes: proficiency scaled
+    by experience (half credit at 0 years, full at ``MAX_YEARS``) and halved
+    every ``RECENCY_HALF_LIFE_DAYS`` since ``last_used`` (day ordinals, -1 when
+    unknown, which counts as current).
+    """
+    experience = 0.5 + 0.5 * np.minimum(years_experience, MAX_YEARS) / MAX_YEARS
+    age = np.where(last_used < 0, 0, np.maximum(today - last_used, 0))
+    recency = 0.5 ** (age / RECENCY_HALF_LIFE_DAYS)
+    return (proficiency / 100 * experience * recency).astype(np.float32)
+
+
+class SkillMatrix(ResumeMatrix):
+    """
+    Row ``i`` holds the visible skills of the public resume ``rows[i]``,
+    column ``j`` the technology with id ``j``, weighted by ``skill_weights``;
+    scoring a required-skills profile is one sparse matrix-vector product.
+    """
+    # Recency is evaluated when a row is loaded; a daily rebuild keeps it aging
+    rebuild_interval = 24 * 60 * 60
+
+    def read(self, resume_ids=None):
+        queryset = TechnicalSkill.objects.filter(resume__visibility='PUBLIC', is_visible=True)
+        if resume_ids is not None:
+            queryset = queryset.filter(resume_id__in=resume_ids)
+        today = datetime.date.today().toordinal()
+
+        def convert(resume_ids, technology_ids, proficiency, years, last_used):
+            return (
+                np.array(resume_ids, dtype=np.int64), np.array(technology_ids, dtype=np.int64),
+                skill_weights(
+                    np.array(proficiency, dtype=np.float32), np.array(years, dtype=np.float32),
+                    np.array([-1 if day is None else day.toordinal() for day in last_used]), today,
+                ),
+            )
+
+        return stream(
+            queryset, ['resume_id', 'technology_id', 'proficiency', 'years_experience', 'last_used'], convert
+        )
+
+    def top_k(self, weights, k):
+        """
+        Score every resume against ``weights`` ({technology_id: importance}) and
+        return ``(matches, [(resume_id, score, matched_skills), ...])`` for the
+        ``k`` best, where ``score`` in [0, 1] is the importance-weighted mean
+        skill weight and ``matches`` counts resumes with any required skill.
+        """
+        state = self._load()
+        width = state.matrix.shape[1]
+        profile = np.zeros(width, dtype=np.float32)
+        columns = np.array([pk for pk in weights if 0 <= pk < width], dtype=np.int64)
+        total = sum(weights.values())
+        if not len(columns) or not total:
+            return 0, []
+        profile[columns] = [weights[pk] / total for pk in columns]
+
+        matches, ranked = 0, []
+        for rows, matrix, dead in segments(state):
+            scores = matrix @ profile
+            scores[dead] = 0
+            candidates = np.flatnonzero(scores > 0)
+            matches += len(candidates)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            matched = np.asarray((matrix[candidates][:, columns] > 0).sum(axis=1)).ravel()
+            ranked.extend(zip(rows[candidates], scores[candidates], matched))
+        # Best score first, lowest resume id on ties
+        ranked.sort(key=lambda entry: (-entry[1], entry[0]))
+        return matches, [(int(pk), float(score), int(count)) for pk, score, count in ranked[:k]]
+
+
+skills = SkillMatrix()
+
+
+def recommend(weights, limit):
+    """
+    Top ``limit`` public resumes for a required-skills profile, as
+    ``(matches, [(resume, score, matched_skills), ...])``.
+    """
+    matches, ranked = skills.top_k(weights, limit)
+    resumes = public_resumes(skills, [pk for pk, _, _ in ranked])
+    return matches, [(resumes[pk], score, matched) for pk, score, matched in ranked if pk in resumes]
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from recommendations.matrix import skills
+from recommendations.similarity import documents
+from resume_builder.models import Project, Resume, TechnicalSkill, WorkExperience
+from resume_builder.signals import resume_content_changed
+
+# Child models whose rows feed each index
+INDEX_MODELS = {
+    TechnicalSkill: [skills],
+    WorkExperience: [documents],
+    Project: [documents],
+}
+
+
+@receiver(post_save, sender=Resume, dispatch_uid='recommendations_resume_saved')
+def resume_saved(sender, instance, **kwargs):
+    # New resumes, visibility and summary changes
+    for index in (skills, documents):
+        index.mark_stale()
+
+
+@receiver(post_delete, sender=Resume, dispatch_uid='recommendations_resume_deleted')
+def resume_deleted(sender, instance, **kwargs):
+    for index in (skills, documents):
+        index.discard([instance.pk])
+
+
+@receiver(resume_content_changed, dispatch_uid='recommendations_content_changed')
+def content_changed(sender, resume_ids, **kwargs):
+    for index in INDEX_MODELS.get(sender, ()):
+        index.mark_stale()
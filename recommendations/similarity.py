@@ -0,0 +1,171 @@
+"""
+"More like this resume" over the resumes' text: the summary, job and project
+descriptions and achievements.
+
+Each public resume is a row of sublinear term frequencies over hashed tokens
+(``N_FEATURES`` columns, so new words never change the vocabulary), stored
+IDF-weighted and L2-normalized. The IDF weights are fit on a full build and
+kept until the daily rebuild refits them, so updating one resume weighs and
+normalizes only its row instead of refitting the corpus. Queries are cosine
+similarities computed with a blocked sparse matrix product (``top_k_cosine``).
+"""
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+from django.db import models
+from django.db.models.functions import Cast, Coalesce, Concat
+from scipy import sparse
+
+from recommendations.matrix import ResumeMatrix, locate, public_resumes, segments, stream
+from resume_builder.models import Project, Resume, WorkExperience
+from resume_builder.search import child_text
+
+N_FEATURES = 2 ** 18
+# Rows of the corpus multiplied at a time; bounds the dense score block
+BLOCK_SIZE = 32768
+# Keeps tokens such as c++, c# and node.js whole
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOP_WORDS = frozenset('''
+    a an and are as at be by for from has have in into is it its of on or our that the their this to was
+    were will with we i my me us using used use
+'''.split())
+
+
+def term_frequencies(text):
+    """``(columns, values)`` of the 1 + log(tf) weights of the hashed tokens of ``text``"""
+    counts = Counter(
+        zlib.crc32(token.encode()) % N_FEATURES
+        for token in TOKEN.findall(text.lower()) if token not in STOP_WORDS
+    )
+    columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return columns, values.astype(np.float32)
+
+
+def row_block(matrix, start, stop):
+    """Rows ``start:stop`` of a CSR matrix as a view on its arrays, without copying them"""
+    first, last = matrix.indptr[start], matrix.indptr[stop]
+    return sparse.csr_matrix(
+        (matrix.data[first:last], matrix.indices[first:last], matrix.indptr[start:stop + 1] - first),
+        shape=(stop - start, matrix.shape[1]), copy=False,
+    )
+
+
+def top_k_cosine(vectors, queries, k, block_size=BLOCK_SIZE, excluded=None):
+    """
+    For each row of ``queries``, the ``k`` rows of ``vectors`` with the highest
+    dot product (cosine, for L2-normalized rows) as ``(indexes, scores)``
+    arrays of shape (queries, k), best first; rows at the sorted ``excluded``
+    positions score -inf. ``vectors`` is multiplied ``block_size`` rows at a
+    time, so memory stays at one dense block of scores plus the running top k
+    however large the corpus is.
+    """
+    count = queries.shape[0]
+    # Dense features x queries: a few MB for the handful of queries of a request
+    queries = queries.toarray().T
+    best_indexes = np.empty((count, 0), dtype=np.int64)
+    best_scores = np.empty((count, 0), dtype=np.float32)
+    for start in range(0, vectors.shape[0], block_size):
+        stop = min(start + block_size, vectors.shape[0])
+        block = np.asarray(row_block(vectors, start, stop) @ queries).T
+        if excluded is not None:
+            first, last = np.searchsorted(excluded, [start, stop])
+            block[:, excluded[first:last] - start] = -np.inf
+        indexes = np.concatenate([best_indexes, np.broadcast_to(np.arange(start, stop), block.shape)], axis=1)
+        scores = np.concatenate([best_scores, block], axis=1)
+        if scores.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            indexes = np.take_along_axis(indexes, keep, axis=1)
+            scores = np.take_along_axis(scores, keep, axis=1)
+        best_indexes, best_scores = indexes, scores
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_indexes, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def normalize(matrix):
+    """Scale the rows of a CSR matrix to unit L2 norm (empty rows stay empty)"""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sparse.diags(np.divide(1, norms, out=np.zeros_like(norms), where=norms > 0)) @ matrix
+
+
+class TextIndex(ResumeMatrix):
+    """TF-IDF vectors per public resume; ``fitted`` holds the IDF weights"""
+    path_setting = 'RECOMMENDATION_SIMILARITY_INDEX'
+    # Refits the IDF weights to the corpus as it drifts
+    rebuild_interval = 24 * 60 * 60
+    width = N_FEATURES
+
+    def read(self, resume_ids=None):
+        queryset = Resume.objects.filter(visibility='PUBLIC')
+        if resume_ids is not None:
+            queryset = queryset.filter(pk__in=resume_ids)
+        return self.read_text(queryset)
+
+    def read_text(self, queryset):
+        parts = [
+            child_text(WorkExperience, 'description'),
+            child_text(WorkExperience, Cast('achievements', models.TextField())),
+            child_text(Project, 'description'),
+        ]
+        document = Concat('summary', *(
+            piece for part in parts
+            for piece in (models.Value(' '), Coalesce(part, models.Value(''), output_field=models.TextField()))
+        ), output_field=models.TextField())
+
+        def convert(resume_ids, texts):
+            entries = [(resume_id, *term_frequencies(text)) for resume_id, text in zip(resume_ids, texts)]
+            return (
+                np.concatenate([np.full(len(columns), pk, dtype=np.int64) for pk, columns, _ in entries]),
+                np.concatenate([columns for _, columns, _ in entries]),
+                np.concatenate([values for _, _, values in entries]),
+            )
+
+        return stream(queryset.annotate(document=document), ['pk', 'document'], convert)
+
+    def fit(self, matrix):
+        document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+        return (np.log((1 + matrix.shape[0]) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def transform(self, matrix, idf):
+        return normalize(matrix @ sparse.diags(idf)).tocsr()
+
+    def similar(self, resume_id, k):
+        """
+        ``[(resume_id, score), ...]`` of the ``k`` public resumes whose text is
+        most like the resume's, best first. Resumes outside the index (not
+        public) are vectorized from the database.
+        """
+        state = self._load()
+        query = None
+        for rows, vectors, dead in segments(state):
+            position = locate(rows, [resume_id])
+            if len(position) and not np.isin(position, dead).any():
+                query = vectors[position[0]]
+        if query is None:
+            _, columns, values = self.read_text(Resume.objects.filter(pk=resume_id))
+            query = self.transform(sparse.csr_matrix(
+                (values, (np.zeros(len(columns), dtype=np.int64), columns)), shape=(1, self.width)
+            ), state.fitted)
+        if not query.nnz:
+            return []
+        ranked = []
+        for rows, vectors, dead in segments(state):
+            indexes, scores = top_k_cosine(vectors, query, k + 1, excluded=dead)
+            ranked.extend(
+                (int(rows[index]), float(score)) for index, score in zip(indexes[0], scores[0])
+                if score > 0 and rows[index] != resume_id
+            )
+        ranked.sort(key=lambda entry: -entry[1])
+        return ranked[:k]
+
+
+documents = TextIndex()
+
+
+def similar_resumes(resume_id, limit):
+    """``[(resume, score), ...]`` of the public resumes most similar to ``resume_id``"""
+    ranked = documents.similar(resume_id, limit)
+    resumes = public_resumes(documents, [pk for pk, _ in ranked])
+    return [(resumes[pk], score) for pk, score in ranked if pk in resumes]
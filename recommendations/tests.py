@@ -1,3 +1,207 @@
-from django.test import TestCase
+import datetime
+import tempfile
+from pathlib import Path
 
-# Create your tests here.
+import numpy as np
+from scipy import sparse
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from recommendations.matrix import skills
+from recommendations.similarity import TextIndex, documents, normalize, top_k_cosine
+from resume_builder.cache import technologies as technology_cache
+from resume_builder.models import Project, Resume, TechnicalSkill, Technology, WorkExperience
+
+User = get_user_model()
+
+
+class CandidateRecommendationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.client.force_authenticate(self.user)
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.django = Technology.objects.create(name='Django', category='FRAMEWORK')
+        self.rust = Technology.objects.create(name='Rust', category='LANG')
+        self.url = reverse('recommendation-candidates')
+        skills.invalidate()
+        self.addCleanup(skills.invalidate)
+        settings = override_settings(RECOMMENDATION_MATRIX_TTL=3600, TECHNOLOGY_CACHE_TTL=3600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def resume(self, slug, entries, visibility='PUBLIC'):
+        resume = Resume.objects.create(user=self.user, title=slug, slug=slug, visibility=visibility)
+        for technology, proficiency, years, last_used in entries:
+            TechnicalSkill.objects.create(resume=resume, technology=technology, proficiency=proficiency,
+                                          years_experience=years, last_used=last_used)
+        return resume
+
+    def recommend(self, *required, limit=20):
+        response = self.client.post(self.url, {
+            'skills': [{'technology': technology.id, 'weight': weight} for technology, weight in required],
+            'limit': limit,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_candidates_are_ranked_by_weighted_skill_strength(self):
+        today = datetime.date.today()
+        expert = self.resume('expert', [(self.python, 100, 10, today), (self.django, 80, 5, today)])
+        stale = self.resume('stale', [(self.python, 100, 10, today - datetime.timedelta(days=3 * 365))])
+        junior = self.resume('junior', [(self.python, 40, 1, None)])
+        self.resume('private', [(self.python, 100, 10, today)], visibility='PRIVATE')
+        self.resume('other', [(self.rust, 100, 10, today)])
+
+        data = self.recommend((self.python, 2), (self.django, 1))
+        self.assertEqual(data['count'], 3)
+        self.assertEqual([item['resume'] for item in data['results']], [expert.id, stale.id, junior.id])
+        self.assertEqual([item['matched_skills'] for item in data['results']], [2, 1, 1])
+        self.assertAlmostEqual(data['results'][0]['score'], (2 * 1.0 + 1 * 0.8 * 0.75) / 3, places=3)
+        # Half the recency credit after one half-life
+        self.assertAlmostEqual(data['results'][1]['score'], 2 / 3 / 2, places=2)
+        self.assertEqual(len(self.recommend((self.python, 1), limit=1)['results']), 1)
+
+    def test_matrix_follows_skill_and_resume_changes(self):
+        resume = self.resume('resume', [(self.python, 60, 2, None)])
+        self.assertEqual(self.recommend((self.rust, 1))['results'], [])
+
+        TechnicalSkill.objects.create(resume=resume, technology=self.rust, proficiency=80)
+        self.assertEqual([item['resume'] for item in self.recommend((self.rust, 1))['results']], [resume.id])
+
+        resume.visibility = 'PRIVATE'
+        resume.save()
+        self.assertEqual(self.recommend((self.rust, 1))['results'], [])
+
+        other = self.resume('other', [(self.rust, 60, 0, None)])
+        other.delete()
+        self.assertEqual(self.recommend((self.rust, 1))['count'], 0)
+
+    def test_other_workers_writes_are_seen_after_ttl(self):
+        resume = self.resume('resume', [(self.python, 60, 2, None)])
+        self.recommend((self.python, 1))
+        # No local signal: only the resume's modification time moves
+        TechnicalSkill.objects.bulk_create([TechnicalSkill(resume=resume, technology=self.rust, proficiency=60)])
+        Resume.objects.filter(pk=resume.pk).bump_content_version()
+        self.assertEqual(self.recommend((self.rust, 1))['results'], [])
+        with override_settings(RECOMMENDATION_MATRIX_TTL=0):
+            self.assertEqual([item['resume'] for item in self.recommend((self.rust, 1))['results']], [resume.id])
+
+    def test_warm_ranking_reads_only_the_returned_resumes(self):
+        for index in range(5):
+            self.resume(f'resume-{index}', [(self.python, 20 * (index % 5 + 1), index, None)])
+        self.recommend((self.python, 1))
+        technology_cache.all()
+        with self.assertNumQueries(1):
+            data = self.recommend((self.python, 1), limit=3)
+        self.assertEqual([item['slug'] for item in data['results']], ['resume-4', 'resume-3', 'resume-2'])
+
+    def test_invalid_profiles(self):
+        for payload in ({'skills': []}, {'skills': [{'technology': 0}]},
+                        {'skills': [{'technology': self.python.id}, {'technology': self.python.id}]}):
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SimilarResumeTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.client.force_authenticate(self.user)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'similarity.npz'
+        settings = override_settings(RECOMMENDATION_MATRIX_TTL=3600, RECOMMENDATION_SIMILARITY_INDEX=self.path)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        documents.invalidate()
+        self.addCleanup(documents.invalidate)
+
+        self.backend = self.resume('backend', 'Backend engineer building Django APIs on PostgreSQL.',
+                                   'Designed Django REST APIs and tuned PostgreSQL queries.')
+        self.api = self.resume('api', 'Python developer focused on Django and PostgreSQL.',
+                               'Maintained Django services backed by PostgreSQL.')
+        self.designer = self.resume('designer', 'Product designer crafting mobile interfaces.',
+                                    'Led user research and prototyping in Figma.')
+
+    def resume(self, slug, summary, description, visibility='PUBLIC'):
+        resume = Resume.objects.create(user=self.user, title=slug, slug=slug, summary=summary,
+                                       visibility=visibility)
+        WorkExperience.objects.create(resume=resume, job_title='Role', company='Co', start_date='2020-01-01',
+                                      description=description, achievements=['Shipped on time'])
+        return resume
+
+    def similar(self, resume, limit=10):
+        response = self.client.get(reverse('recommendation-similar', args=[resume.id]), {'limit': limit})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [item['resume'] for item in response.data['results']]
+
+    def test_resumes_are_ranked_by_text_similarity(self):
+        self.resume('private', 'Backend engineer building Django APIs on PostgreSQL.', 'Django', 'PRIVATE')
+        self.assertEqual(self.similar(self.backend), [self.api.id, self.designer.id])
+        self.assertEqual(self.similar(self.backend, limit=1), [self.api.id])
+        # Resumes outside the index can still be compared against it
+        private = Resume.objects.get(slug='private')
+        self.assertEqual(self.similar(private)[0], self.backend.id)
+
+    def test_changed_resumes_are_reindexed_alone(self):
+        self.similar(self.backend)
+        Project.objects.create(resume=self.designer, title='Redesign', role='Lead', start_date='2021-01-01',
+                               description='Django APIs on PostgreSQL for the backend engineer team, Django again.')
+        WorkExperience.objects.filter(resume=self.api).delete()
+        self.assertEqual(self.similar(self.backend), [self.designer.id, self.api.id])
+
+    def test_updates_leave_the_built_rows_and_weights_alone(self):
+        Resume.objects.exclude(pk=self.designer.pk).update(last_modified=timezone.now() - datetime.timedelta(hours=1))
+        self.similar(self.backend)
+        built = documents.state()
+        Project.objects.create(resume=self.designer, title='Redesign', role='Lead', start_date='2021-01-01',
+                               description='Django APIs on PostgreSQL for the backend engineer team, Django again.')
+        self.assertEqual(self.similar(self.backend), [self.designer.id, self.api.id])
+        updated = documents.state()
+        self.assertIs(updated.matrix, built.matrix)
+        self.assertIs(updated.fitted, built.fitted)
+        self.assertEqual(list(updated.tail_rows), [self.designer.id])
+        self.assertEqual(list(built.rows[updated.dead]), [self.designer.id])
+
+        # Past ``tail_size`` the tail is merged into the base
+        documents.tail_size = 0
+        self.addCleanup(delattr, documents, 'tail_size')
+        WorkExperience.objects.filter(resume=self.api).delete()
+        merged = documents.state()
+        self.assertEqual((len(merged.tail_rows), len(merged.dead)), (0, 0))
+        self.assertEqual(list(merged.rows), sorted([self.backend.id, self.api.id, self.designer.id]))
+        self.assertEqual(self.similar(self.backend), [self.designer.id, self.api.id])
+
+    def test_index_is_saved_and_restored(self):
+        Resume.objects.filter(pk__in=[self.api.pk, self.designer.pk]).update(
+            last_modified=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.similar(self.backend)
+        self.assertTrue(self.path.exists())
+        index = TextIndex()
+        # Restored from the file: the lookup of resumes modified since the saved
+        # watermark, then a re-read of just those (the newest one, in the overlap)
+        with self.assertNumQueries(2):
+            state = index.state()
+        self.assertEqual(sorted(state.rows), sorted([self.backend.id, self.api.id, self.designer.id]))
+        saved = documents.state()
+        restored = state.matrix[np.argsort(state.rows)]
+        self.assertEqual((restored != saved.matrix[np.argsort(saved.rows)]).nnz, 0)
+
+    def test_blocked_product_matches_dense_scores(self):
+        vectors = normalize(sparse.random(50, 30, density=0.2, format='csr', random_state=1, dtype=np.float32))
+        queries = normalize(sparse.random(3, 30, density=0.3, format='csr', random_state=2, dtype=np.float32))
+        dense = (vectors @ queries.T).toarray().T
+        indexes, scores = top_k_cosine(vectors.tocsr(), queries.tocsr(), 5, block_size=7)
+        for row in range(3):
+            self.assertEqual(list(indexes[row]), list(np.argsort(-dense[row], kind='stable')[:5]))
+            np.testing.assert_allclose(scores[row], np.sort(dense[row])[::-1][:5], rtol=1e-6)
+
+        excluded = np.sort([int(indexes[0][0]), 20])
+        indexes, _ = top_k_cosine(vectors.tocsr(), queries.tocsr(), 5, block_size=7, excluded=excluded)
+        self.assertFalse(np.isin(indexes, excluded).any())
@@ -1,68 +1,308 @@
-from rest_framework import viewsets
+import hashlib
+
+from django.db.models import Count, Max, Prefetch
+from django.utils.cache import get_conditional_response
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from resume_builder import cache, search
+from resume_builder.api import export
+from resume_builder.rendering import jobs, pool
+from resume_builder.api.bulk import BulkWriteMixin
+from resume_builder.api.conditional import ConditionalRequestMixin
 
 from resume_builder.models import (
     ResumeTemplate, Resume, ResumeSection, WorkExperience,
     TechnicalSkill, Education, Technology, Project,
-    Certification, Award, Language
+    Certification, Award, Language, RenderJob
+)
+from resume_builder.api.filters import (
+    ResumeFilter, ResumeSectionFilter, WorkExperienceFilter, TechnicalSkillFilter,
+    EducationFilter, ProjectFilter, CertificationFilter, AwardFilter, LanguageFilter
 )
 from resume_builder.api.serializers import (
     ResumeTemplateSerializer, ResumeSerializer, ResumeSectionSerializer,
     WorkExperienceSerializer, TechnicalSkillSerializer, EducationSerializer,
     TechnologySerializer, ProjectSerializer, CertificationSerializer,
-    AwardSerializer, LanguageSerializer
+    AwardSerializer, LanguageSerializer, RenderJobSerializer, RenderRequestSerializer,
+    ResumeSearchResultSerializer
 )
 
 
-class ResumeTemplateViewSet(viewsets.ModelViewSet):
+class ResumeTemplateViewSet(ConditionalRequestMixin, viewsets.ModelViewSet):
     queryset = ResumeTemplate.objects.all()
     serializer_class = ResumeTemplateSerializer
 
+    def get_etag(self, obj):
+        return quote_etag(f'{obj.pk}-{obj.version}-{obj.updated_at.timestamp()}')
+
+    def get_last_modified(self, obj):
+        return obj.updated_at
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        validators = self.get_list_validators(queryset.order_by().aggregate(**self.get_list_aggregates()))
+        if validators is None:
+            return super().list(request, *args, **kwargs)
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_list_validators(response, validators)
+
+    def get_list_aggregates(self):
+        return {'count': Count('id'), 'last_modified': Max('updated_at')}
+
+    def get_list_validators(self, stats):
+        """ETag and Last-Modified timestamp of a list from its ``get_list_aggregates``, None when empty"""
+        if stats['last_modified'] is None:
+            return None
+        # The representation also depends on filters and the page cursor
+        path = hashlib.md5(self.request.get_full_path().encode()).hexdigest()
+        etag = quote_etag(f"{stats['count']}-{stats['last_modified'].timestamp()}-{path}")
+        return etag, stats['last_modified'].timestamp()
 
-class ResumeViewSet(viewsets.ModelViewSet):
-    queryset = Resume.objects.all()
+    def set_list_validators(self, response, validators):
+        etag, last_modified = validators
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # Templates are small, so the validator lookup loads the whole row
+        template = self.get_validator_object()
+        response = self.check_preconditions(template)
+        if response is None:
+            response = Response(self.get_serializer(template).data)
+        return self.set_validators(response, template)
+
+
+class ResumeViewSet(ConditionalRequestMixin, viewsets.ModelViewSet):
+    queryset = Resume.objects.with_graph()
     serializer_class = ResumeSerializer
+    filterset_class = ResumeFilter
+    validator_fields = ('user_id', 'content_version', 'last_modified')
+
+    def get_fieldset(self):
+        """Sparse fieldset requested for read actions, if any"""
+        if self.action not in ('list', 'retrieve'):
+            return None
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = ResumeSerializer.get_fieldset(self.request.query_params)
+        return self._fieldset
+
+    def get_queryset(self):
+        fieldset = self.get_fieldset()
+        if fieldset is None:
+            return super().get_queryset()
+        # The primary key and ordering columns are always needed for pagination
+        columns = {'id', *fieldset.fields, *(name.lstrip('-') for name in Resume._meta.ordering)}
+        return Resume.objects.only(*columns).with_relations(fieldset.expand)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
+
+    def get_etag(self, obj):
+        return quote_etag(f'{obj.pk}-{obj.content_version}')
+
+    def get_last_modified(self, obj):
+        return obj.last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.get_fieldset() is not None:
+            return super().retrieve(request, *args, **kwargs)
+        # Look up only the validators; 304s and cache hits never touch the child tables
+        resume = self.get_validator_object()
+        response = self.check_preconditions(resume)
+        if response is None:
+            payload = cache.get_payload(resume.pk, resume.content_version)
+            if payload is None:
+                # The payload is cached under this content version, so it must not embed stale names
+                cache.technologies.revalidate()
+                instance = Resume.objects.with_graph().get(pk=resume.pk)
+                payload = self.get_serializer(instance).data
+                cache.set_payload(instance.pk, instance.content_version, payload)
+            response = Response(payload)
+        return self.set_validators(response, resume)
+
+    @action(detail=False, methods=['get'], serializer_class=ResumeSearchResultSerializer)
+    def search(self, request):
+        """Full-text search (``?q=``, web search syntax) ranked by relevance, with snippets"""
+        terms = request.query_params.get('q', '').strip()
+        if not terms:
+            raise ValidationError({'q': ['This query parameter is required.']})
+        columns = ResumeSearchResultSerializer.Meta.fields[:-2]
+        queryset = self.filter_queryset(search.search(Resume.objects.only(*columns), terms))
+        page = self.paginate_queryset(queryset)
+        hits = page if page is not None else list(queryset)
+        headlines = search.headlines([hit.pk for hit in hits], terms)
+        for hit in hits:
+            hit.headline = headlines.get(hit.pk, '')
+        serializer = ResumeSearchResultSerializer(hits, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def incomplete(self, request):
+        """Resumes below 100% complete (or ``?completeness_below=``), least complete first"""
+        queryset = self.get_queryset().filter(completeness__lt=100).order_by('completeness', 'id')
+        page = self.paginate_queryset(self.filter_queryset(queryset))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the filtered resumes as a ZIP of JSON (``?type=json``, default) or
+        rendered ``pdf``/``docx`` documents, one entry per resume; documents not
+        rendered yet are queued and listed in ``skipped.txt``.
+        """
+        export_type = request.query_params.get('type', 'json')
+        if export_type not in export.EXPORT_TYPES:
+            raise ValidationError({'type': [f"Expected one of: {', '.join(export.EXPORT_TYPES)}."]})
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export.stream_zip(export.export_entries(queryset, export_type)),
+            content_type='application/zip',
+        )
+        filename = f"resumes-{timezone.now():%Y%m%d-%H%M%S}.zip"
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=True, methods=['post'], serializer_class=RenderRequestSerializer)
+    def renders(self, request, pk=None):
+        """Render the current content version as PDF/DOCX; 202 until the artifact is ready"""
+        resume = self.get_validator_object()
+        serializer = RenderRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        template = serializer.validated_data.get('template')
+        if template is None:
+            template = ResumeTemplate.objects.filter(resumes=resume).first()
+            if template is None:
+                raise ValidationError({'template': ['This resume has no template; pass one explicitly.']})
+        try:
+            job = jobs.request_render(resume.pk, template, serializer.validated_data['format'])
+        except pool.PoolFull:
+            raise RenderQueueFull
+        return Response(
+            RenderJobSerializer(job).data,
+            status=status.HTTP_200_OK if job.status == 'DONE' else status.HTTP_202_ACCEPTED,
+        )
+
+
+class RenderQueueFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many documents are being rendered, try again shortly.'
+    default_code = 'render_queue_full'
+
+
+class RenderJobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = RenderJob.objects.select_related('resume')
+    serializer_class = RenderJobSerializer
+    filterset_fields = ['resume', 'status', 'format']
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Stream the cached artifact, or report the job state while it is not ready"""
+        job = self.get_object()
+        if jobs.is_ready(job):
+            return FileResponse(
+                open(jobs.artifact_path(job), 'rb'),
+                as_attachment=True,
+                filename=f'{job.resume.slug}.{job.extension}',
+            )
+        if job.status == 'PENDING':
+            response = Response(RenderJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+            response.headers['Retry-After'] = '2'
+            return response
+        # Failed, or the file was removed; POSTing to the resume's renders/ retries it
+        return Response(RenderJobSerializer(job).data, status=status.HTTP_409_CONFLICT)
 
 
 class ResumeSectionViewSet(viewsets.ModelViewSet):
     queryset = ResumeSection.objects.all()
     serializer_class = ResumeSectionSerializer
+    filterset_class = ResumeSectionFilter
 
 
-class WorkExperienceViewSet(viewsets.ModelViewSet):
-    queryset = WorkExperience.objects.all()
+class WorkExperienceViewSet(BulkWriteMixin, viewsets.ModelViewSet):
+    queryset = WorkExperience.objects.prefetch_related(Prefetch('technologies', Technology.objects.only('id')))
     serializer_class = WorkExperienceSerializer
+    filterset_class = WorkExperienceFilter
 
 
-class TechnicalSkillViewSet(viewsets.ModelViewSet):
+class TechnicalSkillViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     queryset = TechnicalSkill.objects.all()
     serializer_class = TechnicalSkillSerializer
+    filterset_class = TechnicalSkillFilter
 
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
+    filterset_class = EducationFilter
 
 
 class TechnologyViewSet(viewsets.ModelViewSet):
     queryset = Technology.objects.all()
     serializer_class = TechnologySerializer
+    autocomplete_max_limit = 25
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Prefix + fuzzy name match (``?q=``), optionally within a ``category``.
+        Paged with ``limit``/``offset``; ``more`` tells whether another page exists.
+        """
+        terms = request.query_params.get('q', '').strip()
+        category = request.query_params.get('category')
+        if category and category not in dict(Technology.CATEGORIES):
+            raise ValidationError({'category': [f'Unknown category: {category}']})
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), self.autocomplete_max_limit)
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            raise ValidationError({'limit': ['limit and offset must be integers.']})
+        if limit < 1 or offset < 0:
+            raise ValidationError({'limit': ['limit must be positive and offset not negative.']})
+
+        if terms:
+            queryset = search.technology_matches(terms, category)
+        else:
+            queryset = Technology.objects.filter(category=category) if category else Technology.objects.all()
+        technologies = list(queryset[offset:offset + limit + 1])
+        return Response({
+            'results': TechnologySerializer(technologies[:limit], many=True).data,
+            'more': len(technologies) > limit,
+        })
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.all()
+class ProjectViewSet(BulkWriteMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.prefetch_related(Prefetch('technologies', Technology.objects.only('id')))
     serializer_class = ProjectSerializer
+    filterset_class = ProjectFilter
 
 
-class CertificationViewSet(viewsets.ModelViewSet):
-    queryset = Certification.objects.all()
+class CertificationViewSet(BulkWriteMixin, viewsets.ModelViewSet):
+    queryset = Certification.objects.prefetch_related(Prefetch('skills', Technology.objects.only('id')))
     serializer_class = CertificationSerializer
+    filterset_class = CertificationFilter
 
 
-class AwardViewSet(viewsets.ModelViewSet):
+class AwardViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Award.objects.all()
     serializer_class = AwardSerializer
+    filterset_class = AwardFilter
 
 
-class LanguageViewSet(viewsets.ModelViewSet):
+class LanguageViewSet(BulkWriteMixin, viewsets.ModelViewSet):
     queryset = Language.objects.all()
-    serializer_class = LanguageSerializer
\ No newline at end of file
+    serializer_class = LanguageSerializer
+    filterset_class = LanguageFilter
@@ -0,0 +1,276 @@
+"""
+Async read endpoints for resumes, templates and technologies, for ASGI
+deployments (core/asgi.py).
+
+Each view wraps an instance of the matching sync viewset and runs its
+request handling: authentication, permissions, throttling, filtering,
+pagination, content negotiation, conditional requests, serializers and error
+responses all behave as on the sync routes. Only the reads differ: queries go
+through the async ORM, so a request waiting on the database does not hold a
+worker, and a resume's child relations are fetched concurrently on up to
+``ASYNC_RELATION_FETCHES`` pooled connections (``DATABASE_POOL``) rather than
+one after the other as prefetch_related does. Those connections come out of a
+process-wide budget of half the pool, so under load requests fall back to
+reading on their own connection. Requests take turns at the database: no more
+than the other half of the pool read at once, the rest wait on the event loop
+(holding neither a thread nor a connection, and never timing out on the
+pool), and each hands its connection back once it has read. Serializing and
+rendering then run in the request's sync thread, off the event loop.
+"""
+import asyncio
+import threading
+import weakref
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import connections
+from django.http import Http404
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+from rest_framework.response import Response
+
+from resume_builder import cache
+from resume_builder.api.api import ResumeTemplateViewSet, ResumeViewSet, TechnologyViewSet
+from resume_builder.models import Resume
+
+
+class AsyncReadView(View):
+    """
+    List (no URL kwargs) and retrieve (``pk``) GET endpoint running
+    ``viewset_class``'s request handling around async ``list``/``retrieve``.
+    """
+    viewset_class = None
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request, *args, **kwargs):
+        action = 'retrieve' if kwargs else 'list'
+        viewset = self.viewset_class(action_map={'get': action, 'head': action}, detail=bool(kwargs))
+        viewset.args, viewset.kwargs = args, kwargs
+        viewset.request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.headers = viewset.default_response_headers
+        self.turn = DatabaseTurn()
+        try:
+            async with self.turn:
+                await sync_to_async(viewset.initial)(viewset.request, *args, **kwargs)
+                response = await (self.retrieve(viewset) if kwargs else self.list(viewset))
+        except Exception as exc:
+            response = await sync_to_async(viewset.handle_exception)(exc)
+        return await sync_to_async(finalize)(viewset, response)
+
+    async def serialize(self, viewset, instance, many=False):
+        # The reads are done; serializers may still read lazily (e.g. the
+        # Technology cache), so they run in the request's sync thread
+        await self.turn.end()
+        return await sync_to_async(lambda: viewset.get_serializer(instance, many=many).data)()
+
+    async def get_queryset(self, viewset):
+        return await sync_to_async(lambda: viewset.filter_queryset(viewset.get_queryset()))()
+
+    async def load(self, viewset, objects):
+        """Load whatever the serializer reads beyond the rows themselves"""
+
+    async def list(self, viewset):
+        queryset = await self.get_queryset(viewset)
+        page = await viewset.paginator.apaginate_queryset(queryset, viewset.request, view=viewset)
+        objects = page if page is not None else [obj async for obj in queryset]
+        await self.load(viewset, objects)
+        data = await self.serialize(viewset, objects, many=True)
+        return Response(data) if page is None else viewset.get_paginated_response(data)
+
+    async def retrieve(self, viewset):
+        instance = await get_object(viewset, await self.get_queryset(viewset))
+        await self.load(viewset, [instance])
+        return Response(await self.serialize(viewset, instance))
+
+
+class AsyncResumeTemplateView(AsyncReadView):
+    viewset_class = ResumeTemplateViewSet
+
+    async def list(self, viewset):
+        queryset = await self.get_queryset(viewset)
+        validators = viewset.get_list_validators(await queryset.order_by().aaggregate(**viewset.get_list_aggregates()))
+        if validators is None:
+            return await super().list(viewset)
+        etag, last_modified = validators
+        response = get_conditional_response(viewset.request, etag=etag, last_modified=int(last_modified))
+        if response is None:
+            response = await super().list(viewset)
+        return viewset.set_list_validators(response, validators)
+
+    async def retrieve(self, viewset):
+        template = await get_validator_object(viewset)
+        response = viewset.check_preconditions(template)
+        if response is None:
+            response = Response(await self.serialize(viewset, template))
+        return viewset.set_validators(response, template)
+
+
+class AsyncResumeView(AsyncReadView):
+    viewset_class = ResumeViewSet
+
+    async def get_queryset(self, viewset):
+        # Child relations are loaded by load_relations instead
+        return (await super().get_queryset(viewset)).prefetch_related(None)
+
+    async def load(self, viewset, objects):
+        fieldset = viewset.get_fieldset()
+        await load_relations(objects, Resume.CHILD_RELATIONS if fieldset is None else fieldset.expand)
+
+    async def retrieve(self, viewset):
+        if viewset.get_fieldset() is not None:
+            return await super().retrieve(viewset)
+        # As ResumeViewSet.retrieve: 304s and cache hits never touch the child tables
+        resume = await get_validator_object(viewset)
+        response = viewset.check_preconditions(resume)
+        if response is None:
+            payload = await cache.aget_payload(resume.pk, resume.content_version)
+            if payload is None:
+                await sync_to_async(cache.technologies.revalidate)()
+                instance = await Resume.objects.with_graph().prefetch_related(None).aget(pk=resume.pk)
+                await load_relations([instance], Resume.CHILD_RELATIONS)
+                payload = await self.serialize(viewset, instance)
+                await cache.aset_payload(instance.pk, instance.content_version, payload)
+            response = Response(payload)
+        return viewset.set_validators(response, resume)
+
+
+class AsyncTechnologyView(AsyncReadView):
+    viewset_class = TechnologyViewSet
+
+
+def finalize(viewset, response):
+    response = viewset.finalize_response(viewset.request, response, *viewset.args, **viewset.kwargs)
+    return response.render() if isinstance(response, SimpleTemplateResponse) else response
+
+
+async def get_object(viewset, queryset):
+    """Async get_object: 404 unless ``queryset`` holds the object of the URL, then object permissions"""
+    lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+    try:
+        obj = await queryset.aget(**{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]})
+    except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+    await sync_to_async(viewset.check_object_permissions)(viewset.request, obj)
+    return obj
+
+
+async def get_validator_object(viewset):
+    return await get_object(viewset, await sync_to_async(viewset.get_validator_queryset)())
+
+
+async def load_relations(resumes, relations):
+    """Attach ``relations`` of ``resumes`` as if prefetched, fetching the relations concurrently"""
+    if not resumes or not relations:
+        return
+    ids = [resume.pk for resume in resumes]
+    querysets = [Resume.objects.relation_queryset(name).filter(resume_id__in=ids) for name in relations]
+    slots = acquire_fetch_slots(min(len(querysets), settings.ASYNC_RELATION_FETCHES))
+    try:
+        if slots > 1 and await sync_to_async(return_connections)():
+            fetch = sync_to_async(fetch_on_own_connection, thread_sensitive=False)
+            # Relations are dealt out round-robin, each connection reading its share in turn
+            shares = await asyncio.gather(*(fetch(querysets[slot::slots]) for slot in range(slots)))
+            results = [None] * len(querysets)
+            for slot, share in enumerate(shares):
+                results[slot::slots] = share
+        else:
+            results = [[obj async for obj in queryset] for queryset in querysets]
+    finally:
+        release_fetch_slots(slots)
+
+    for name, rows in zip(relations, results):
+        by_resume = defaultdict(list)
+        for row in rows:
+            by_resume[row.resume_id].append(row)
+        for resume in resumes:
+            # What prefetch_related leaves behind, so serializers read these rows
+            related = getattr(resume, name).all()
+            related._result_cache, related._prefetch_done = by_resume[resume.pk], True
+            resume.__dict__.setdefault('_prefetched_objects_cache', {})[name] = related
+
+
+class DatabaseTurn:
+    """
+    A request's turn at reading the database, out of half of
+    DATABASE_POOL_MAX_SIZE per event loop; ``end()`` hands the turn, and the
+    request's connections, on before the block ends.
+    """
+    _gates = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        self.gate = None
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        gate = self._gates.get(loop)
+        if gate is None:
+            pool_size = settings.DATABASE_POOL_MAX_SIZE
+            gate = self._gates[loop] = asyncio.Semaphore(max(1, pool_size - pool_size // 2))
+        await gate.acquire()
+        self.gate = gate
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.end()
+
+    async def end(self):
+        if self.gate is not None:
+            gate, self.gate = self.gate, None
+            try:
+                await sync_to_async(return_connections)()
+            finally:
+                gate.release()
+
+
+_fetch_slots_lock = threading.Lock()
+_fetch_slots_used = 0
+
+
+def acquire_fetch_slots(wanted):
+    """
+    Take up to ``wanted`` of the process's fetch connections without waiting;
+    returns how many were taken (0 when pooling is off).
+    """
+    global _fetch_slots_used
+    if not settings.DATABASE_POOL or wanted < 2:
+        return 0
+    with _fetch_slots_lock:
+        # The other half of the pool is left to requests' own connections
+        slots = min(wanted, settings.DATABASE_POOL_MAX_SIZE // 2 - _fetch_slots_used)
+        if slots < 2:
+            return 0
+        _fetch_slots_used += slots
+        return slots
+
+
+def release_fetch_slots(slots):
+    global _fetch_slots_used
+    with _fetch_slots_lock:
+        _fetch_slots_used -= slots
+
+
+def return_connections():
+    """
+    Hand the request thread's connections back to the pool, returning whether
+    it did; not inside a transaction, whose reads (and writes, or a test's
+    data) only its own connection sees. Fetching on other connections is up
+    to the same condition.
+    """
+    opened = connections.all(initialized_only=True)
+    if not settings.DATABASE_POOL or any(connection.in_atomic_block for connection in opened):
+        return False
+    for connection in opened:
+        connection.close()
+    return True
+
+
+def fetch_on_own_connection(querysets):
+    # Runs in an executor thread; connections are per thread, so this one is the thread's own
+    try:
+        return [list(queryset) for queryset in querysets]
+    finally:
+        for alias in {queryset.db for queryset in querysets}:
+            connections[alias].close()
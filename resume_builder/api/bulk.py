@@ -0,0 +1,215 @@
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from resume_builder.models import Resume, Technology
+from resume_builder.signals import bump_content_version, deferred_content_version
+
+
+class BulkWriteMixin:
+    """
+    Bulk create/update/delete of one resume's child records at ``<prefix>/bulk/``.
+
+    POST   {"resume": id, "items": [{...}, ...]}
+    PATCH  {"resume": id, "items": [{"id": pk, ...}, ...]}
+    DELETE {"resume": id, "ids": [pk, ...]}
+
+    The whole batch is validated first and errors are reported per item, in the
+    order the items were sent. Valid batches are written in one transaction
+    with bulk_create/bulk_update and batched M2M through-table inserts, and the
+    resume's content version is bumped once.
+    """
+    bulk_max_items = 500
+
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        resume = self.get_bulk_resume()
+        key = 'ids' if request.method == 'DELETE' else 'items'
+        values = request.data.get(key)
+        if not isinstance(values, list) or not values:
+            raise ValidationError({key: ['Expected a non-empty list.']})
+        if len(values) > self.bulk_max_items:
+            raise ValidationError({key: [f'At most {self.bulk_max_items} entries per request.']})
+
+        try:
+            if request.method == 'POST':
+                return self.bulk_create(resume, values)
+            if request.method == 'PATCH':
+                return self.bulk_update(resume, values)
+            return self.bulk_destroy(resume, values)
+        except IntegrityError as exc:
+            # A concurrent write slipped past the batch validation
+            raise ValidationError({'non_field_errors': [str(exc).splitlines()[0]]})
+
+    def get_bulk_resume(self):
+        resume_id = self.request.data.get('resume')
+        resume = None
+        if isinstance(resume_id, int) or (isinstance(resume_id, str) and resume_id.isdigit()):
+            resume = Resume.objects.filter(pk=resume_id, user=self.request.user).only('id').first()
+        if resume is None:
+            raise ValidationError({'resume': ['Invalid resume.']})
+        return resume
+
+    def get_m2m_fields(self):
+        return list(self.queryset.model._meta.many_to_many)
+
+    def bulk_create(self, resume, items):
+        validated, m2m_values = self.validate_items(resume, [None] * len(items), items, partial=False)
+        model = self.queryset.model
+        with transaction.atomic():
+            objs = model.objects.bulk_create([model(resume=resume, **attrs) for attrs in validated])
+            self.set_m2m(objs, m2m_values)
+            bump_content_version([resume.pk], model)
+        return Response(self.serialize_batch(objs), status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, resume, items):
+        model = self.queryset.model
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        instances = model.objects.filter(
+            resume=resume, pk__in=[pk for pk in ids if isinstance(pk, int)]
+        ).in_bulk()
+        validated, m2m_values = self.validate_items(
+            resume, [instances.get(pk) for pk in ids], items, partial=True
+        )
+
+        objs, fields = [], set()
+        now = timezone.now()
+        auto_now = [f.name for f in model._meta.concrete_fields if getattr(f, 'auto_now', False)]
+        for pk, attrs in zip(ids, validated):
+            obj = instances[pk]
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+            for name in auto_now:
+                setattr(obj, name, now)
+            fields.update(attrs)
+            objs.append(obj)
+
+        with transaction.atomic():
+            if fields:
+                model.objects.bulk_update(objs, [*fields, *auto_now])
+            self.set_m2m(objs, m2m_values, replace=True)
+            bump_content_version([resume.pk], model)
+        return Response(self.serialize_batch(objs))
+
+    def bulk_destroy(self, resume, ids):
+        if not all(isinstance(pk, int) for pk in ids):
+            raise ValidationError({'ids': ['Expected a list of integer ids.']})
+        queryset = self.queryset.model.objects.filter(resume=resume, pk__in=ids)
+        found = set(queryset.values_list('pk', flat=True))
+        missing = [pk for pk in ids if pk not in found]
+        if missing:
+            raise ValidationError({'ids': [f'Not found: {", ".join(map(str, missing))}']})
+        with transaction.atomic(), deferred_content_version():
+            queryset.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def validate_items(self, resume, instances, items, partial):
+        """
+        Validate every item and return ``(validated_data, m2m_values)`` lists.
+
+        M2M ids are checked with one query for the whole batch instead of one
+        per id, and the resume-scoped ``unique_together`` sets are checked
+        against both the batch and the database.
+        """
+        m2m_fields = self.get_m2m_fields()
+        errors, validated, m2m_values = [], [], []
+        all_ids = {
+            pk for item in items if isinstance(item, dict)
+            for field in m2m_fields for pk in item.get(field.name) or [] if isinstance(pk, int)
+        }
+        technologies = Technology.objects.in_bulk(all_ids)
+        seen = set()
+
+        for instance, item in zip(instances, items):
+            item_errors, attrs, m2m = {}, {}, {}
+            if not isinstance(item, dict):
+                errors.append({'non_field_errors': ['Expected an object.']})
+                validated.append(attrs)
+                m2m_values.append(m2m)
+                continue
+            if partial and instance is None:
+                item_errors['id'] = ['Not found.']
+            elif partial and instance.pk in seen:
+                item_errors['id'] = ['Duplicate id within the batch.']
+            elif partial:
+                seen.add(instance.pk)
+
+            data = {key: value for key, value in item.items() if key != 'id'}
+            for field in m2m_fields:
+                if field.name not in data:
+                    continue
+                pks = data.pop(field.name)
+                valid = isinstance(pks, list) and all(isinstance(pk, int) and pk in technologies for pk in pks)
+                if not valid:
+                    item_errors[field.name] = ['Invalid technology ids.']
+                else:
+                    m2m[field.name] = [technologies[pk] for pk in pks]
+
+            if not item_errors:
+                serializer = self.get_serializer(instance, data=data, partial=partial)
+                if serializer.is_valid():
+                    attrs = dict(serializer.validated_data)
+                else:
+                    item_errors.update(serializer.errors)
+            errors.append(item_errors)
+            validated.append(attrs)
+            m2m_values.append(m2m)
+
+        self.validate_unique(resume, instances, validated, errors)
+        if any(errors):
+            raise ValidationError({'items': errors})
+        return validated, m2m_values
+
+    def validate_unique(self, resume, instances, validated, errors):
+        model = self.queryset.model
+        batch_ids = [instance.pk for instance in instances if instance is not None]
+        for unique_fields in model._meta.unique_together:
+            fields = [name for name in unique_fields if name != 'resume']
+            if 'resume' not in unique_fields or not fields:
+                continue
+            keys = {}
+            for index, (instance, attrs) in enumerate(zip(instances, validated)):
+                if errors[index]:
+                    continue
+                key = tuple(attrs.get(name, getattr(instance, name, None)) for name in fields)
+                if key in keys:
+                    errors[index]['non_field_errors'] = [f'Duplicate {", ".join(fields)} within the batch.']
+                else:
+                    keys[key] = index
+            if not keys:
+                continue
+
+            condition = models.Q()
+            for key in keys:
+                condition |= models.Q(**dict(zip(fields, key)))
+            existing = model.objects.filter(condition, resume=resume).exclude(pk__in=batch_ids)
+            attnames = [model._meta.get_field(name).attname for name in fields]
+            for values in existing.values_list(*attnames):
+                for key, index in keys.items():
+                    if tuple(getattr(value, 'pk', value) for value in key) == values:
+                        errors[index]['non_field_errors'] = [
+                            f'This resume already has an entry with this {", ".join(fields)}.'
+                        ]
+
+    def set_m2m(self, objs, m2m_values, replace=False):
+        """Write the M2M links with one delete and one insert per relation"""
+        for field in self.get_m2m_fields():
+            through = field.remote_field.through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            changed = [(obj, values[field.name]) for obj, values in zip(objs, m2m_values) if field.name in values]
+            if not changed:
+                continue
+            if replace:
+                through.objects.filter(**{f'{source}__in': [obj.pk for obj, _ in changed]}).delete()
+            through.objects.bulk_create([
+                through(**{f'{source}_id': obj.pk, f'{target}_id': related.pk})
+                for obj, related_objs in changed for related in related_objs
+            ], ignore_conflicts=True)
+
+    def serialize_batch(self, objs):
+        """Reload the written rows with their M2Ms prefetched, in request order"""
+        loaded = self.get_queryset().in_bulk([obj.pk for obj in objs])
+        return self.get_serializer([loaded[obj.pk] for obj in objs], many=True).data
@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified support for detail routes of a ModelViewSet.
+
+    The validators are read with a single indexed lookup of ``validator_fields``
+    (the full row when empty), so ``If-None-Match``/``If-Modified-Since`` can be
+    answered with a 304 and ``If-Match`` mismatches with a 412 before any
+    serializer is built. Subclasses implement ``get_etag`` and
+    ``get_last_modified``.
+    """
+    validator_fields = ()
+
+    def get_etag(self, obj):
+        raise NotImplementedError
+
+    def get_last_modified(self, obj):
+        raise NotImplementedError
+
+    def get_validator_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(
+            self.get_validator_queryset(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_validator_queryset(self):
+        """The filtered queryset get_validator_object looks the object up in"""
+        model = self.queryset.model
+        queryset = model.objects.all()
+        if self.validator_fields:
+            queryset = queryset.only(model._meta.pk.name, *self.validator_fields)
+        if self.request.method not in SAFE_METHODS and 'HTTP_IF_MATCH' in self.request.META:
+            # Hold the row until the write completes so a concurrent update cannot slip in
+            queryset = queryset.select_for_update()
+        return self.filter_queryset(queryset)
+
+    def check_preconditions(self, obj):
+        """Return a 304/412 response if the request's preconditions say so"""
+        return get_conditional_response(
+            self.request,
+            etag=self.get_etag(obj),
+            last_modified=int(self.get_last_modified(obj).timestamp()),
+        )
+
+    def set_validators(self, response, obj):
+        response.headers['ETag'] = self.get_etag(obj)
+        response.headers['Last-Modified'] = http_date(self.get_last_modified(obj).timestamp())
+        return response
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = self.check_preconditions(self.get_validator_object())
+            if response is not None:
+                return response
+            response = super().update(request, *args, **kwargs)
+        return self.set_validators(response, self.updated_object)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.updated_object = serializer.instance
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = self.check_preconditions(self.get_validator_object())
+            if response is not None:
+                return response
+            return super().destroy(request, *args, **kwargs)
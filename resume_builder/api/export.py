@@ -0,0 +1,105 @@
+import zipfile
+
+from resume_builder import cache
+from resume_builder.api.renderers import ORJSONRenderer
+from resume_builder.api.serializers import ResumeSerializer
+from resume_builder.rendering import jobs, pool
+
+EXPORT_TYPES = ('json', 'pdf', 'docx')
+# Resumes (with their prefetched children) held in memory at a time
+EXPORT_CHUNK_SIZE = 200
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipBuffer:
+    """Write-only file object the ZipFile writes into; drained after every entry"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive of ``(name, chunks)`` entries piece by piece.
+
+    The archive is written to a non-seekable buffer, so zipfile emits data
+    descriptors instead of seeking back, and only the entry being written is
+    ever held in memory.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, chunks in entries:
+            with archive.open(name, 'w', force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+def export_entries(queryset, export_type):
+    """
+    Yield one ZIP entry per resume of ``queryset`` (which must prefetch the
+    resume graph), read through a server-side cursor in EXPORT_CHUNK_SIZE
+    batches with the prefetches done per batch.
+
+    Documents are never rendered in the request: missing ones are submitted
+    to the render pool (as far as its queue takes them) and listed in
+    ``skipped.txt``, so exporting again once they are rendered includes them.
+    """
+    renderer = ORJSONRenderer()
+    file_format = export_type.upper()
+    skipped, unrendered = [], []
+    queue_full = False
+
+    for resume in queryset.order_by('pk').iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        payload = cache.get_payload(resume.pk, resume.content_version)
+        if payload is None:
+            payload = ResumeSerializer(resume).data
+        if export_type == 'json':
+            yield f'{resume.slug}.json', [renderer.render(payload)]
+        elif resume.template is None:
+            skipped.append(resume.slug)
+        else:
+            path = jobs.rendered_artifact(resume, file_format)
+            if path is None and not queue_full:
+                try:
+                    job = jobs.request_render(resume.pk, resume.template, file_format, payload=payload)
+                except pool.PoolFull:
+                    queue_full = True
+                else:
+                    # Rendered right away when RESUME_RENDER_EAGER
+                    path = jobs.artifact_path(job) if jobs.is_ready(job) else None
+            if path is None:
+                unrendered.append(resume.slug)
+            else:
+                yield f'{resume.slug}.{export_type}', _read_chunks(path)
+
+    if skipped or unrendered:
+        sections = [
+            ('Resumes without a template', skipped),
+            ('Resumes not rendered yet, export again shortly', unrendered),
+        ]
+        yield 'skipped.txt', ['\n'.join(
+            f'{title}:\n' + ''.join(f'{slug}\n' for slug in slugs) for title, slugs in sections if slugs
+        ).encode()]
+
+
+def _read_chunks(path):
+    with open(path, 'rb') as file:
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
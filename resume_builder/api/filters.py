@@ -0,0 +1,98 @@
+from django_filters import rest_framework as filters
+
+from resume_builder.models import (
+    Resume, ResumeSection, WorkExperience, TechnicalSkill,
+    Education, Project, Certification, Award, Language
+)
+
+# Every filter below is backed by an index on the filtered column (or a
+# composite index leading with it); see resume_builder.api.tests.FilterIndexTests.
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
+
+
+class ResumeFilter(filters.FilterSet):
+    tags = CharInFilter(method='filter_tags', help_text='Comma separated tags the resume must all contain.')
+    modified_since = filters.IsoDateTimeFilter(field_name='last_modified', lookup_expr='gte')
+    completeness_below = filters.NumberFilter(field_name='completeness', lookup_expr='lt')
+    completeness_min = filters.NumberFilter(field_name='completeness', lookup_expr='gte')
+
+    class Meta:
+        model = Resume
+        fields = ['visibility', 'language', 'template', 'tags', 'modified_since', 'completeness_below',
+                  'completeness_min']
+
+    def filter_tags(self, queryset, name, value):
+        # JSON containment (@>) is served by the GIN index on tags
+        return queryset.filter(tags__contains=value)
+
+
+class ResumeSectionFilter(filters.FilterSet):
+    class Meta:
+        model = ResumeSection
+        fields = ['resume']
+
+
+class WorkExperienceFilter(filters.FilterSet):
+    class Meta:
+        model = WorkExperience
+        fields = {
+            'resume': ['exact'],
+            'company': ['exact'],
+            'start_date': ['gte', 'lte'],
+            'end_date': ['gte', 'lte'],
+        }
+
+
+class TechnicalSkillFilter(filters.FilterSet):
+    class Meta:
+        model = TechnicalSkill
+        fields = {
+            'resume': ['exact'],
+            'technology': ['exact'],
+            'proficiency': ['exact', 'gte'],
+        }
+
+
+class EducationFilter(filters.FilterSet):
+    class Meta:
+        model = Education
+        fields = {
+            'resume': ['exact'],
+            'end_date': ['gte', 'lte'],
+        }
+
+
+class ProjectFilter(filters.FilterSet):
+    class Meta:
+        model = Project
+        fields = {
+            'resume': ['exact'],
+            'start_date': ['gte', 'lte'],
+        }
+
+
+class CertificationFilter(filters.FilterSet):
+    class Meta:
+        model = Certification
+        fields = {
+            'resume': ['exact'],
+            'issue_date': ['gte', 'lte'],
+        }
+
+
+class AwardFilter(filters.FilterSet):
+    class Meta:
+        model = Award
+        fields = {
+            'resume': ['exact'],
+            'issue_date': ['gte', 'lte'],
+        }
+
+
+class LanguageFilter(filters.FilterSet):
+    class Meta:
+        model = Language
+        fields = ['resume', 'proficiency']
@@ -0,0 +1,126 @@
+import json
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full ordering key instead of an offset.
+
+    The ordering follows the queryset (or the model's ``Meta.ordering``) with the
+    primary key appended as a tiebreaker, and the cursor stores the complete key
+    of the boundary row. Each page is therefore a single indexed range scan, and
+    deep pages cost the same as the first one.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views, reading the page through the async ORM"""
+        queryset = self.get_page_queryset(queryset, request)
+        if queryset is None:
+            return None
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """The unevaluated query for the requested page plus one row, or None when not paginating"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        queryset, self.ordering = self.get_keyset(queryset)
+        self.cursor = self.decode_cursor(request)
+
+        ordering = [invert(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(seek(ordering, self.cursor.position))
+        return queryset[:self.page_size + 1]
+
+    @property
+    def reverse(self):
+        return self.cursor is not None and self.cursor.reverse
+
+    def set_page(self, results):
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_keyset(self, queryset):
+        """Return the queryset annotated with the ordering key and the key itself"""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+
+        keyset = []
+        for index, field in enumerate(ordering):
+            prefix, name = ('-', field[1:]) if field.startswith('-') else ('', field)
+            if '__' in name:
+                alias = f'keyset_{index}'
+                queryset = queryset.annotate(**{alias: F(name)})
+                name = alias
+            keyset.append(prefix + name)
+        return queryset, keyset
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=cursor.reverse, position=position)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.get_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.get_position(self.page[0])))
+
+    def get_position(self, instance):
+        values = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        return json.dumps(values, default=lambda value: value.isoformat())
+
+
+def invert(field):
+    return field[1:] if field.startswith('-') else '-' + field
+
+
+def seek(ordering, position):
+    """
+    Build the lexicographic "comes after" condition for an ordering key:
+    (a > x) OR (a = x AND b > y) OR ... with the comparison flipped for
+    descending fields.
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        term = Q(**{f'{name}__{lookup}': position[index]})
+        for previous, value in zip(ordering[:index], position[:index]):
+            term &= Q(**{previous.lstrip('-'): value})
+        condition |= term
+    return condition
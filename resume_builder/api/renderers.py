@@ -0,0 +1,41 @@
+import msgpack
+import orjson
+from rest_framework.utils import encoders
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Fallback for the few types the C encoders do not know natively
+# (lazy translation strings, Decimal, querysets, ...)
+_default = encoders.JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson.
+
+    Dicts, lists, strings and numbers produced by the serializers are encoded
+    in C; only unknown types go through DRF's JSONEncoder.default. Indented
+    output (browsable API, ``; indent=`` media type) keeps the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Non-string keys (e.g. the item indexes of nested list errors) become strings, as with json.dumps
+        ret = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        # Keep JSONRenderer's guarantee that the output is a strict javascript subset
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders responses as MessagePack for clients that send ``Accept: application/msgpack``"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
@@ -1,12 +1,29 @@
+from collections import namedtuple
+
 from rest_framework import serializers
 
+from resume_builder import cache
 from resume_builder.models import (
     ResumeTemplate, Resume, ResumeSection, WorkExperience,
     TechnicalSkill, Education, Technology, Project,
-    Certification, Award, Language
+    Certification, Award, Language, RenderJob
 )
 
 
+Fieldset = namedtuple('Fieldset', ['fields', 'expand'])
+
+
+class DateRangeValidationMixin:
+    """Mirror the model's end_date >= start_date check constraint"""
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = attrs.get('end_date', getattr(self.instance, 'end_date', None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'End date cannot be before the start date.'})
+        return attrs
+
 
 class ResumeTemplateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -28,12 +45,24 @@ class WorkExperienceSerializer(serializers.ModelSerializer):
 
 
 class TechnicalSkillSerializer(serializers.ModelSerializer):
+    technology_name = serializers.SerializerMethodField()
+    technology_icon = serializers.SerializerMethodField()
+
     class Meta:
         model = TechnicalSkill
         exclude = ['resume']
 
+    # Resolved from the process-local Technology cache rather than a join
+    def get_technology_name(self, obj):
+        technology = cache.technologies.get(obj.technology_id)
+        return technology.name if technology else None
+
+    def get_technology_icon(self, obj):
+        technology = cache.technologies.get(obj.technology_id)
+        return technology.icon if technology else None
+
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(DateRangeValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = Education
         exclude = ['resume']
@@ -44,7 +73,7 @@ class TechnologySerializer(serializers.ModelSerializer):
         model = Technology
         fields = ['id', 'name', 'category', 'icon']
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DateRangeValidationMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
         exclude = ['resume']
@@ -80,5 +109,66 @@ class ResumeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Resume
-        fields = '__all__'
-        read_only_fields = ['id', 'user', 'created_at', 'last_modified']
+        exclude = ['search_vector']
+        read_only_fields = ['id', 'user', 'created_at', 'last_modified', 'content_version']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get('fieldset')
+        if fieldset is not None:
+            keep = set(fieldset.fields) | set(fieldset.expand)
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_fieldset(cls, query_params):
+        """
+        Parse ``?fields=`` (scalar fields) and ``?expand=`` (nested relations).
+
+        Returns ``None`` when neither is given so the full resume is serialized.
+        Nested relations are only included when they are explicitly expanded.
+        """
+        if 'fields' not in query_params and 'expand' not in query_params:
+            return None
+        scalars = [field.name for field in Resume._meta.concrete_fields if field.name != 'search_vector']
+        fields = _split(query_params.get('fields')) or scalars
+        expand = _split(query_params.get('expand'))
+
+        errors = {}
+        unknown = [name for name in fields if name not in scalars]
+        if unknown:
+            errors['fields'] = f"Unknown field(s): {', '.join(unknown)}"
+        unknown = [name for name in expand if name not in Resume.CHILD_RELATIONS]
+        if unknown:
+            errors['expand'] = f"Unknown relation(s): {', '.join(unknown)}"
+        if errors:
+            raise serializers.ValidationError(errors)
+        return Fieldset(fields, expand)
+
+
+class ResumeSearchResultSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True, help_text='Matching snippets, terms wrapped in <mark>.')
+
+    class Meta:
+        model = Resume
+        fields = ['id', 'title', 'slug', 'tags', 'language', 'visibility', 'last_modified', 'rank', 'headline']
+
+
+class RenderJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RenderJob
+        exclude = ['artifact']
+        read_only_fields = [field.name for field in RenderJob._meta.fields]
+
+
+class RenderRequestSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=RenderJob.FORMATS)
+    template = serializers.PrimaryKeyRelatedField(
+        queryset=ResumeTemplate.objects.filter(is_active=True), required=False,
+        help_text="Defaults to the resume's own template."
+    )
+
+
+def _split(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
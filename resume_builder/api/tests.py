@@ -1,19 +1,49 @@
+import asyncio
+import io
+import json
 import tempfile
+import threading
+import zipfile
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+import msgpack
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import F
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from resume_builder.api import async_api
+from resume_builder.api.renderers import ORJSONRenderer
+from resume_builder.rendering import pool
+from resume_builder.cache import technologies as technology_cache
+from resume_builder.completeness import COMPONENTS, score_updates
+from resume_builder.api.serializers import ResumeSerializer
+from resume_builder.forms import WorkExperienceForm
+from resume_builder.search import technology_matches
+from resume_builder.api.filters import (
+    ResumeFilter, ResumeSectionFilter, WorkExperienceFilter, TechnicalSkillFilter,
+    EducationFilter, ProjectFilter, CertificationFilter, AwardFilter, LanguageFilter
+)
 from django.contrib.auth import get_user_model
 from resume_builder.models import (
     ResumeTemplate, Resume, ResumeSection, WorkExperience,
     TechnicalSkill, Education, Technology, Project,
-    Certification, Award, Language
+    Certification, Award, Language, RenderJob, CacheVersion
 )
 
 User = get_user_model()
 
 
 def create_user():
-    return User.objects.create_user(email='test@example.com', password='testpass123')
+    return User.objects.create_user(email='test@example.com', username='test', password='testpass123')
 
 
 class ResumeTemplateTests(APITestCase):
@@ -309,3 +339,1067 @@ class LanguageTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+
+def create_resume_graph(user, index, template, technologies):
+    resume = Resume.objects.create(user=user, title=f'Resume {index}', slug=f'resume-{index}', template=template)
+    ResumeSection.objects.create(resume=resume, section_type='SUMMARY', title='Summary')
+    experience = WorkExperience.objects.create(resume=resume, job_title='Dev', company='Co', start_date='2020-01-01')
+    experience.technologies.set(technologies)
+    TechnicalSkill.objects.create(resume=resume, technology=technologies[0], proficiency=100)
+    Education.objects.create(resume=resume, degree='BSc', institution='Uni', start_date='2018-01-01',
+                             end_date='2022-01-01')
+    project = Project.objects.create(resume=resume, title='Project', role='Lead', start_date='2021-01-01',
+                                     description='Desc')
+    project.technologies.set(technologies)
+    certification = Certification.objects.create(resume=resume, name='Cert', issuer='Org', issue_date='2022-01-01')
+    certification.skills.set(technologies)
+    Award.objects.create(resume=resume, title='Award', issuer='Org', issue_date='2022-01-01',
+                         category='professional')
+    Language.objects.create(resume=resume, name='English', proficiency='native')
+    return resume
+
+
+class QueryCountTests(APITestCase):
+    """List endpoints must issue the same number of queries regardless of row count"""
+    endpoints = [
+        'resumetemplate-list', 'resume-list', 'resumesection-list', 'workexperience-list',
+        'technicalskill-list', 'education-list', 'technology-list', 'project-list',
+        'certification-list', 'award-list', 'language-list',
+    ]
+
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.technologies = [
+            Technology.objects.create(name='Python', category='LANG'),
+            Technology.objects.create(name='Django', category='FRAMEWORK'),
+        ]
+        self.index = 0
+        # Count steady-state queries, with the Technology cache already loaded
+        settings = override_settings(TECHNOLOGY_CACHE_TTL=3600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        technology_cache.all()
+
+    def add_resumes(self, count):
+        for _ in range(count):
+            self.index += 1
+            template = ResumeTemplate.objects.create(name=f'Template {self.index}', format_type='MODERN')
+            create_resume_graph(self.user, self.index, template, self.technologies)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context)
+
+    def test_list_endpoints_have_constant_query_count(self):
+        self.add_resumes(1)
+        baseline = {name: self.count_queries(reverse(name)) for name in self.endpoints}
+        self.add_resumes(5)
+        for name in self.endpoints:
+            with self.subTest(endpoint=name):
+                self.assertEqual(self.count_queries(reverse(name)), baseline[name])
+
+    def test_resume_detail_loads_graph_in_fixed_queries(self):
+        self.add_resumes(1)
+        resume = Resume.objects.get()
+        # version lookup + technology stamp + resume + 8 child relations + 3 M2M technology lookups
+        with self.assertNumQueries(14):
+            response = self.client.get(reverse('resume-detail', args=[resume.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['work_experiences'][0]['technologies']), 2)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.resume = Resume.objects.create(user=self.user, title='Test', slug='test')
+        self.url = reverse('workexperience-list')
+        # Duplicate start dates exercise the primary key tiebreaker
+        for index in range(7):
+            WorkExperience.objects.create(resume=self.resume, job_title=f'Dev {index}', company='Co',
+                                          start_date=f'2020-0{index % 3 + 1}-01')
+        self.expected = list(WorkExperience.objects.order_by('-start_date', '-id').values_list('id', flat=True))
+
+    def walk(self, url, link):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = [item['id'] for item in response.data['results']]
+            pages.append(page)
+            ids.extend(page)
+            url = response.data[link]
+        return ids, pages
+
+    def test_next_links_follow_model_ordering(self):
+        ids, pages = self.walk(f'{self.url}?page_size=3', 'next')
+        self.assertEqual(ids, self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+    def test_previous_links_walk_back(self):
+        response = self.client.get(f'{self.url}?page_size=3')
+        response = self.client.get(response.data['next'])
+        response = self.client.get(response.data['next'])
+        ids, pages = self.walk(response.data['previous'], 'previous')
+        self.assertEqual(pages, [self.expected[3:6], self.expected[0:3]])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(f'{self.url}?page_size=100000')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'{self.url}?cursor=bogus')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_related_field_ordering(self):
+        for name in ['Rust', 'Go', 'Python']:
+            technology = Technology.objects.create(name=name, category='LANG')
+            TechnicalSkill.objects.create(resume=self.resume, technology=technology, proficiency=80)
+        ids, _ = self.walk(f"{reverse('technicalskill-list')}?page_size=1", 'next')
+        names = [TechnicalSkill.objects.get(id=pk).technology.name for pk in ids]
+        self.assertEqual(names, ['Go', 'Python', 'Rust'])
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technologies = [Technology.objects.create(name='Python', category='LANG')]
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, template, technologies)
+        self.url = reverse('resume-list')
+
+    def test_fields_limit_output_and_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {'fields': 'id,title,slug,last_modified'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'slug', 'last_modified'})
+        self.assertEqual(len(context), 1)
+        self.assertNotIn('summary', context.captured_queries[0]['sql'])
+
+    def test_expand_prefetches_only_requested_relations(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'fields': 'id,title', 'expand': 'work_experiences'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'work_experiences'})
+        self.assertEqual(len(response.data['results'][0]['work_experiences'][0]['technologies']), 1)
+
+    def test_expand_without_fields_keeps_all_scalars(self):
+        response = self.client.get(reverse('resume-detail', args=[self.resume.id]), {'expand': 'awards'})
+        self.assertIn('summary', response.data)
+        self.assertIn('awards', response.data)
+        self.assertNotIn('projects', response.data)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.url, {'fields': 'title,password', 'expand': 'friends'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+        self.assertIn('expand', response.data)
+
+    def test_without_parameters_full_graph_is_returned(self):
+        response = self.client.get(self.url)
+        self.assertTrue(set(Resume.CHILD_RELATIONS) <= set(response.data['results'][0]))
+
+
+class FilterIndexTests(APITestCase):
+    """Each filter must be answerable from an index, never a sequential scan"""
+    cases = [
+        (ResumeFilter, {'visibility': 'PUBLIC'}),
+        (ResumeFilter, {'language': 'en'}),
+        (ResumeFilter, {'tags': 'python,django'}),
+        (ResumeFilter, {'template': '{template}'}),
+        (ResumeFilter, {'modified_since': '2024-01-01T00:00:00Z'}),
+        (ResumeFilter, {'completeness_below': 50}),
+        (ResumeSectionFilter, {'resume': '{resume}'}),
+        (WorkExperienceFilter, {'resume': '{resume}'}),
+        (WorkExperienceFilter, {'company': 'Co'}),
+        (WorkExperienceFilter, {'start_date__gte': '2020-01-01'}),
+        (WorkExperienceFilter, {'end_date__lte': '2020-01-01'}),
+        (TechnicalSkillFilter, {'technology': '{technology}'}),
+        (TechnicalSkillFilter, {'proficiency__gte': 80}),
+        (EducationFilter, {'resume': '{resume}'}),
+        (EducationFilter, {'end_date__gte': '2020-01-01'}),
+        (ProjectFilter, {'start_date__lte': '2020-01-01'}),
+        (CertificationFilter, {'issue_date__gte': '2020-01-01'}),
+        (AwardFilter, {'issue_date__gte': '2020-01-01'}),
+        (LanguageFilter, {'proficiency': 'native'}),
+    ]
+
+    def setUp(self):
+        self.user = create_user()
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        technology = Technology.objects.create(name='Python', category='LANG')
+        resume = create_resume_graph(self.user, 1, template, [technology])
+        self.ids = {'resume': resume.id, 'template': template.id, 'technology': technology.id}
+
+    def test_filters_use_indexes(self):
+        with connection.cursor() as cursor:
+            # Make a sequential scan the last resort so the plan reveals a missing index
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            for filterset_class, params in self.cases:
+                model = filterset_class._meta.model
+                with self.subTest(filterset=filterset_class.__name__, params=params):
+                    data = {key: str(value).format(**self.ids) for key, value in params.items()}
+                    filterset = filterset_class(data, queryset=model.objects.all())
+                    self.assertTrue(filterset.is_valid(), filterset.errors)
+                    # Without ORDER BY the planner cannot fall back to a full ordered index scan
+                    plan = filterset.qs.order_by().explain()
+                    self.assertNotIn(f'Seq Scan on {model._meta.db_table}', plan)
+                    self.assertIn('Index Cond', plan)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = on')
+
+    def test_filter_resumes_by_tags(self):
+        self.client.force_authenticate(self.user)
+        resume = Resume.objects.get()
+        resume.tags = ['python', 'django', 'aws']
+        resume.save()
+        Resume.objects.create(user=self.user, title='Other', slug='other', tags=['python'])
+        response = self.client.get(reverse('resume-list'), {'tags': 'django,python'})
+        self.assertEqual([item['id'] for item in response.data['results']], [resume.id])
+
+    def test_filter_work_experiences_by_date_range(self):
+        self.client.force_authenticate(self.user)
+        resume = Resume.objects.get()
+        WorkExperience.objects.create(resume=resume, job_title='Old', company='Co', start_date='2010-01-01')
+        response = self.client.get(reverse('workexperience-list'), {'start_date__lte': '2015-01-01'})
+        self.assertEqual([item['job_title'] for item in response.data['results']], ['Old'])
+
+
+class ResumeContentVersionTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.technology = Technology.objects.create(name='Python', category='LANG')
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, template, [self.technology])
+
+    def version(self):
+        return Resume.objects.values_list('content_version', flat=True).get(pk=self.resume.pk)
+
+    def assertBumps(self, change):
+        before = self.version()
+        change()
+        self.assertGreater(self.version(), before)
+
+    def test_child_changes_bump_version(self):
+        experience = WorkExperience.objects.get(resume=self.resume)
+        self.assertBumps(lambda: Award.objects.create(resume=self.resume, title='New', issuer='Org',
+                                                      issue_date='2023-01-01', category='academic'))
+        self.assertBumps(lambda: experience.save())
+        self.assertBumps(lambda: Language.objects.filter(resume=self.resume).get().delete())
+
+    def test_m2m_changes_bump_version(self):
+        experience = WorkExperience.objects.get(resume=self.resume)
+        django = Technology.objects.create(name='Django', category='FRAMEWORK')
+        self.assertBumps(lambda: experience.technologies.add(django))
+        self.assertBumps(lambda: django.projects.add(Project.objects.get(resume=self.resume)))
+        self.assertBumps(lambda: self.technology.certifications.clear())
+
+    def test_template_delete_bumps_version(self):
+        self.assertBumps(lambda: ResumeTemplate.objects.get().delete())
+        self.resume.refresh_from_db()
+        self.assertIsNone(self.resume.template)
+
+    def test_resume_save_bumps_version(self):
+        before = self.version()
+        self.resume.title = 'Renamed'
+        self.resume.save()
+        # The in-memory instance is refreshed with the stored version
+        self.assertEqual(self.resume.content_version, before + 1)
+        self.assertEqual(self.version(), before + 1)
+
+
+class ResumeCacheTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technology = Technology.objects.create(name='Python', category='LANG')
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, template, [technology])
+        self.url = reverse('resume-detail', args=[self.resume.id])
+
+    def test_cache_hit_skips_child_tables(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(first.data, second.data)
+
+    def test_child_change_invalidates_cached_payload(self):
+        self.client.get(self.url)
+        WorkExperience.objects.filter(resume=self.resume).get().delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['work_experiences'], [])
+
+    def test_missing_resume(self):
+        response = self.client.get(reverse('resume-detail', args=[self.resume.id + 1000]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technology = Technology.objects.create(name='Python', category='LANG')
+        self.template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, self.template, [technology])
+        self.url = reverse('resume-detail', args=[self.resume.id])
+
+    def test_resume_not_modified_after_single_lookup(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_resume_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_child_change_changes_resume_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        Award.objects.get(resume=self.resume).save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_stale_if_match_rejects_update(self):
+        etag = self.client.get(self.url)['ETag']
+        Language.objects.get(resume=self.resume).save()
+        response = self.client.patch(self.url, {'title': 'Renamed'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.title, 'Resume 1')
+
+    def test_matching_if_match_allows_update(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'title': 'Renamed'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+
+    def test_template_detail_and_list(self):
+        detail = reverse('resumetemplate-detail', args=[self.template.id])
+        etag = self.client.get(detail)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        url = reverse('resumetemplate-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.template.version = 2
+        self.template.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class BulkWriteTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.resume = Resume.objects.create(user=self.user, title='Test', slug='test')
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.django = Technology.objects.create(name='Django', category='FRAMEWORK')
+        self.url = reverse('workexperience-bulk')
+
+    def test_bulk_create_with_technologies(self):
+        items = [
+            {'job_title': f'Dev {index}', 'company': 'Co', 'start_date': '2020-01-01',
+             'technologies': [self.python.id, self.django.id]}
+            for index in range(40)
+        ]
+        # resume + technologies + savepoint + insert + M2M insert + version bump + release
+        # + reload (rows, M2M), independent of the number of items
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, {'resume': self.resume.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['job_title'] for item in response.data], [item['job_title'] for item in items])
+        self.assertEqual(WorkExperience.technologies.through.objects.count(), 80)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.content_version, 2)
+
+    def test_errors_are_reported_per_item(self):
+        items = [
+            {'degree': 'BSc', 'institution': 'Uni', 'start_date': '2018-01-01', 'end_date': '2022-01-01'},
+            {'degree': 'MSc', 'institution': 'Uni', 'start_date': '2022-01-01', 'end_date': '2021-01-01'},
+            {'institution': 'Uni', 'start_date': '2018-01-01', 'end_date': '2022-01-01'},
+        ]
+        response = self.client.post(reverse('education-bulk'), {'resume': self.resume.id, 'items': items},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['items']
+        self.assertEqual(errors[0], {})
+        self.assertIn('end_date', errors[1])
+        self.assertIn('degree', errors[2])
+        self.assertFalse(Education.objects.exists())
+
+    def test_unique_together_is_enforced(self):
+        TechnicalSkill.objects.create(resume=self.resume, technology=self.python, proficiency=80)
+        items = [
+            {'technology': self.python.id, 'proficiency': 60},
+            {'technology': self.django.id, 'proficiency': 60},
+            {'technology': self.django.id, 'proficiency': 80},
+        ]
+        response = self.client.post(reverse('technicalskill-bulk'), {'resume': self.resume.id, 'items': items},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data['items']
+        self.assertIn('non_field_errors', errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn('non_field_errors', errors[2])
+
+    def test_bulk_update_and_delete(self):
+        experiences = [
+            WorkExperience.objects.create(resume=self.resume, job_title=f'Dev {index}', company='Co',
+                                          start_date='2020-01-01')
+            for index in range(3)
+        ]
+        items = [{'id': experience.id, 'company': 'NewCo', 'technologies': [self.python.id]}
+                 for experience in experiences]
+        items.append({'id': 0, 'company': 'Nope'})
+        response = self.client.patch(self.url, {'resume': self.resume.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('id', response.data['items'][3])
+
+        response = self.client.patch(self.url, {'resume': self.resume.id, 'items': items[:3]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({item['company'] for item in response.data}, {'NewCo'})
+        self.assertEqual([item['technologies'] for item in response.data], [[self.python.id]] * 3)
+
+        version = Resume.objects.get().content_version
+        ids = [experience.id for experience in experiences]
+        response = self.client.delete(self.url, {'resume': self.resume.id, 'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(WorkExperience.objects.exists())
+        self.assertEqual(Resume.objects.get().content_version, version + 1)
+
+    def test_other_users_resume_is_rejected(self):
+        other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        resume = Resume.objects.create(user=other, title='Theirs', slug='theirs')
+        items = [{'name': 'English', 'proficiency': 'native'}]
+        response = self.client.post(reverse('language-bulk'), {'resume': resume.id, 'items': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('resume', response.data)
+
+
+class RendererTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technology = Technology.objects.create(name='Python', category='LANG')
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, template, [technology])
+        Education.objects.filter(resume=self.resume).update(gpa='3.5')
+        self.url = reverse('resume-detail', args=[self.resume.id])
+
+    def test_orjson_matches_stdlib_renderer(self):
+        data = ResumeSerializer(Resume.objects.with_graph().get()).data
+        data['note'] = 'line\u2028separator'
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_msgpack_negotiation(self):
+        expected = self.client.get(self.url).json()
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), expected)
+
+    def test_msgpack_request_body(self):
+        body = msgpack.packb({'resume': self.resume.id, 'items': [{'name': 'German', 'proficiency': 'fluent'}]})
+        response = self.client.generic('POST', reverse('language-bulk'), body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Language.objects.filter(name='German').exists())
+
+
+class RenderJobTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technology = Technology.objects.create(name='Python', category='LANG')
+        self.template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, self.template, [technology])
+        self.url = reverse('resume-renders', args=[self.resume.id])
+        artifacts = tempfile.TemporaryDirectory()
+        self.addCleanup(artifacts.cleanup)
+        settings = override_settings(RESUME_RENDER_EAGER=True, RESUME_ARTIFACT_ROOT=artifacts.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def download(self, job_id):
+        response = self.client.get(reverse('renderjob-download', args=[job_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content)
+
+    def test_render_pdf_and_docx(self):
+        response = self.client.post(self.url, {'format': 'PDF'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'DONE')
+        self.assertTrue(self.download(response.data['id']).startswith(b'%PDF'))
+
+        response = self.client.post(self.url, {'format': 'DOCX', 'template': self.template.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.download(response.data['id']).startswith(b'PK'))
+
+    def test_artifact_is_reused_until_content_changes(self):
+        first = self.client.post(self.url, {'format': 'PDF'}, format='json').data
+        second = self.client.post(self.url, {'format': 'PDF'}, format='json').data
+        self.assertEqual(first['id'], second['id'])
+        self.assertEqual(RenderJob.objects.count(), 1)
+
+        Language.objects.create(resume=self.resume, name='German', proficiency='fluent')
+        third = self.client.post(self.url, {'format': 'PDF'}, format='json').data
+        self.assertNotEqual(third['id'], first['id'])
+        self.assertEqual(third['content_version'], Resume.objects.get().content_version)
+
+    def test_pending_job_is_returned_without_loading_the_resume(self):
+        version = Resume.objects.get().content_version
+        job = RenderJob.objects.create(resume=self.resume, template=self.template, format='PDF',
+                                       content_version=version, template_version=self.template.version)
+        caches['resumes'].clear()
+        # resume validators + its template + content version + job lookup; no graph, no serializer
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, {'format': 'PDF'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['id'], job.id)
+
+    def test_stale_pending_job_is_resubmitted(self):
+        version = Resume.objects.get().content_version
+        job = RenderJob.objects.create(resume=self.resume, template=self.template, format='PDF',
+                                       content_version=version, template_version=self.template.version)
+        # Its submission was lost with the worker
+        RenderJob.objects.filter(pk=job.pk).update(submitted_at=timezone.now() - timedelta(hours=1))
+        response = self.client.post(self.url, {'format': 'PDF'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], job.id)
+        self.assertEqual(response.data['status'], 'DONE')
+
+    def test_pending_download_is_accepted(self):
+        job = RenderJob.objects.create(resume=self.resume, template=self.template, format='PDF',
+                                       content_version=1, template_version=1)
+        response = self.client.get(reverse('renderjob-download', args=[job.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn('Retry-After', response)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        technology = Technology.objects.create(name='Python', category='LANG')
+        template = ResumeTemplate.objects.create(name='Classic', format_type='CLASSIC')
+        self.resumes = [create_resume_graph(self.user, index, template, [technology]) for index in range(3)]
+        Resume.objects.filter(pk=self.resumes[0].pk).update(visibility='PUBLIC')
+        self.url = reverse('resume-export')
+        artifacts = tempfile.TemporaryDirectory()
+        self.addCleanup(artifacts.cleanup)
+        settings = override_settings(RESUME_ARTIFACT_ROOT=artifacts.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get_archive(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_json_export(self):
+        archive = self.get_archive({})
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(sorted(archive.namelist()), ['resume-0.json', 'resume-1.json', 'resume-2.json'])
+        data = json.loads(archive.read('resume-1.json'))
+        self.assertEqual(data['title'], 'Resume 1')
+        self.assertEqual(len(data['work_experiences']), 1)
+
+    def test_export_applies_filters(self):
+        archive = self.get_archive({'visibility': 'PUBLIC'})
+        self.assertEqual(archive.namelist(), ['resume-0.json'])
+
+    @override_settings(RESUME_RENDER_EAGER=True)
+    def test_document_export(self):
+        Resume.objects.filter(pk=self.resumes[2].pk).update(template=None)
+        archive = self.get_archive({'type': 'pdf'})
+        self.assertEqual(sorted(archive.namelist()), ['resume-0.pdf', 'resume-1.pdf', 'skipped.txt'])
+        self.assertTrue(archive.read('resume-0.pdf').startswith(b'%PDF'))
+        self.assertIn(b'resume-2', archive.read('skipped.txt'))
+
+    def test_missing_documents_are_queued_not_rendered_in_the_request(self):
+        with mock.patch('resume_builder.rendering.pool.submit', side_effect=[None, pool.PoolFull]) as submit:
+            archive = self.get_archive({'type': 'pdf'})
+        self.assertEqual(archive.namelist(), ['skipped.txt'])
+        skipped = archive.read('skipped.txt').decode()
+        self.assertIn('not rendered yet', skipped)
+        self.assertTrue(all(f'resume-{index}' in skipped for index in range(3)))
+        # Once the queue is full, the rest of the export stops submitting
+        self.assertEqual(submit.call_count, 2)
+        self.assertEqual(list(RenderJob.objects.order_by('resume_id').values_list('status', flat=True)),
+                         ['PENDING', 'FAILED'])
+
+    def test_invalid_type(self):
+        response = self.client.get(self.url, {'type': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('resume-search')
+        self.titled = Resume.objects.create(user=self.user, title='Kubernetes Engineer', slug='titled')
+        self.described = Resume.objects.create(user=self.user, title='Backend Developer', slug='described')
+        WorkExperience.objects.create(resume=self.described, job_title='Developer', company='Co',
+                                      start_date='2020-01-01', description='Ran kubernetes clusters in production.')
+        Resume.objects.create(user=self.user, title='Designer', slug='designer', summary='Figma and typography')
+
+    def test_ranked_hits_with_headlines(self):
+        response = self.client.get(self.url, {'q': 'kubernetes'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([hit['id'] for hit in results], [self.titled.id, self.described.id])
+        self.assertGreater(results[0]['rank'], results[1]['rank'])
+        self.assertIn('<mark>kubernetes</mark>', results[1]['headline'])
+
+    def test_index_follows_child_and_resume_changes(self):
+        self.assertEqual(self.client.get(self.url, {'q': 'terraform'}).data['results'], [])
+        project = Project.objects.create(resume=self.described, title='Infra', role='Lead',
+                                         start_date='2021-01-01', description='Terraform modules')
+        response = self.client.get(self.url, {'q': 'terraform'})
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.described.id])
+
+        project.delete()
+        self.assertEqual(self.client.get(self.url, {'q': 'terraform'}).data['results'], [])
+
+        self.described.summary = 'Terraform enthusiast'
+        self.described.save()
+        response = self.client.get(self.url, {'q': 'terraform'})
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.described.id])
+
+    def test_only_text_bearing_children_reindex(self):
+        def resume_updates(change):
+            with CaptureQueriesContext(connection) as queries:
+                change()
+            return [query['sql'] for query in queries if query['sql'].startswith('UPDATE "resume_builder_resume"')]
+
+        python = Technology.objects.create(name='Python', category='LANG')
+        updates = resume_updates(lambda: TechnicalSkill.objects.create(
+            resume=self.described, technology=python, proficiency=80))
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('search_vector', updates[0])
+        updates = resume_updates(lambda: Language.objects.create(resume=self.described, name='German',
+                                                                 proficiency='fluent'))
+        self.assertNotIn('search_vector', updates[0])
+        updates = resume_updates(lambda: Award.objects.create(resume=self.described, title='Terraform award',
+                                                              issuer='HashiCorp', issue_date='2022-01-01'))
+        self.assertIn('search_vector', updates[0])
+        response = self.client.get(self.url, {'q': 'terraform'})
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.described.id])
+
+    def test_pagination_and_filters(self):
+        response = self.client.get(self.url, {'q': 'kubernetes', 'page_size': 1})
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.titled.id])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.described.id])
+        self.assertIsNone(response.data['next'])
+
+        Resume.objects.filter(pk=self.described.pk).update(visibility='PUBLIC')
+        response = self.client.get(self.url, {'q': 'kubernetes', 'visibility': 'PUBLIC'})
+        self.assertEqual([hit['id'] for hit in response.data['results']], [self.described.id])
+
+    def test_query_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_uses_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = Resume.objects.filter(search_vector='kubernetes').order_by().explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = on')
+        self.assertIn('Bitmap Index Scan', plan)
+
+
+class TechnologyAutocompleteTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('technology-autocomplete')
+        names = [
+            ('Python', 'LANG'), ('PyTorch', 'FRAMEWORK'), ('Jython', 'LANG'), ('React', 'FRAMEWORK'),
+            ('React Native', 'FRAMEWORK'), ('PostgreSQL', 'DB'), ('Docker', 'TOOL'),
+        ]
+        self.technologies = {name: Technology.objects.create(name=name, category=category)
+                             for name, category in names}
+
+    def names(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in response.data['results']]
+
+    def test_prefix_matches_come_first(self):
+        names = self.names({'q': 'py'})
+        self.assertEqual(names[:2], ['PyTorch', 'Python'])
+        self.assertNotIn('Docker', names)
+
+    def test_fuzzy_match(self):
+        self.assertIn('PostgreSQL', self.names({'q': 'postgress'}))
+        self.assertEqual(self.names({'q': 'native'}), ['React Native'])
+
+    def test_category_and_paging(self):
+        self.assertEqual(self.names({'q': 'py', 'category': 'FRAMEWORK'}), ['PyTorch'])
+        response = self.client.get(self.url, {'q': 'react', 'limit': 1})
+        self.assertEqual([item['name'] for item in response.data['results']], ['React'])
+        self.assertTrue(response.data['more'])
+        response = self.client.get(self.url, {'q': 'react', 'limit': 1, 'offset': 1})
+        self.assertEqual([item['name'] for item in response.data['results']], ['React Native'])
+        self.assertFalse(response.data['more'])
+        self.assertEqual(self.client.get(self.url, {'category': 'NOPE'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_lookup_uses_trigram_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = technology_matches('py').explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = on')
+        self.assertIn('technology_upper_name_trgm', plan)
+        self.assertIn('technology_name_trgm', plan)
+
+    def test_form_renders_only_selected_technologies(self):
+        resume = Resume.objects.create(user=self.user, title='Resume', slug='resume')
+        experience = WorkExperience.objects.create(resume=resume, job_title='Dev', company='Co',
+                                                   start_date='2020-01-01')
+        experience.technologies.set([self.technologies['Docker']])
+        form = WorkExperienceForm(instance=experience)
+        html = str(form['technologies'])
+        self.assertIn('Docker', html)
+        self.assertNotIn('Python', html)
+        self.assertIn('data-autocomplete-url', html)
+
+
+class TechnologyCacheTests(APITestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.python = Technology.objects.create(name='Python', category='LANG', icon='bi-python')
+        settings = override_settings(TECHNOLOGY_CACHE_TTL=3600)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_lookups_are_served_from_memory(self):
+        technology_cache.all()
+        with self.assertNumQueries(0):
+            self.assertEqual(technology_cache.get(self.python.id).name, 'Python')
+            self.assertEqual(technology_cache.get_by_name('python').id, self.python.id)
+            self.assertIsNone(technology_cache.get(0))
+
+    def test_local_writes_invalidate_immediately(self):
+        technology_cache.all()
+        rust = Technology.objects.create(name='Rust', category='LANG')
+        self.assertEqual(technology_cache.get(rust.id).name, 'Rust')
+        rust.delete()
+        self.assertIsNone(technology_cache.get_by_name('Rust'))
+
+    def test_other_workers_writes_are_seen_after_ttl(self):
+        technology_cache.all()
+        # A write from another worker: no local signal, only the version stamp moves
+        go = Technology.objects.bulk_create([Technology(name='Go', category='LANG')])[0]
+        CacheVersion.objects.filter(name='resume_builder.Technology').update(version=F('version') + 1)
+        self.assertIsNone(technology_cache.get(go.id))
+        with override_settings(TECHNOLOGY_CACHE_TTL=0):
+            self.assertEqual(technology_cache.get(go.id).name, 'Go')
+
+    def test_skill_serializer_resolves_name_and_icon(self):
+        resume = Resume.objects.create(user=self.user, title='Resume', slug='resume')
+        TechnicalSkill.objects.create(resume=resume, technology=self.python, proficiency=80)
+        response = self.client.get(reverse('technicalskill-list'))
+        self.assertEqual(response.data['results'][0]['technology_name'], 'Python')
+        self.assertEqual(response.data['results'][0]['technology_icon'], 'bi-python')
+
+    def test_rename_invalidates_cached_resumes(self):
+        resume = Resume.objects.create(user=self.user, title='Resume', slug='resume')
+        TechnicalSkill.objects.create(resume=resume, technology=self.python, proficiency=80)
+        url = reverse('resume-detail', args=[resume.id])
+        self.assertEqual(self.client.get(url).data['technical_skills'][0]['technology_name'], 'Python')
+        self.python.name = 'CPython'
+        self.python.save()
+        self.assertEqual(self.client.get(url).data['technical_skills'][0]['technology_name'], 'CPython')
+
+    def test_payloads_are_not_cached_with_names_older_than_their_version(self):
+        resume = Resume.objects.create(user=self.user, title='Resume', slug='resume')
+        TechnicalSkill.objects.create(resume=resume, technology=self.python, proficiency=80)
+        technology_cache.all()
+        # A rename by another worker: this one only sees the stamps it writes
+        Technology.objects.filter(pk=self.python.pk).update(name='CPython')
+        CacheVersion.objects.filter(name='resume_builder.Technology').update(version=F('version') + 1)
+        Resume.objects.filter(pk=resume.pk).update(content_version=F('content_version') + 1)
+        url = reverse('resume-detail', args=[resume.id])
+        self.assertEqual(self.client.get(url).data['technical_skills'][0]['technology_name'], 'CPython')
+
+    def test_rename_bumps_resumes_using_it_through_records(self):
+        # Rendered documents print the technologies of experiences, projects and certifications
+        experience_only, certification_only, unrelated = (
+            Resume.objects.create(user=self.user, title=title, slug=title) for title in ['a', 'b', 'c']
+        )
+        WorkExperience.objects.create(resume=experience_only, job_title='Dev', company='Co',
+                                      start_date='2020-01-01').technologies.add(self.python)
+        Certification.objects.create(resume=certification_only, name='PCEP', issuer='PI',
+                                     issue_date='2020-01-01').skills.add(self.python)
+        versions = dict(Resume.objects.values_list('id', 'content_version'))
+        self.python.name = 'CPython'
+        self.python.save()
+        bumped = {pk for pk, version in Resume.objects.values_list('id', 'content_version') if version != versions[pk]}
+        self.assertEqual(bumped, {experience_only.pk, certification_only.pk})
+        self.assertNotIn(unrelated.pk, bumped)
+
+    def test_delete_changes_etag_of_resumes_using_it_through_records(self):
+        resume = Resume.objects.create(user=self.user, title='Resume', slug='resume')
+        WorkExperience.objects.create(resume=resume, job_title='Dev', company='Co',
+                                      start_date='2020-01-01').technologies.add(self.python)
+        url = reverse('resume-detail', args=[resume.id])
+        etag = self.client.get(url)['ETag']
+        self.python.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['work_experiences'][0]['technologies'], [])
+
+
+class CompletenessTests(APITestCase):
+    def setUp(self):
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = Resume.objects.create(user=self.user, title='Resume', slug='resume', summary='Engineer')
+
+    def scores(self):
+        return Resume.objects.values(
+            'completeness', *(f'completeness_{name}' for name in ['profile', *COMPONENTS])
+        ).get(pk=self.resume.pk)
+
+    def test_new_resume_scores_its_own_columns(self):
+        self.assertEqual(self.scores()['completeness_profile'], 60)
+        self.assertEqual(self.scores()['completeness'], 6)
+        self.resume.tags = ['python']
+        self.resume.template = self.template
+        self.resume.save()
+        self.assertEqual(self.resume.completeness, 10)
+
+    def test_child_changes_rescore_only_their_component(self):
+        experience = WorkExperience.objects.create(resume=self.resume, job_title='Dev', company='Co',
+                                                   start_date='2020-01-01', achievements=['Shipped'])
+        WorkExperience.objects.create(resume=self.resume, job_title='Intern', company='Co', start_date='2019-01-01')
+        for section_type in ['SUMMARY', 'EXPERIENCE', 'CUSTOM']:
+            ResumeSection.objects.create(resume=self.resume, section_type=section_type, title=section_type)
+        Language.objects.create(resume=self.resume, name='English', proficiency='native')
+        scores = self.scores()
+        self.assertEqual(scores['completeness_experience'], 70)
+        self.assertEqual(scores['completeness_sections'], 33)
+        self.assertEqual(scores['completeness_languages'], 100)
+        self.assertEqual(scores['completeness_skills'], 0)
+        self.assertEqual(scores['completeness'], (60 * 10 + 33 * 15 + 70 * 25 + 100 * 5) // 100)
+
+        experience.delete()
+        self.assertEqual(self.scores()['completeness_experience'], 40)
+
+        # Rescoring everything from scratch agrees with the incremental updates
+        before = self.scores()
+        Resume.objects.update(**score_updates(COMPONENTS))
+        self.assertEqual(self.scores(), before)
+
+    def test_bulk_writes_rescore_in_the_version_bump(self):
+        items = [{'job_title': 'Dev', 'company': 'Co', 'start_date': '2020-01-01', 'achievements': ['Shipped']}]
+        response = self.client.post(reverse('workexperience-bulk'), {'resume': self.resume.id, 'items': items},
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.scores()['completeness_experience'], 100)
+        self.client.delete(reverse('workexperience-bulk'), {'resume': self.resume.id, 'ids': [response.data[0]['id']]},
+                           format='json')
+        self.assertEqual(self.scores()['completeness_experience'], 0)
+
+    def test_incomplete_resumes_least_complete_first(self):
+        empty = Resume.objects.create(user=self.user, title='Empty', slug='empty')
+        Education.objects.create(resume=self.resume, degree='BSc', institution='Uni',
+                                 start_date='2010-01-01', end_date='2014-01-01')
+        response = self.client.get(reverse('resume-incomplete'))
+        self.assertEqual([item['id'] for item in response.data['results']], [empty.id, self.resume.id])
+        self.assertEqual([item['completeness'] for item in response.data['results']], [0, 16])
+        response = self.client.get(reverse('resume-incomplete'), {'completeness_below': 10})
+        self.assertEqual([item['id'] for item in response.data['results']], [empty.id])
+
+
+class AsyncReadTests(APITestCase):
+    """The async read endpoints answer exactly like the sync viewsets they wrap"""
+
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        self.client.force_authenticate(self.user)
+        self.technologies = [
+            Technology.objects.create(name='Python', category='LANG'),
+            Technology.objects.create(name='Django', category='FRAMEWORK'),
+        ]
+        self.template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resumes = [create_resume_graph(self.user, index, self.template, self.technologies) for index in (1, 2)]
+
+    def get_both(self, name, args=(), **params):
+        sync = self.client.get(reverse(name, args=args), params)
+        response = self.client.get(reverse(f'async-{name}', args=args), params)
+        return sync, response
+
+    def assertSameAsSync(self, name, args=(), **params):
+        sync, response = self.get_both(name, args, **params)
+        self.assertEqual(response.status_code, sync.status_code)
+        # Only the paths of the pagination links differ
+        content = response.content.decode().replace('/api/v1/async/', '/api/v1/')
+        self.assertEqual(json.loads(content), json.loads(sync.content))
+        return response
+
+    def test_responses_match_sync_endpoints(self):
+        resume, technology = self.resumes[0], self.technologies[0]
+        cases = [
+            ('resume-list', (), {}),
+            ('resume-list', (), {'page_size': 1}),
+            ('resume-list', (), {'fields': 'title,completeness', 'expand': 'technical_skills,projects'}),
+            ('resume-list', (), {'completeness_below': 'many'}),
+            ('resume-list', (), {'fields': 'nope'}),
+            ('resume-detail', (resume.id,), {}),
+            ('resume-detail', (resume.id,), {'fields': 'title', 'expand': 'work_experiences'}),
+            ('resume-detail', (0,), {}),
+            ('resumetemplate-list', (), {}),
+            ('resumetemplate-detail', (self.template.id,), {}),
+            ('technology-list', (), {}),
+            ('technology-detail', (technology.id,), {}),
+            ('technology-detail', (0,), {}),
+        ]
+        for name, args, params in cases:
+            with self.subTest(endpoint=name, params=params):
+                self.assertSameAsSync(name, args, **params)
+        response = self.assertSameAsSync('resume-list', page_size=1)
+        self.assertSameAsSync('resume-list', cursor=response.data['next'].split('cursor=')[1].split('&')[0])
+
+    def test_authentication_matches_sync_endpoints(self):
+        self.client.force_authenticate(None)
+        sync, response = self.get_both('resume-list')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], sync['WWW-Authenticate'])
+
+    def test_resume_detail_reads_graph_in_fixed_queries(self):
+        url = reverse('async-resume-detail', args=[self.resumes[0].id])
+        technology_cache.all()
+        with override_settings(TECHNOLOGY_CACHE_TTL=3600):
+            # version lookup + technology stamp + resume + 8 child relations + 3 M2M technology lookups
+            with self.assertNumQueries(14):
+                response = self.client.get(url)
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get(url)['ETag'], response['ETag'])
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_template_list_validators(self):
+        url = reverse('async-resumetemplate-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_content_negotiation(self):
+        response = self.client.get(reverse('async-technology-list'), HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['results'][0]['name'], 'Django')
+
+    async def test_async_client_with_token(self):
+        response = await AsyncClient().get(
+            reverse('async-resume-list'), headers={'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(response.data['results'][0]['work_experiences'][0]['technologies']), 2)
+
+
+@skipUnless(settings.DATABASE_POOL, 'Connection pooling is off (DATABASE_POOL=False)')
+class AsyncConcurrentRelationsTests(TransactionTestCase):
+    def setUp(self):
+        caches['resumes'].clear()
+        self.user = create_user()
+        technologies = [Technology.objects.create(name='Python', category='LANG')]
+        template = ResumeTemplate.objects.create(name='Modern', format_type='MODERN')
+        self.resume = create_resume_graph(self.user, 1, template, technologies)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self):
+        """The async detail response, and the threads relations were fetched on"""
+        threads = []
+        fetch_on_own_connection = async_api.fetch_on_own_connection
+
+        def fetch(querysets):
+            threads.append(threading.get_ident())
+            return fetch_on_own_connection(querysets)
+
+        with mock.patch.object(async_api, 'fetch_on_own_connection', fetch):
+            response = self.client.get(reverse('async-resume-detail', args=[self.resume.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, ResumeSerializer(Resume.objects.with_graph().get()).data)
+        return response, threads
+
+    @override_settings(ASYNC_RELATION_FETCHES=4, DATABASE_POOL_MAX_SIZE=10)
+    def test_relations_are_fetched_concurrently_on_their_own_connections(self):
+        pool = connection.pool
+        response, threads = self.get()
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threading.get_ident(), threads)
+        # Every connection went back to the pool, once the test's own is
+        connection.close()
+        stats = pool.get_stats()
+        self.assertEqual(stats['pool_size'] - stats['pool_available'], 0)
+        self.assertEqual(async_api._fetch_slots_used, 0)
+
+    @override_settings(DATABASE_POOL_MAX_SIZE=4)
+    def test_requests_take_turns_at_the_database(self):
+        reading, most = 0, 0
+
+        async def request():
+            nonlocal reading, most
+            async with async_api.DatabaseTurn() as turn:
+                reading += 1
+                most = max(most, reading)
+                await asyncio.sleep(0.01)
+                reading -= 1
+                await turn.end()
+                # Serializing after the turn does not count against it
+                await asyncio.sleep(0.01)
+
+        async def requests():
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        asyncio.run(requests())
+        # Half the pool; the fetch connections take the other half
+        self.assertEqual(most, 2)
+
+    @override_settings(ASYNC_RELATION_FETCHES=4, DATABASE_POOL_MAX_SIZE=10)
+    def test_requests_beyond_the_budget_read_on_their_own_connection(self):
+        # Other requests hold four of the five connections lent out for fetching
+        self.assertEqual(async_api.acquire_fetch_slots(4), 4)
+        try:
+            response, threads = self.get()
+            self.assertEqual(threads, [])
+        finally:
+            async_api.release_fetch_slots(4)
@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from resume_builder.api.async_api import AsyncResumeTemplateView, AsyncResumeView, AsyncTechnologyView
 from resume_builder.api.api import (
     ResumeTemplateViewSet, ResumeViewSet, ResumeSectionViewSet,
     WorkExperienceViewSet, TechnicalSkillViewSet, EducationViewSet,
     TechnologyViewSet, ProjectViewSet, CertificationViewSet,
-    AwardViewSet, LanguageViewSet
+    AwardViewSet, LanguageViewSet, RenderJobViewSet
 )
 
 router = DefaultRouter()
@@ -20,7 +21,15 @@ router.register(r'projects', ProjectViewSet)
 router.register(r'certifications', CertificationViewSet)
 router.register(r'awards', AwardViewSet)
 router.register(r'languages', LanguageViewSet)
+router.register(r'render-jobs', RenderJobViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    # Async read endpoints, for ASGI deployments
+    path('async/resume-templates/', AsyncResumeTemplateView.as_view(), name='async-resumetemplate-list'),
+    path('async/resume-templates/<int:pk>/', AsyncResumeTemplateView.as_view(), name='async-resumetemplate-detail'),
+    path('async/resumes/', AsyncResumeView.as_view(), name='async-resume-list'),
+    path('async/resumes/<int:pk>/', AsyncResumeView.as_view(), name='async-resume-detail'),
+    path('async/technologies/', AsyncTechnologyView.as_view(), name='async-technology-list'),
+    path('async/technologies/<int:pk>/', AsyncTechnologyView.as_view(), name='async-technology-detail'),
 ]
\ No newline at end of file
@@ -0,0 +1,117 @@
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models
+
+RESUME_CACHE = 'resumes'
+
+
+def payload_key(resume_id, content_version):
+    return f'resume:{resume_id}:v{content_version}'
+
+
+def get_payload(resume_id, content_version):
+    """Return the cached serialized resume for this content version, if any"""
+    return caches[RESUME_CACHE].get(payload_key(resume_id, content_version))
+
+
+def get_payloads(versions):
+    """Cached payloads of ``{resume_id: content_version}``, keyed by resume id, in one cache round trip"""
+    keys = {payload_key(pk, version): pk for pk, version in versions.items()}
+    return {keys[key]: payload for key, payload in caches[RESUME_CACHE].get_many(keys).items()}
+
+
+def set_payload(resume_id, content_version, payload):
+    # Keys are versioned, so stale payloads are never served; they simply age
+    # out of the cache through its TTL/LRU eviction.
+    caches[RESUME_CACHE].set(payload_key(resume_id, content_version), payload)
+
+
+async def aget_payload(resume_id, content_version):
+    return await caches[RESUME_CACHE].aget(payload_key(resume_id, content_version))
+
+
+async def aset_payload(resume_id, content_version, payload):
+    await caches[RESUME_CACHE].aset(payload_key(resume_id, content_version), payload)
+
+
+class ReferenceCache:
+    """
+    Process-local copy of a small, read-mostly table, keyed by id and by name.
+
+    The table is loaded on first use. Writers call ``bump()``, which increments
+    a version stamp in the database (CacheVersion) and drops the local copy;
+    other workers compare the stamp at most every ``ttl`` seconds and reload
+    when it changed, so a write is visible everywhere within ``ttl``.
+
+    Whatever outlives that window, such as resume payloads cached under a
+    content version, is built after ``revalidate()``: the writer bumps the
+    stamp before the content versions, so a worker that read the new content
+    version also sees the new stamp.
+    """
+
+    def __init__(self, model_label, ttl_setting, default_ttl=5):
+        self.model_label = model_label
+        self.ttl_setting = ttl_setting
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._state = None  # (version, checked_at, by_id, by_name)
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get(self, pk):
+        return self._load()[2].get(pk)
+
+    def get_by_name(self, name):
+        pk = self._load()[3].get(name.casefold())
+        return None if pk is None else self.get(pk)
+
+    def all(self):
+        """Every row, in the model's default ordering"""
+        return list(self._load()[2].values())
+
+    def revalidate(self):
+        """Compare the version stamp now rather than once ``ttl`` has passed"""
+        self._load(ttl=0)
+
+    def invalidate(self):
+        with self._lock:
+            self._state = None
+
+    def bump(self):
+        CacheVersion = apps.get_model('resume_builder.CacheVersion')
+        updated = CacheVersion.objects.filter(name=self.model_label).update(version=models.F('version') + 1)
+        if not updated:
+            CacheVersion.objects.get_or_create(name=self.model_label, defaults={'version': 1})
+        self.invalidate()
+
+    def _load(self, ttl=None):
+        state = self._state
+        now = time.monotonic()
+        if ttl is None:
+            ttl = getattr(settings, self.ttl_setting, self.default_ttl)
+        if state is not None and now - state[1] < ttl:
+            return state
+        with self._lock:
+            if self._state is not None and now - self._state[1] < ttl:
+                return self._state
+            version = self._version()
+            if self._state is not None and self._state[0] == version:
+                self._state = (version, now, *self._state[2:])
+            else:
+                by_id = {obj.pk: obj for obj in self.model.objects.all()}
+                by_name = {obj.name.casefold(): pk for pk, obj in by_id.items()}
+                self._state = (version, now, by_id, by_name)
+            return self._state
+
+    def _version(self):
+        CacheVersion = apps.get_model('resume_builder.CacheVersion')
+        return CacheVersion.objects.filter(name=self.model_label).values_list('version', flat=True).first() or 0
+
+
+technologies = ReferenceCache('resume_builder.Technology', 'TECHNOLOGY_CACHE_TTL')
@@ -0,0 +1,75 @@
+"""
+Resume completeness scoring.
+
+Every component is scored 0-100 into its own ``Resume.completeness_<name>``
+column and ``Resume.completeness`` is a stored generated column weighting them
+(``COMPLETENESS_WEIGHTS``), so filtering and sorting by completeness is an
+index scan. A change to a child model only rescores that model's component,
+in the same UPDATE that bumps the resume's content version.
+"""
+from django.db import models
+from django.db.models.functions import Coalesce
+
+from resume_builder.models import (
+    Award, Certification, Education, Language, Project, ResumeSection, TechnicalSkill, WorkExperience
+)
+
+# Section types a complete resume has; CUSTOM sections are optional
+EXPECTED_SECTIONS = [value for value, _ in ResumeSection.SECTION_TYPES if value != 'CUSTOM']
+
+
+def profile_score(resume):
+    """Score of the resume's own columns; computed in Python as it changes with the row itself"""
+    return 60 * bool(resume.summary.strip()) + 20 * bool(resume.tags) + 20 * (resume.template_id is not None)
+
+
+def _aggregate(model, score):
+    """``score`` aggregated over the resume's ``model`` rows (0 without rows), as a correlated subquery"""
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(resume=models.OuterRef('pk')).order_by().values('resume')
+            .annotate(score=models.ExpressionWrapper(score, output_field=models.IntegerField()))
+            .values('score')
+        ),
+        0,
+    )
+
+
+def _share(condition, base=40):
+    """``base`` for having any rows plus the rest scaled by the share of rows matching ``condition``"""
+    return base + (100 - base) * models.Count('pk', filter=condition) / models.Count('pk')
+
+
+def _present(model):
+    """100 if the resume has any ``model`` row"""
+    return models.Case(
+        models.When(models.Exists(model.objects.filter(resume=models.OuterRef('pk'))), then=100),
+        default=0,
+    )
+
+
+COMPONENTS = {
+    'sections': (ResumeSection, lambda: _aggregate(ResumeSection, models.Count(
+        'section_type', distinct=True, filter=models.Q(section_type__in=EXPECTED_SECTIONS)
+    ) * 100 / len(EXPECTED_SECTIONS))),
+    'experience': (WorkExperience, lambda: _aggregate(WorkExperience, _share(~models.Q(achievements=[])))),
+    # Proficiency is mandatory, so a skill is complete once its experience is filled in
+    'skills': (TechnicalSkill, lambda: _aggregate(TechnicalSkill, _share(models.Q(years_experience__gt=0)))),
+    'education': (Education, lambda: _present(Education)),
+    'projects': (Project, lambda: _aggregate(Project, _share(~models.Q(outcomes={})))),
+    'certifications': (Certification, lambda: _present(Certification)),
+    'awards': (Award, lambda: _present(Award)),
+    'languages': (Language, lambda: _present(Language)),
+}
+
+MODEL_COMPONENTS = {model: name for name, (model, _) in COMPONENTS.items()}
+
+
+def components_for(senders):
+    """Components affected by changes to rows of the ``senders`` models"""
+    return {MODEL_COMPONENTS[sender] for sender in senders if sender in MODEL_COMPONENTS}
+
+
+def score_updates(components):
+    """``update()`` kwargs rescoring ``components`` of the updated resumes"""
+    return {f'completeness_{name}': COMPONENTS[name][1]() for name in components}
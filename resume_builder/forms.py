@@ -5,6 +5,8 @@ from .models import (
     TechnicalSkill, Education, Technology, Project,
     Certification, Award, Language
 )
+from .cache import technologies
+from .widgets import TechnologyAutocompleteWidget
 
 class ResumeTemplateForm(forms.ModelForm):
     class Meta:
@@ -25,12 +27,20 @@ class WorkExperienceForm(forms.ModelForm):
     class Meta:
         model = WorkExperience
         fields = ['job_title', 'company', 'location', 'start_date', 'end_date', 'is_current', 'description', 'achievements', 'technologies']
+        widgets = {'technologies': TechnologyAutocompleteWidget}
 
 class TechnicalSkillForm(forms.ModelForm):
     class Meta:
         model = TechnicalSkill
         fields = ['technology', 'proficiency', 'years_experience', 'last_used', 'project_count', 'is_visible']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Options come from the process-local Technology cache instead of a query per render
+        self.fields['technology'].choices = [('', self.fields['technology'].empty_label)] + [
+            (technology.pk, technology.name) for technology in technologies.all()
+        ]
+
 class EducationForm(forms.ModelForm):
     class Meta:
         model = Education
@@ -45,11 +55,13 @@ class ProjectForm(forms.ModelForm):
     class Meta:
         model = Project
         fields = ['title', 'role', 'start_date', 'end_date', 'description', 'technologies', 'outcomes', 'url', 'is_active']
+        widgets = {'technologies': TechnologyAutocompleteWidget}
 
 class CertificationForm(forms.ModelForm):
     class Meta:
         model = Certification
         fields = ['name', 'issuer', 'issue_date', 'expiration_date', 'credential_id', 'verification_url', 'skills']
+        widgets = {'skills': TechnologyAutocompleteWidget}
 
 class AwardForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,201 @@
+import asyncio
+import io
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from resume_builder.management.commands.benchmark_renderers import Command as RendererBenchmark
+from resume_builder.models import Resume, Technology
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrency and latency of the async resume reads under ASGI with the sync ones under WSGI, '
+        'both driven in-process by the same number of concurrent client connections'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=1000, help='Concurrent client connections')
+        parser.add_argument('--requests', type=int, default=2, help='Requests per connection, one after another')
+        parser.add_argument('--wsgi-threads', type=int, default=32, help='Worker threads of the WSGI server')
+        parser.add_argument('--client-ms', type=float, default=20,
+                            help='Time a client takes to receive a response; holds a WSGI thread meanwhile')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--relation-fetches', type=int, nargs='+', default=[1, 4],
+                            help='ASYNC_RELATION_FETCHES values to run the async reads with')
+        parser.add_argument('--db-latency-ms', type=float, default=0,
+                            help='Round trip added to every query, as to a database on another host')
+        parser.add_argument('--resumes', type=int, default=20, help='Number of sample resumes to generate')
+        parser.add_argument('--existing', action='store_true', help='Use resumes already in the database')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        if options['existing']:
+            user = User.objects.filter(resumes__isnull=False).first()
+        else:
+            # Committed, since the requests read on connections of their own; removed afterwards
+            RendererBenchmark().create_sample(options['resumes'])
+            user = User.objects.get(email='benchmark@example.com')
+        if user is None or not Resume.objects.exists():
+            raise CommandError('No resumes to benchmark.')
+        latency = options['db_latency_ms'] / 1000
+
+        def delay(execute, *args):
+            time.sleep(latency)
+            return execute(*args)
+
+        def add_latency(connection, **kwargs):
+            # Sent on every checkout from the pool, for a thread's same connection object
+            if delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        if latency:
+            connection_created.connect(add_latency, dispatch_uid='benchmark_db_latency')
+        try:
+            self.token = str(AccessToken.for_user(user))
+            self.host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if '*' not in host), 'localhost')
+            query = f'page_size={options["page_size"]}'
+            results = [
+                ('WSGI /api/v1/resumes/', asyncio.run(self.run(self.wsgi_client(options), query, options))),
+            ]
+            for fetches in options['relation_fetches']:
+                with override_settings(ASYNC_RELATION_FETCHES=fetches):
+                    results.append((
+                        f'ASGI async, {fetches} fetch conn.',
+                        asyncio.run(self.run(self.asgi_client(options), query, options)),
+                    ))
+        finally:
+            connection_created.disconnect(dispatch_uid='benchmark_db_latency')
+            if not options['existing']:
+                user.delete()
+                Technology.objects.filter(name__startswith='Benchmark ').delete()
+
+        self.stdout.write(
+            f'{options["connections"]} connections x {options["requests"]} requests, '
+            f'page size {options["page_size"]}, {options["wsgi_threads"]} WSGI threads, '
+            f'{options["client_ms"]:g} ms clients, {options["db_latency_ms"]:g} ms query round trips, '
+            f'pool of {settings.DATABASE_POOL_MAX_SIZE} connections'
+        )
+        self.stdout.write(f'{"":<30} {"req/s":>8} {"p50 ms":>8} {"p99 ms":>8} {"peak":>6} {"errors":>7}')
+        for name, (latencies, elapsed, peak, errors) in results:
+            latencies.sort()
+            self.stdout.write(
+                f'{name:<30} {len(latencies) / elapsed:>8.1f} {statistics.median(latencies):>8.1f} '
+                f'{latencies[int(len(latencies) * 0.99) - 1]:>8.1f} {peak:>6} {errors:>7}'
+            )
+
+    async def run(self, client, query, options):
+        """Latencies (ms), elapsed seconds, peak requests in flight and non-200 responses"""
+        latencies, errors = [], 0
+
+        async def connection():
+            nonlocal errors
+            for _ in range(options['requests']):
+                started = time.perf_counter()
+                status = await client(query)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += status != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(connection() for _ in range(options['connections'])))
+        return latencies, time.perf_counter() - started, client.peak, errors
+
+    def wsgi_client(self, options):
+        handler = WSGIHandler()
+        executor = ThreadPoolExecutor(options['wsgi_threads'])
+        gauge = Gauge()
+
+        def serve(query):
+            with gauge:
+                status = []
+                environ = {
+                    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/api/v1/resumes/', 'QUERY_STRING': query,
+                    'SERVER_NAME': self.host, 'SERVER_PORT': '80', 'HTTP_HOST': self.host,
+                    'HTTP_AUTHORIZATION': f'Bearer {self.token}', 'wsgi.input': io.BytesIO(),
+                    'wsgi.url_scheme': 'http', 'wsgi.errors': io.StringIO(),
+                }
+                response = handler(environ, lambda line, headers: status.append(int(line.split()[0])))
+                b''.join(response)
+                # The thread writes to the client until it has read everything
+                time.sleep(options['client_ms'] / 1000)
+                response.close()
+                return status[0]
+
+        async def client(query):
+            return await asyncio.get_running_loop().run_in_executor(executor, serve, query)
+
+        return GaugedClient(client, gauge)
+
+    def asgi_client(self, options):
+        application = ASGIHandler()
+        gauge = Gauge()
+
+        async def client(query):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': '/api/v1/async/resumes/', 'raw_path': b'/api/v1/async/resumes/',
+                'root_path': '', 'query_string': query.encode(), 'server': (self.host, 80),
+                'client': ('127.0.0.1', 0),
+                'headers': [(b'host', self.host.encode()), (b'authorization', f'Bearer {self.token}'.encode())],
+            }
+            requested, status = False, []
+
+            async def receive():
+                nonlocal requested
+                if not requested:
+                    requested = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                # The client never disconnects early
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+                elif not message.get('more_body'):
+                    # A slow client only delays the sending coroutine, not a thread
+                    await asyncio.sleep(options['client_ms'] / 1000)
+
+            with gauge:
+                await application(scope, receive, send)
+            return status[0]
+
+        return GaugedClient(client, gauge)
+
+
+class Gauge:
+    """Counts requests in flight and remembers the peak"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = self.peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+class GaugedClient:
+    def __init__(self, request, gauge):
+        self.request, self.gauge = request, gauge
+
+    async def __call__(self, query):
+        return await self.request(query)
+
+    @property
+    def peak(self):
+        return self.gauge.peak
@@ -0,0 +1,91 @@
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from resume_builder.api.renderers import MessagePackRenderer, ORJSONRenderer
+from resume_builder.api.serializers import ResumeSerializer
+from resume_builder.models import (
+    Resume, ResumeSection, WorkExperience, TechnicalSkill, Education,
+    Technology, Project, Certification, Award, Language
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare rendering throughput of the API renderers on ResumeSerializer output'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=50, help='Number of sample resumes to generate')
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--existing', action='store_true', help='Use resumes already in the database')
+
+    def handle(self, *args, **options):
+        if options['existing']:
+            data = self.serialize(Resume.objects.all()[:options['resumes']])
+        else:
+            # Sample rows only live for the duration of the benchmark
+            with transaction.atomic():
+                self.create_sample(options['resumes'])
+                data = self.serialize(Resume.objects.all()[:options['resumes']])
+                transaction.set_rollback(True)
+        if not data:
+            raise CommandError('No resumes to benchmark.')
+
+        results = []
+        for renderer in (JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()):
+            size = len(renderer.render(data))
+            started = time.perf_counter()
+            for _ in range(options['iterations']):
+                renderer.render(data)
+            elapsed = time.perf_counter() - started
+            results.append((type(renderer).__name__, size, size * options['iterations'] / elapsed))
+
+        baseline = results[0][2]
+        self.stdout.write(f'{len(data)} resumes, {options["iterations"]} iterations')
+        for name, size, rate in results:
+            self.stdout.write(
+                f'{name:<22} {size:>10} bytes  {rate / 2 ** 20:>9.1f} MiB/s  {rate / baseline:>5.1f}x'
+            )
+
+    def serialize(self, resumes):
+        return ResumeSerializer(resumes.with_graph(), many=True).data
+
+    def create_sample(self, count):
+        user = get_user_model().objects.create_user(
+            email='benchmark@example.com', username='benchmark', password=None
+        )
+        technologies = [Technology.objects.create(name=f'Benchmark {i}', category='LANG') for i in range(10)]
+        for index in range(count):
+            resume = Resume.objects.create(
+                user=user, title=f'Resume {index}', slug=f'benchmark-{index}',
+                summary='Experienced engineer. ' * 20, tags=['python', 'django', 'postgres'],
+            )
+            ResumeSection.objects.create(resume=resume, section_type='SUMMARY', title='Summary',
+                                         content={'text': 'Summary ' * 10})
+            for job in range(5):
+                experience = WorkExperience.objects.create(
+                    resume=resume, job_title='Engineer', company=f'Company {job}', start_date=date(2015 + job, 1, 1),
+                    description='Built and operated services. ' * 10,
+                    achievements=[f'Shipped feature {n}' for n in range(5)],
+                )
+                experience.technologies.set(technologies[:5])
+            for technology in technologies:
+                TechnicalSkill.objects.create(resume=resume, technology=technology, proficiency=80,
+                                              years_experience=5, last_used=date(2024, 1, 1))
+            Education.objects.create(resume=resume, degree='BSc', institution='University', gpa='3.7',
+                                     start_date=date(2010, 1, 1), end_date=date(2014, 1, 1))
+            for number in range(3):
+                project = Project.objects.create(
+                    resume=resume, title=f'Project {number}', role='Lead', start_date=date(2020, 1, 1),
+                    description='Project description. ' * 10, outcomes={'users': 1000, 'latency_ms': 12.5},
+                )
+                project.technologies.set(technologies[5:])
+            certification = Certification.objects.create(resume=resume, name='Cert', issuer='Org',
+                                                         issue_date=date(2022, 1, 1))
+            certification.skills.set(technologies[:2])
+            Award.objects.create(resume=resume, title='Award', issuer='Org', issue_date=date(2021, 1, 1),
+                                 category='professional', impact_metrics={'revenue': 100000})
+            Language.objects.create(resume=resume, name='English', proficiency='native')
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='workexperience',
+            name='resume_buil_start_d_12ee33_idx',
+        ),
+        migrations.AddIndex(
+            model_name='award',
+            index=models.Index(fields=['-issue_date', '-id'], name='resume_buil_issue_d_d3fecd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['-issue_date', '-id'], name='resume_buil_issue_d_bfbe1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['-end_date', '-id'], name='resume_buil_end_dat_a490b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='language',
+            index=models.Index(fields=['-proficiency', 'name', 'id'], name='resume_buil_profici_00bdae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-start_date', '-id'], name='resume_buil_start_d_570762_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['-last_modified', '-id'], name='resume_buil_last_mo_2b0126_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumesection',
+            index=models.Index(fields=['order', 'id'], name='resume_buil_order_b4860e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumetemplate',
+            index=models.Index(fields=['-version', 'name', 'id'], name='resume_buil_version_e79e38_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workexperience',
+            index=models.Index(fields=['-start_date', '-id'], name='resume_buil_start_d_c3d740_idx'),
+        ),
+    ]
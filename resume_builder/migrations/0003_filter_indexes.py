@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:35
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0002_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['visibility', '-last_modified', '-id'], name='resume_buil_visibil_3dce56_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['language', '-last_modified', '-id'], name='resume_buil_languag_63bc27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='resume_buil_tags_35968b_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='workexperience',
+            index=models.Index(fields=['end_date'], name='resume_buil_end_dat_cc0626_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0004_resume_content_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resumetemplate',
+            index=models.Index(fields=['updated_at'], name='resume_buil_updated_a37bd2_idx'),
+        ),
+    ]
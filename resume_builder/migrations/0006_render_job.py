@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0005_template_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(choices=[('PDF', 'PDF'), ('DOCX', 'DOCX')], max_length=4)),
+                ('content_version', models.PositiveBigIntegerField()),
+                ('template_version', models.PositiveIntegerField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=10)),
+                ('artifact', models.CharField(blank=True, max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='resume_builder.resume')),
+                ('template', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='resume_builder.resumetemplate')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='resume_buil_created_0fcfdb_idx')],
+                'unique_together': {('resume', 'content_version', 'template', 'template_version', 'format')},
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:51
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# Index the existing resumes; afterwards Resume.save() and
+# ResumeQuerySet.bump_content_version() keep search_vector current.
+BACKFILL_SQL = """
+UPDATE resume_builder_resume r SET search_vector =
+    setweight(to_tsvector('english', coalesce(r.title, '')), 'A')
+    || setweight(to_tsvector('english', concat_ws(' ',
+        (SELECT string_agg(job_title, ' ') FROM resume_builder_workexperience WHERE resume_id = r.id),
+        (SELECT string_agg(title, ' ') FROM resume_builder_project WHERE resume_id = r.id),
+        (SELECT string_agg(title, ' ') FROM resume_builder_award WHERE resume_id = r.id)
+    )), 'B')
+    || setweight(to_tsvector('english', concat_ws(' ',
+        r.summary,
+        (SELECT string_agg(description, ' ') FROM resume_builder_workexperience WHERE resume_id = r.id),
+        (SELECT string_agg(description, ' ') FROM resume_builder_project WHERE resume_id = r.id),
+        (SELECT string_agg(description, ' ') FROM resume_builder_award WHERE resume_id = r.id)
+    )), 'C')
+    || setweight(to_tsvector('english', coalesce(
+        (SELECT string_agg(achievements::text, ' ') FROM resume_builder_workexperience WHERE resume_id = r.id), ''
+    )), 'D')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0006_render_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='resume_buil_search__a7b379_gin'),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+# Score the existing resumes; afterwards Resume.save() and
+# ResumeQuerySet.bump_content_version() keep the components current.
+BACKFILL_SQL = """
+UPDATE resume_builder_resume r SET
+    completeness_profile = 60 * (btrim(r.summary) <> '')::int + 20 * (r.tags <> '[]'::jsonb)::int
+        + 20 * (r.template_id IS NOT NULL)::int,
+    completeness_sections = coalesce((
+        SELECT count(DISTINCT section_type) FILTER (WHERE section_type <> 'CUSTOM') * 100 / 6
+        FROM resume_builder_resumesection WHERE resume_id = r.id GROUP BY resume_id
+    ), 0),
+    completeness_experience = coalesce((
+        SELECT 40 + 60 * count(*) FILTER (WHERE achievements <> '[]'::jsonb) / count(*)
+        FROM resume_builder_workexperience WHERE resume_id = r.id GROUP BY resume_id
+    ), 0),
+    completeness_skills = coalesce((
+        SELECT 40 + 60 * count(*) FILTER (WHERE years_experience > 0) / count(*)
+        FROM resume_builder_technicalskill WHERE resume_id = r.id GROUP BY resume_id
+    ), 0),
+    completeness_education = 100 * EXISTS(SELECT 1 FROM resume_builder_education WHERE resume_id = r.id)::int,
+    completeness_projects = coalesce((
+        SELECT 40 + 60 * count(*) FILTER (WHERE outcomes <> '{}'::jsonb) / count(*)
+        FROM resume_builder_project WHERE resume_id = r.id GROUP BY resume_id
+    ), 0),
+    completeness_certifications = 100 * EXISTS(
+        SELECT 1 FROM resume_builder_certification WHERE resume_id = r.id
+    )::int,
+    completeness_awards = 100 * EXISTS(SELECT 1 FROM resume_builder_award WHERE resume_id = r.id)::int,
+    completeness_languages = 100 * EXISTS(SELECT 1 FROM resume_builder_language WHERE resume_id = r.id)::int
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0009_technology_cache_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_awards',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_certifications',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_education',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_experience',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_languages',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_profile',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_projects',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_sections',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness_skills',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='completeness',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('completeness_profile'), '*', models.Value(10)), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_sections'), '*', models.Value(15))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_experience'), '*', models.Value(25))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_skills'), '*', models.Value(15))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_education'), '*', models.Value(10))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_projects'), '*', models.Value(10))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_certifications'), '*', models.Value(5))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_awards'), '*', models.Value(5))), '+', django.db.models.expressions.CombinedExpression(models.F('completeness_languages'), '*', models.Value(5))), '/', models.Value(100)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop, elidable=True),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['completeness', 'id'], name='resume_buil_complet_3fd365_idx'),
+        ),
+    ]
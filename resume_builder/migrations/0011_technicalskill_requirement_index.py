@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0010_resume_completeness'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='technicalskill',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['technology', 'proficiency', 'years_experience'], include=('resume',), name='skill_requirement_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_builder', '0011_technicalskill_requirement_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='renderjob',
+            name='submitted_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,7 +1,13 @@
+import functools
+import operator
+
 from django.conf import settings
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
 
 
 # -----------------------------
@@ -26,15 +32,81 @@ class ResumeTemplate(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        indexes = [GinIndex(fields=['config'])]
+        indexes = [
+            GinIndex(fields=['config']),
+            models.Index(fields=['-version', 'name', 'id']),
+            models.Index(fields=['updated_at']),
+        ]
         ordering = ['-version', 'name']
 
     def __str__(self):
         return f"{self.name} (v{self.version})"
 
 
+# Weight of each completeness component (scored 0-100) in the overall score; sums to 100
+COMPLETENESS_WEIGHTS = {
+    'profile': 10,
+    'sections': 15,
+    'experience': 25,
+    'skills': 15,
+    'education': 10,
+    'projects': 10,
+    'certifications': 5,
+    'awards': 5,
+    'languages': 5,
+}
+
+
+class ResumeQuerySet(models.QuerySet):
+    """Query helpers for loading a resume together with its child records"""
+
+    def with_relations(self, relations):
+        """Prefetch the given child relations along with their technology M2Ms"""
+        return self.prefetch_related(*(
+            models.Prefetch(name, queryset=self.relation_queryset(name)) for name in relations
+        ))
+
+    def relation_queryset(self, name):
+        """Queryset the child relation ``name`` is loaded with, technology M2M included"""
+        # Only the technology ids are serialized; names come from the Technology cache
+        technologies = Technology.objects.only('id')
+        technology_field = {'work_experiences': 'technologies', 'projects': 'technologies', 'certifications': 'skills'}
+        queryset = self.model._meta.get_field(name).related_model.objects.all()
+        if name in technology_field:
+            queryset = queryset.prefetch_related(models.Prefetch(technology_field[name], queryset=technologies))
+        return queryset
+
+    def with_graph(self):
+        """Load the full nested resume graph with a fixed number of queries"""
+        return (
+            self.select_related('user', 'template').defer('search_vector')
+            .with_relations(self.model.CHILD_RELATIONS)
+        )
+
+    def bump_content_version(self, components=(), reindex=True):
+        """
+        Atomically mark the resumes as changed, rescore the given completeness
+        ``components`` and, if ``reindex``, re-index them in a single UPDATE.
+        """
+        from resume_builder.completeness import score_updates
+        from resume_builder.search import search_document
+
+        updates = score_updates(components)
+        if reindex:
+            updates['search_vector'] = search_document()
+        return self.update(
+            content_version=models.F('content_version') + 1,
+            last_modified=timezone.now(),
+            **updates,
+        )
+
+
 class Resume(models.Model):
     """Central resume model with slug, tags, language and visibility"""
+    CHILD_RELATIONS = (
+        'sections', 'work_experiences', 'technical_skills', 'educations',
+        'projects', 'certifications', 'awards', 'languages',
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -59,6 +131,29 @@ class Resume(models.Model):
     )
     last_modified = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped whenever the resume or any of its child records change
+    content_version = models.PositiveBigIntegerField(default=1, editable=False)
+    # Full-text document over the resume and its children, see resume_builder.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Completeness component scores (0-100), see resume_builder.completeness
+    completeness_profile = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_sections = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_experience = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_skills = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_education = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_projects = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_certifications = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_awards = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness_languages = models.PositiveSmallIntegerField(default=0, editable=False)
+    completeness = models.GeneratedField(
+        expression=functools.reduce(operator.add, (
+            models.F(f'completeness_{name}') * weight for name, weight in COMPLETENESS_WEIGHTS.items()
+        )) / 100,
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    objects = ResumeQuerySet.as_manager()
 
     class Meta:
         unique_together = ('user', 'title')
@@ -66,11 +161,44 @@ class Resume(models.Model):
         indexes = [
             models.Index(fields=['user', 'visibility']),
             models.Index(fields=['slug']),
+            models.Index(fields=['-last_modified', '-id']),
+            models.Index(fields=['visibility', '-last_modified', '-id']),
+            models.Index(fields=['language', '-last_modified', '-id']),
+            models.Index(fields=['completeness', 'id']),
+            GinIndex(fields=['tags']),
+            GinIndex(fields=['search_vector']),
         ]
 
     def __str__(self):
         return f"{self.user.email} – {self.title}"
 
+    def save(self, *args, **kwargs):
+        from resume_builder.completeness import profile_score
+        from resume_builder.search import SEARCH_CONFIG, search_document
+
+        if self.pk is None or self._state.adding:
+            self.completeness_profile = profile_score(self)
+            # A new resume has no children yet, so its own columns are the whole document
+            self.search_vector = (
+                SearchVector(models.Value(self.title), weight='A', config=SEARCH_CONFIG)
+                + SearchVector(models.Value(self.summary), weight='C', config=SEARCH_CONFIG)
+            )
+            super().save(*args, **kwargs)
+            del self.search_vector  # deferred; loaded from the database if accessed
+            return
+        self.content_version = models.F('content_version') + 1
+        update_fields = kwargs.get('update_fields')
+        written = {'title', 'summary'} if update_fields is None else set(update_fields)
+        self.search_vector = search_document(**{
+            name: getattr(self, name) for name in ('title', 'summary') if name in written
+        })
+        self.completeness_profile = profile_score(self)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'content_version', 'search_vector', 'completeness_profile'}
+        super().save(*args, **kwargs)
+        del self.search_vector
+        self.refresh_from_db(fields=['content_version', 'completeness'])
+
 
 class ResumeSection(models.Model):
     """Flexible sections for custom resume layouts"""
@@ -93,6 +221,7 @@ class ResumeSection(models.Model):
     class Meta:
         ordering = ['order']
         unique_together = ('resume', 'section_type')
+        indexes = [models.Index(fields=['order', 'id'])]
 
     def __str__(self):
         return f"{self.resume.title} – {self.title}"
@@ -121,7 +250,8 @@ class WorkExperience(models.Model):
         ordering = ['-start_date']
         indexes = [
             models.Index(fields=['company']),
-            models.Index(fields=['-start_date']),
+            models.Index(fields=['-start_date', '-id']),
+            models.Index(fields=['end_date']),
         ]
 
     def __str__(self):
@@ -166,10 +296,19 @@ class TechnicalSkill(models.Model):
         indexes = [
             models.Index(fields=['proficiency']),
             models.Index(fields=['resume', 'technology']),
+            # Posting list per technology for requirement matching (jobs.matching):
+            # range scans on proficiency/years, answered from the index alone
+            models.Index(
+                fields=['technology', 'proficiency', 'years_experience'], include=['resume'],
+                condition=models.Q(is_visible=True), name='skill_requirement_idx',
+            ),
         ]
 
     def __str__(self):
-        return f"{self.technology.name} – {self.get_proficiency_display()}"
+        from resume_builder.cache import technologies
+
+        technology = technologies.get(self.technology_id)
+        return f"{technology.name if technology else self.technology_id} – {self.get_proficiency_display()}"
 
 
 class Education(models.Model):
@@ -196,6 +335,7 @@ class Education(models.Model):
 
     class Meta:
         ordering = ['-end_date']
+        indexes = [models.Index(fields=['-end_date', '-id'])]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(end_date__gte=models.F('start_date')),
@@ -224,6 +364,11 @@ class Technology(models.Model):
     class Meta:
         verbose_name_plural = 'Technologies'
         ordering = ['name']
+        indexes = [
+            # Fuzzy matching (%> word similarity) and case-insensitive prefix matching
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='technology_name_trgm'),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='technology_upper_name_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.name}"
@@ -248,6 +393,7 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [models.Index(fields=['-start_date', '-id'])]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(end_date__gte=models.F('start_date')),
@@ -276,6 +422,7 @@ class Certification(models.Model):
 
     class Meta:
         ordering = ['-issue_date']
+        indexes = [models.Index(fields=['-issue_date', '-id'])]
 
     def __str__(self):
         return f"{self.name} by {self.issuer}"
@@ -307,6 +454,7 @@ class Award(models.Model):
 
     class Meta:
         ordering = ['-issue_date']
+        indexes = [models.Index(fields=['-issue_date', '-id'])]
 
     def __str__(self):
         return f"{self.title} – {self.issuer}"
@@ -336,9 +484,59 @@ class Language(models.Model):
 
     class Meta:
         ordering = ['-proficiency', 'name']
+        indexes = [models.Index(fields=['-proficiency', 'name', 'id'])]
 
     def __str__(self):
         return f"{self.name} ({self.get_proficiency_display()})"
 
     def get_proficiency_display(self):
         return self.proficiency
+
+
+class RenderJob(models.Model):
+    """PDF/DOCX rendering of a resume content version with a template version"""
+    FORMATS = [('PDF', 'PDF'), ('DOCX', 'DOCX')]
+    STATUSES = [('PENDING', 'Pending'), ('DONE', 'Done'), ('FAILED', 'Failed')]
+    resume = models.ForeignKey(
+        Resume,
+        on_delete=models.CASCADE,
+        related_name='render_jobs'
+    )
+    template = models.ForeignKey(
+        ResumeTemplate,
+        on_delete=models.CASCADE,
+        related_name='render_jobs'
+    )
+    format = models.CharField(max_length=4, choices=FORMATS)
+    content_version = models.PositiveBigIntegerField()
+    template_version = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUSES, default='PENDING')
+    # Path of the rendered file relative to settings.RESUME_ARTIFACT_ROOT
+    artifact = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the job last went to the render pool; PENDING jobs older than
+    # RESUME_RENDER_STALE_SECONDS were lost (e.g. with their worker) and are resubmitted
+    submitted_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('resume', 'content_version', 'template', 'template_version', 'format')
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at', '-id'])]
+
+    def __str__(self):
+        return f"{self.resume_id} v{self.content_version} {self.format} ({self.status})"
+
+    @property
+    def extension(self):
+        return self.format.lower()
+
+
+class CacheVersion(models.Model):
+    """Version stamp of a process-local reference cache, bumped on every write"""
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
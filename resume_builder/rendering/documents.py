@@ -0,0 +1,254 @@
+"""
+Turn a serialized resume into PDF and DOCX files.
+
+This module runs inside the render worker processes, so it deliberately does
+not import Django: workers receive the ResumeSerializer payload, the template
+(format type and config) and a technology id -> name map, and only write files.
+"""
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+PROFICIENCY_LABELS = {20: 'Basic', 40: 'Beginner', 60: 'Intermediate', 80: 'Advanced', 100: 'Expert'}
+
+DEFAULT_SECTIONS = [
+    'sections', 'work_experiences', 'projects', 'educations', 'technical_skills',
+    'certifications', 'awards', 'languages',
+]
+
+# Base look of each ResumeTemplate.format_type; template config overrides any key
+STYLES = {
+    'CLASSIC': {'font': 'Times', 'accent_color': '000000', 'font_size': 11},
+    'MODERN': {'font': 'Helvetica', 'accent_color': '2C6FBB', 'font_size': 10},
+    'CREATIVE': {'font': 'Helvetica', 'accent_color': 'C2185B', 'font_size': 10},
+    'TECHNICAL': {'font': 'Courier', 'accent_color': '333333', 'font_size': 9},
+}
+
+# reportlab built-in font names and their closest Word equivalents
+PDF_FONTS = {'Times': 'Times-Roman', 'Helvetica': 'Helvetica', 'Courier': 'Courier'}
+PDF_BOLD_FONTS = {'Times': 'Times-Bold', 'Helvetica': 'Helvetica-Bold', 'Courier': 'Courier-Bold'}
+DOCX_FONTS = {'Times': 'Times New Roman', 'Helvetica': 'Arial', 'Courier': 'Courier New'}
+
+
+def render_resume(payload, template, technologies, file_format, path):
+    """Worker entry point: render ``payload`` to ``path`` atomically and return the path"""
+    document = build_document(payload, template, technologies)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        if file_format == 'PDF':
+            render_pdf(document, tmp_path)
+        else:
+            render_docx(document, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def build_document(payload, template, technologies):
+    """Reduce the payload to a title, summary and ordered list of sections"""
+    config = template.get('config') or {}
+    style = {**STYLES.get(template.get('format_type'), STYLES['CLASSIC']), **config.get('style', {})}
+    if style['font'] not in PDF_FONTS:
+        style['font'] = 'Helvetica'
+    names = {int(pk): name for pk, name in technologies.items()}
+
+    sections = []
+    for relation in config.get('sections', DEFAULT_SECTIONS):
+        builder = SECTION_BUILDERS.get(relation)
+        if builder is not None:
+            sections.extend(section for section in builder(payload.get(relation) or [], names) if section['entries'])
+    return {
+        'title': payload.get('title', ''),
+        'summary': payload.get('summary', ''),
+        'style': style,
+        'sections': sections,
+    }
+
+
+def _dates(start, end, current=False):
+    if not start:
+        return ''
+    return f"{start} – {'Present' if current or not end else end}"
+
+
+def _technology_line(ids, names):
+    labels = [names[pk] for pk in ids or [] if pk in names]
+    return f"Technologies: {', '.join(labels)}" if labels else ''
+
+
+def _custom_sections(items, names):
+    for item in items:
+        content = item.get('content') or {}
+        if not item.get('is_visible', True) or not isinstance(content, dict):
+            continue
+        entry = {'title': '', 'body': str(content.get('text', '')),
+                 'bullets': [str(value) for value in content.get('items', [])]}
+        yield {'heading': item.get('title', ''), 'entries': [entry] if entry['body'] or entry['bullets'] else []}
+
+
+def _experience(items, names):
+    yield {'heading': 'Experience', 'entries': [
+        {
+            'title': f"{item['job_title']} — {item['company']}",
+            'subtitle': ' · '.join(filter(None, [item.get('location'),
+                                                 _dates(item['start_date'], item.get('end_date'),
+                                                        item.get('is_current'))])),
+            'body': item.get('description', ''),
+            'bullets': [str(value) for value in item.get('achievements') or []],
+            'footer': _technology_line(item.get('technologies'), names),
+        }
+        for item in items
+    ]}
+
+
+def _projects(items, names):
+    yield {'heading': 'Projects', 'entries': [
+        {
+            'title': f"{item['title']} — {item['role']}",
+            'subtitle': ' · '.join(filter(None, [_dates(item['start_date'], item.get('end_date')), item.get('url')])),
+            'body': item.get('description', ''),
+            'footer': _technology_line(item.get('technologies'), names),
+        }
+        for item in items
+    ]}
+
+
+def _education(items, names):
+    yield {'heading': 'Education', 'entries': [
+        {
+            'title': f"{item['degree']}, {item['institution']}",
+            'subtitle': ' · '.join(filter(None, [item.get('location'), _dates(item['start_date'], item['end_date']),
+                                                 f"GPA {item['gpa']}" if item.get('gpa') else ''])),
+            'body': item.get('description', ''),
+        }
+        for item in items if item.get('is_visible', True)
+    ]}
+
+
+def _skills(items, names):
+    bullets = [
+        f"{names.get(item['technology'], '')} — {PROFICIENCY_LABELS.get(item['proficiency'], item['proficiency'])}"
+        + (f", {item['years_experience']} yrs" if item.get('years_experience') else '')
+        for item in items if item.get('is_visible', True)
+    ]
+    yield {'heading': 'Technical Skills', 'entries': [{'title': '', 'bullets': bullets}] if bullets else []}
+
+
+def _certifications(items, names):
+    yield {'heading': 'Certifications', 'entries': [
+        {
+            'title': f"{item['name']} — {item['issuer']}",
+            'subtitle': ' · '.join(filter(None, [
+                item['issue_date'],
+                f"expires {item['expiration_date']}" if item.get('expiration_date') else '',
+                item.get('credential_id'),
+            ])),
+            'footer': _technology_line(item.get('skills'), names),
+        }
+        for item in items
+    ]}
+
+
+def _awards(items, names):
+    yield {'heading': 'Awards', 'entries': [
+        {'title': f"{item['title']} — {item['issuer']}", 'subtitle': item['issue_date'],
+         'body': item.get('description', '')}
+        for item in items if item.get('is_visible', True)
+    ]}
+
+
+def _languages(items, names):
+    bullets = [f"{item['name']}: {item['proficiency']}" for item in items if item.get('is_visible', True)]
+    yield {'heading': 'Languages', 'entries': [{'title': '', 'bullets': bullets}] if bullets else []}
+
+
+SECTION_BUILDERS = {
+    'sections': _custom_sections,
+    'work_experiences': _experience,
+    'projects': _projects,
+    'educations': _education,
+    'technical_skills': _skills,
+    'certifications': _certifications,
+    'awards': _awards,
+    'languages': _languages,
+}
+
+
+def render_pdf(document, path):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import ListFlowable, Paragraph, SimpleDocTemplate, Spacer
+
+    style = document['style']
+    font, bold, size = PDF_FONTS[style['font']], PDF_BOLD_FONTS[style['font']], style['font_size']
+    accent = colors.HexColor(f"#{style['accent_color']}")
+    body = ParagraphStyle('body', fontName=font, fontSize=size, leading=size * 1.3)
+    small = ParagraphStyle('small', parent=body, fontSize=size - 1, textColor=colors.grey)
+    title = ParagraphStyle('title', fontName=bold, fontSize=size * 2, leading=size * 2.4, textColor=accent)
+    heading = ParagraphStyle('heading', fontName=bold, fontSize=size * 1.3, leading=size * 1.8,
+                             textColor=accent, spaceBefore=size)
+    entry_title = ParagraphStyle('entry', parent=body, fontName=bold)
+
+    story = [Paragraph(escape(document['title']), title)]
+    if document['summary']:
+        story.append(Paragraph(escape(document['summary']), body))
+    for section in document['sections']:
+        story.append(Paragraph(escape(section['heading']), heading))
+        for entry in section['entries']:
+            if entry.get('title'):
+                story.append(Paragraph(escape(entry['title']), entry_title))
+            if entry.get('subtitle'):
+                story.append(Paragraph(escape(entry['subtitle']), small))
+            if entry.get('body'):
+                story.append(Paragraph(escape(entry['body']), body))
+            if entry.get('bullets'):
+                story.append(ListFlowable(
+                    [Paragraph(escape(bullet), body) for bullet in entry['bullets']],
+                    bulletType='bullet', bulletFontSize=size - 2,
+                ))
+            if entry.get('footer'):
+                story.append(Paragraph(escape(entry['footer']), small))
+            story.append(Spacer(1, size * 0.5))
+    SimpleDocTemplate(path, pagesize=A4, title=document['title']).build(story)
+
+
+def render_docx(document, path):
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+
+    style = document['style']
+    accent = RGBColor.from_string(style['accent_color'].upper())
+    doc = Document()
+    normal = doc.styles['Normal']
+    normal.font.name = DOCX_FONTS[style['font']]
+    normal.font.size = Pt(style['font_size'])
+
+    def add_heading(text, level):
+        paragraph = doc.add_heading(text, level=level)
+        for run in paragraph.runs:
+            run.font.color.rgb = accent
+            run.font.name = DOCX_FONTS[style['font']]
+
+    add_heading(document['title'], 0)
+    if document['summary']:
+        doc.add_paragraph(document['summary'])
+    for section in document['sections']:
+        add_heading(section['heading'], 1)
+        for entry in section['entries']:
+            if entry.get('title'):
+                doc.add_paragraph().add_run(entry['title']).bold = True
+            if entry.get('subtitle'):
+                doc.add_paragraph().add_run(entry['subtitle']).italic = True
+            if entry.get('body'):
+                doc.add_paragraph(entry['body'])
+            for bullet in entry.get('bullets', []):
+                doc.add_paragraph(bullet, style='List Bullet')
+            if entry.get('footer'):
+                doc.add_paragraph().add_run(entry['footer']).italic = True
+    doc.save(path)
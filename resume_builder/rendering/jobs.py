@@ -0,0 +1,153 @@
+import logging
+import os
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+from django.utils import timezone
+
+from resume_builder import cache
+from resume_builder.models import RenderJob, Resume
+from resume_builder.rendering import documents, pool
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_name(job):
+    return os.path.join(
+        str(job.resume_id),
+        f'{job.content_version}-{job.template_id}-{job.template_version}.{job.extension}',
+    )
+
+
+def artifact_path(job):
+    return os.path.join(settings.RESUME_ARTIFACT_ROOT, job.artifact or artifact_name(job))
+
+
+def is_ready(job):
+    return job.status == 'DONE' and os.path.exists(artifact_path(job))
+
+
+def request_render(resume_id, template, file_format, payload=None):
+    """
+    Return the render job for the resume's current content version, submitting
+    it to the pool unless an artifact for the same versions already exists.
+    Failed jobs, jobs whose file has gone missing and jobs pending for longer
+    than RESUME_RENDER_STALE_SECONDS are resubmitted. ``payload``, the
+    serialized resume, saves loading it again if it is of the current version.
+    """
+    resume = Resume.objects.only('id', 'content_version').get(pk=resume_id)
+    lookup = dict(
+        resume_id=resume.pk, content_version=resume.content_version,
+        template=template, template_version=template.version, format=file_format,
+    )
+    try:
+        job, created = RenderJob.objects.get_or_create(**lookup)
+    except IntegrityError:
+        job, created = RenderJob.objects.get(**lookup), False
+    if not created and ((job.status == 'PENDING' and not is_stale(job)) or is_ready(job)):
+        return job
+    if created and os.path.exists(artifact_path(job)):
+        # Already rendered outside a job, e.g. by a bulk export
+        _finish(job)
+        job.refresh_from_db()
+        return job
+
+    if not created:
+        # Only one of concurrent requests for the job resubmits it
+        claimed = RenderJob.objects.filter(pk=job.pk, status=job.status, submitted_at=job.submitted_at).update(
+            status='PENDING', error='', finished_at=None, submitted_at=timezone.now(),
+        )
+        job.refresh_from_db()
+        if not claimed:
+            return job
+    if payload is None or payload.get('content_version') != resume.content_version:
+        payload = _payload(resume)
+    submit(job, payload)
+    return job
+
+
+def is_stale(job):
+    return (timezone.now() - job.submitted_at).total_seconds() > settings.RESUME_RENDER_STALE_SECONDS
+
+
+def _payload(resume):
+    from resume_builder.api.serializers import ResumeSerializer
+
+    payload = cache.get_payload(resume.pk, resume.content_version)
+    if payload is None:
+        cache.technologies.revalidate()
+        resume = Resume.objects.with_graph().get(pk=resume.pk)
+        payload = ResumeSerializer(resume).data
+        cache.set_payload(resume.pk, resume.content_version, payload)
+    return payload
+
+
+def rendered_artifact(resume, file_format):
+    """
+    The artifact path of ``resume`` (loaded with its template) in its own
+    template, if that version is rendered already; no queries.
+    """
+    job = RenderJob(
+        resume=resume, template=resume.template, format=file_format,
+        content_version=resume.content_version, template_version=resume.template.version,
+    )
+    path = artifact_path(job)
+    return path if os.path.exists(path) else None
+
+
+def template_spec(template):
+    return {'format_type': template.format_type, 'config': template.config}
+
+
+def submit(job, payload):
+    technologies = {}
+    for pk in _technology_ids(payload):
+        technology = cache.technologies.get(pk)
+        if technology is not None:
+            technologies[pk] = technology.name
+    args = (payload, template_spec(job.template), technologies, job.format, artifact_path(job))
+    if settings.RESUME_RENDER_EAGER:
+        try:
+            documents.render_resume(*args)
+        except Exception as exc:
+            _finish(job, error=exc)
+        else:
+            _finish(job)
+        job.refresh_from_db()
+        return
+
+    try:
+        pool.submit(documents.render_resume, *args, callback=lambda future: _on_done(job, future))
+    except pool.PoolFull:
+        # Leave the job failed so the next request for it resubmits
+        _finish(job, error='Render queue is full.')
+        raise
+
+
+def _technology_ids(payload):
+    ids = {skill['technology'] for skill in payload.get('technical_skills', [])}
+    for relation, field in (('work_experiences', 'technologies'), ('projects', 'technologies'),
+                            ('certifications', 'skills')):
+        for item in payload.get(relation, []):
+            ids.update(item.get(field, []))
+    return ids
+
+
+def _on_done(job, future):
+    # Runs on the executor's management thread, which has its own connection
+    try:
+        _finish(job, error=future.exception())
+    finally:
+        close_old_connections()
+
+
+def _finish(job, error=None):
+    if error is not None:
+        logger.warning('Rendering job %s failed: %s', job.pk, error)
+    # A submission finishing after the job was resubmitted as stale leaves the newer one alone
+    RenderJob.objects.filter(pk=job.pk, submitted_at=job.submitted_at).update(
+        status='FAILED' if error is not None else 'DONE',
+        artifact=artifact_name(job) if error is None else '',
+        error=str(error) if error is not None else '',
+        finished_at=timezone.now(),
+    )
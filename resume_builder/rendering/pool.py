@@ -0,0 +1,63 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_executor = None
+_pending = 0
+
+
+class PoolFull(Exception):
+    """Raised when RESUME_RENDER_MAX_PENDING jobs are already queued"""
+
+
+def get_executor():
+    """
+    Return the process-wide render pool, creating it on first use.
+
+    Workers are spawned rather than forked so they never inherit the parent's
+    database connections; they only import the Django-free documents module.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.RESUME_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def submit(fn, *args, callback):
+    """Queue ``fn(*args)`` on the pool and call ``callback(future)`` when it finishes"""
+    global _pending
+    executor = get_executor()
+    with _lock:
+        if _pending >= settings.RESUME_RENDER_MAX_PENDING:
+            raise PoolFull
+        _pending += 1
+
+    def done(future):
+        global _pending
+        with _lock:
+            _pending -= 1
+        callback(future)
+
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        with _lock:
+            _pending -= 1
+        raise
+    future.add_done_callback(done)
+    return future
+
+
+def shutdown(wait=True):
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
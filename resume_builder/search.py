@@ -0,0 +1,105 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+)
+from django.db import models
+from django.db.models.functions import Cast, Coalesce, Concat
+
+from resume_builder.models import Award, Project, Resume, Technology, WorkExperience
+
+SEARCH_CONFIG = 'english'
+
+
+def child_text(model, expression):
+    """Space-joined ``expression`` over the resume's ``model`` rows, as a correlated subquery"""
+    return models.Subquery(
+        model.objects.filter(resume=models.OuterRef('pk')).order_by().values('resume')
+        .annotate(text=StringAgg(expression, ' ')).values('text')
+    )
+
+
+# Child models whose text search_document indexes
+INDEXED_MODELS = (WorkExperience, Project, Award)
+
+
+def reindexes(senders):
+    """Whether changes to rows of the ``senders`` models change the resumes' search documents"""
+    return any(sender in INDEXED_MODELS for sender in senders)
+
+
+def search_document(title=None, summary=None):
+    """
+    Weighted tsvector of a resume row, usable in ``update()``: the title (A),
+    job/project/award titles (B), summary and descriptions (C) and achievements (D).
+
+    Pass ``title``/``summary`` when the same UPDATE writes them, as the SET
+    clause otherwise sees the row's old values.
+    """
+    title = 'title' if title is None else models.Value(title)
+    summary = 'summary' if summary is None else models.Value(summary)
+    return (
+        SearchVector(title, weight='A', config=SEARCH_CONFIG)
+        + SearchVector(
+            child_text(WorkExperience, 'job_title'), child_text(Project, 'title'), child_text(Award, 'title'),
+            weight='B', config=SEARCH_CONFIG,
+        )
+        + SearchVector(summary, *_descriptions(), weight='C', config=SEARCH_CONFIG)
+        + SearchVector(
+            child_text(WorkExperience, Cast('achievements', models.TextField())),
+            weight='D', config=SEARCH_CONFIG,
+        )
+    )
+
+
+def _descriptions():
+    return [child_text(model, 'description') for model in INDEXED_MODELS]
+
+
+def search(queryset, terms):
+    """Resumes of ``queryset`` matching the web-search style ``terms``, best match first"""
+    query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        # ts_rank is a float4; as a float8 it survives the cursor round trip exactly
+        .annotate(rank=Cast(SearchRank(models.F('search_vector'), query), models.FloatField()))
+        .order_by('-rank', '-id')
+    )
+
+
+def headlines(resume_ids, terms):
+    """
+    Map resume id -> summary/description snippet with the matches in <mark>.
+    Only run for a page of hits, as ts_headline re-parses the whole text.
+    """
+    query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+    parts = [
+        Coalesce(source, models.Value(''), output_field=models.TextField())
+        for source in ['summary', *_descriptions()]
+    ]
+    text = Concat(*(part for source in parts for part in (source, models.Value(' '))), output_field=models.TextField())
+    return dict(
+        Resume.objects.filter(pk__in=resume_ids)
+        .annotate(headline=SearchHeadline(
+            text, query, config=SEARCH_CONFIG, start_sel='<mark>', stop_sel='</mark>',
+            max_fragments=3, fragment_delimiter=' … ',
+        ))
+        .values_list('pk', 'headline')
+    )
+
+
+def technology_matches(terms, category=None):
+    """
+    Technologies whose name starts with ``terms`` (case-insensitive) or contains a
+    word similar to it, prefix matches first. Both conditions are served by the
+    trigram GIN indexes on Technology.name.
+    """
+    queryset = Technology.objects.filter(
+        models.Q(name__istartswith=terms) | models.Q(name__trigram_word_similar=terms)
+    )
+    if category:
+        queryset = queryset.filter(category=category)
+    prefix = models.Case(models.When(name__istartswith=terms, then=True), default=False)
+    return (
+        queryset.annotate(prefix=prefix, similarity=TrigramWordSimilarity(terms, 'name'))
+        .order_by('-prefix', '-similarity', 'name', 'id')
+    )
@@ -0,0 +1,139 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from resume_builder import cache
+from resume_builder.completeness import components_for
+from resume_builder.search import reindexes
+from resume_builder.models import (
+    Resume, ResumeTemplate, ResumeSection, WorkExperience, TechnicalSkill,
+    Education, Technology, Project, Certification, Award, Language
+)
+
+CHILD_MODELS = (
+    ResumeSection, WorkExperience, TechnicalSkill, Education,
+    Project, Certification, Award, Language,
+)
+
+# Sent once the content version of ``resume_ids`` was bumped because rows of
+# ``sender`` (a child model) changed; derived data listens to this rather than
+# to every child model's save/delete and the bulk endpoints.
+resume_content_changed = Signal()
+
+_deferred = threading.local()
+
+
+def bump_content_version(resume_ids, sender):
+    pending = getattr(_deferred, 'changes', None)
+    if pending is not None:
+        pending.setdefault(sender, set()).update(resume_ids)
+        return
+    resume_ids = set(resume_ids)
+    Resume.objects.filter(pk__in=resume_ids).bump_content_version(
+        components_for([sender]), reindex=reindexes([sender])
+    )
+    resume_content_changed.send(sender=sender, resume_ids=resume_ids)
+
+
+@contextmanager
+def deferred_content_version():
+    """Collapse the content version bumps inside the block into one UPDATE"""
+    if getattr(_deferred, 'changes', None) is not None:
+        yield
+        return
+    _deferred.changes = {}
+    try:
+        yield
+        changes, _deferred.changes = _deferred.changes, None
+        if changes:
+            Resume.objects.filter(pk__in=set().union(*changes.values())).bump_content_version(
+                components_for(changes), reindex=reindexes(changes)
+            )
+            for sender, resume_ids in changes.items():
+                resume_content_changed.send(sender=sender, resume_ids=resume_ids)
+    finally:
+        _deferred.changes = None
+
+
+def child_saved(sender, instance, **kwargs):
+    bump_content_version([instance.resume_id], sender)
+
+
+def child_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from deleting the resume itself have nothing left to invalidate
+    if isinstance(origin, Resume) or getattr(origin, 'model', None) is Resume:
+        return
+    bump_content_version([instance.resume_id], sender)
+
+
+for model in CHILD_MODELS:
+    post_save.connect(child_saved, sender=model, dispatch_uid=f'{model.__name__}_content_version_save')
+    post_delete.connect(child_deleted, sender=model, dispatch_uid=f'{model.__name__}_content_version_delete')
+
+
+@receiver(m2m_changed, sender=WorkExperience.technologies.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+@receiver(m2m_changed, sender=Certification.skills.through)
+def technologies_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove') and not pk_set:
+        return
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_content_version([instance.resume_id], type(instance))
+        return
+
+    # Changed from the Technology side: ``model`` is the child record model
+    if action in ('post_add', 'post_remove'):
+        children = model.objects.filter(pk__in=pk_set)
+    elif action == 'pre_clear':
+        field = next(f for f in model._meta.many_to_many if f.remote_field.through is sender)
+        children = model.objects.filter(**{field.name: instance})
+    else:
+        return
+    bump_content_version(children.values_list('resume_id', flat=True).distinct(), model)
+
+
+@receiver(pre_delete, sender=ResumeTemplate, dispatch_uid='template_delete_collect')
+def template_deleting(sender, instance, **kwargs):
+    # Resume.template is SET_NULL, a plain UPDATE that sends no signal of its own
+    instance._resume_ids = set(Resume.objects.filter(template=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=ResumeTemplate, dispatch_uid='template_delete_content_version')
+def template_deleted(sender, instance, **kwargs):
+    if instance._resume_ids:
+        bump_content_version(instance._resume_ids, ResumeTemplate)
+
+
+@receiver(post_save, sender=Technology, dispatch_uid='technology_cache_save')
+@receiver(post_delete, sender=Technology, dispatch_uid='technology_cache_delete')
+def technology_changed(sender, instance, created=False, **kwargs):
+    # Other workers pick the new version stamp up within TECHNOLOGY_CACHE_TTL
+    cache.technologies.bump()
+    # Serialized skills embed the technology name and icon, rendered documents
+    # the names of the technologies of experiences, projects and certifications
+    if kwargs.get('signal') is post_delete:
+        if instance._resume_ids:
+            bump_content_version(instance._resume_ids, Technology)
+    elif not created:
+        bump_content_version(resumes_using(instance), Technology)
+
+
+@receiver(pre_delete, sender=Technology, dispatch_uid='technology_delete_collect')
+def technology_deleting(sender, instance, **kwargs):
+    # The through rows go with it, so its resumes can no longer be found in post_delete
+    instance._resume_ids = resumes_using(instance)
+
+
+def resumes_using(technology):
+    """Ids of the resumes referring to ``technology`` from any of their records"""
+    referrers = (
+        TechnicalSkill.objects.filter(technology=technology),
+        WorkExperience.objects.filter(technologies=technology),
+        Project.objects.filter(technologies=technology),
+        Certification.objects.filter(skills=technology),
+    )
+    querysets = [queryset.order_by().values_list('resume_id', flat=True) for queryset in referrers]
+    return set(querysets[0].union(*querysets[1:]))
@@ -0,0 +1,55 @@
+# Python
+from django import forms
+from django.contrib.auth.mixins import LoginRequiredMixin
+
+from resume_builder.models import Resume
+
+
+class OwnerScopedMixin(LoginRequiredMixin):
+    """
+    Restrict a generic view's queryset to rows owned by the request user.
+
+    Ownership is part of the SQL filter (``owner_field``), so detail views load
+    and authorize the object with one query and answer 404 for other users'
+    rows. The object is cached for the rest of the request. List views get
+    ``select_related``/``prefetch_related`` and pagination.
+    """
+    owner_field = 'resume__user'
+    select_related = ('resume',)
+    prefetch_related = ()
+    paginate_by = 20
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(**{self.owner_field: self.request.user})
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
+
+
+class ResumeChildFormMixin:
+    """
+    Add a ``resume`` choice limited to the user's own resumes to create/update
+    forms of resume child records, so ownership is validated by the queryset.
+    """
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        resume_id = form.instance.resume_id if form.instance.pk else None
+        form.fields['resume'] = forms.ModelChoiceField(
+            queryset=Resume.objects.filter(user=self.request.user).only('id', 'title'),
+            initial=resume_id,
+        )
+        return form
+
+    def form_valid(self, form):
+        form.instance.resume = form.cleaned_data['resume']
+        return super().form_valid(form)
@@ -1,3 +1,63 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from resume_builder.models import Resume, Technology, WorkExperience
+
+User = get_user_model()
+
+
+class WorkExperienceViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='test@example.com', username='test', password='testpass123')
+        self.other = User.objects.create_user(email='other@example.com', username='other', password='testpass123')
+        self.resume = Resume.objects.create(user=self.user, title='Mine', slug='mine')
+        self.other_resume = Resume.objects.create(user=self.other, title='Theirs', slug='theirs')
+        self.python = Technology.objects.create(name='Python', category='LANG')
+        self.experience = WorkExperience.objects.create(resume=self.resume, job_title='Dev', company='Co',
+                                                        start_date='2020-01-01')
+        self.experience.technologies.set([self.python])
+        self.foreign = WorkExperience.objects.create(resume=self.other_resume, job_title='Dev', company='Co',
+                                                     start_date='2020-01-01')
+        self.client.force_login(self.user)
+
+    def test_detail_loads_and_authorizes_in_one_query(self):
+        url = reverse('work_experience_detail', args=[self.experience.pk])
+        # session + user, then the owner-filtered object and its technologies
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['experience'], self.experience)
+
+    def test_other_users_rows_are_not_found(self):
+        for name in ('work_experience_detail', 'work_experience_update', 'work_experience_delete'):
+            with self.subTest(view=name):
+                response = self.client.get(reverse(name, args=[self.foreign.pk]))
+                self.assertEqual(response.status_code, 404)
+        self.client.post(reverse('work_experience_delete', args=[self.foreign.pk]))
+        self.assertTrue(WorkExperience.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_list_is_scoped_and_paginated(self):
+        WorkExperience.objects.bulk_create([
+            WorkExperience(resume=self.resume, job_title=f'Job {index}', company='Co', start_date='2019-01-01')
+            for index in range(25)
+        ])
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('work_experience_list'))
+        self.assertEqual(len(response.context['experiences']), 20)
+        self.assertTrue(response.context['is_paginated'])
+        self.assertEqual(response.context['paginator'].count, 26)
+        self.assertNotIn(self.foreign, response.context['experiences'])
+
+    def test_create_only_accepts_own_resumes(self):
+        data = {'job_title': 'New', 'company': 'Co', 'start_date': '2021-01-01', 'achievements': '[]',
+                'technologies': [self.python.pk]}
+        response = self.client.post(reverse('work_experience_create'), {**data, 'resume': self.other_resume.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('resume', response.context['form'].errors)
+
+        response = self.client.post(reverse('work_experience_create'), {**data, 'resume': self.resume.pk})
+        self.assertRedirects(response, reverse('work_experience_list'), fetch_redirect_response=False)
+        created = WorkExperience.objects.get(job_title='New')
+        self.assertEqual(created.resume, self.resume)
+        self.assertEqual(list(created.technologies.all()), [self.python])
@@ -1,53 +1,35 @@
 # Python
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
 from resume_builder.models import WorkExperience
 from resume_builder.forms import WorkExperienceForm
+from resume_builder.web.mixins import OwnerScopedMixin, ResumeChildFormMixin
 
-class WorkExperienceListView(LoginRequiredMixin, ListView):
+class WorkExperienceListView(OwnerScopedMixin, ListView):
     model = WorkExperience
     template_name = 'resume_builder/work_experience/work_experience_list.html'
     context_object_name = 'experiences'
+    prefetch_related = ('technologies',)
 
-    def get_queryset(self):
-        return WorkExperience.objects.filter(resume__user=self.request.user)
-
-class WorkExperienceCreateView(LoginRequiredMixin, CreateView):
+class WorkExperienceCreateView(OwnerScopedMixin, ResumeChildFormMixin, CreateView):
     model = WorkExperience
     form_class = WorkExperienceForm
     template_name = 'resume_builder/work_experience/work_experience_form.html'
     success_url = reverse_lazy('work_experience_list')
 
-    def form_valid(self, form):
-        # Ensure the resume belongs to the user
-        resume = form.cleaned_data['resume']
-        if resume.user != self.request.user:
-            form.add_error('resume', 'You do not own this resume.')
-            return self.form_invalid(form)
-        return super().form_valid(form)
-
-class WorkExperienceUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class WorkExperienceUpdateView(OwnerScopedMixin, ResumeChildFormMixin, UpdateView):
     model = WorkExperience
     form_class = WorkExperienceForm
     template_name = 'resume_builder/work_experience/work_experience_form.html'
     success_url = reverse_lazy('work_experience_list')
 
-    def test_func(self):
-        return self.get_object().resume.user == self.request.user
-
-class WorkExperienceDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class WorkExperienceDeleteView(OwnerScopedMixin, DeleteView):
     model = WorkExperience
     template_name = 'resume_builder/work_experience/work_experience_confirm_delete.html'
     success_url = reverse_lazy('work_experience_list')
 
-    def test_func(self):
-        return self.get_object().resume.user == self.request.user
-
-class WorkExperienceDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class WorkExperienceDetailView(OwnerScopedMixin, DetailView):
     model = WorkExperience
     template_name = 'resume_builder/work_experience/work_experience_detail.html'
     context_object_name = 'experience'
-
-    def test_func(self):
-        return self.get_object().resume.user == self.request.user
\ No newline at end of file
+    prefetch_related = ('technologies',)
@@ -0,0 +1,30 @@
+from django import forms
+from django.urls import reverse_lazy
+
+from resume_builder.cache import technologies
+
+
+class TechnologyAutocompleteWidget(forms.SelectMultiple):
+    """
+    Multi-select for Technology M2Ms that renders only the selected options.
+
+    The remaining technologies are fetched page by page from the technology
+    autocomplete API as the user types, so the form does not grow with the
+    size of the technology table.
+    """
+
+    class Media:
+        js = ['js/technology-autocomplete.js']
+
+    def __init__(self, attrs=None):
+        attrs = {'data-autocomplete-url': reverse_lazy('technology-autocomplete'), **(attrs or {})}
+        super().__init__(attrs)
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [technologies.get(int(pk)) for pk in value if str(pk).isdigit()]
+        choices = self.choices
+        try:
+            self.choices = [(obj.pk, obj.name) for obj in selected if obj is not None]
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
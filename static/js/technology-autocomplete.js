@@ -0,0 +1,79 @@
+/**
+ * Server-paged technology picker for <select multiple data-autocomplete-url>.
+ * Only the selected technologies are rendered by the server; matches for the
+ * typed text are fetched from the autocomplete API one page at a time.
+ */
+(function() {
+  "use strict";
+
+  const PAGE_SIZE = 10;
+
+  function init(select) {
+    const search = document.createElement('input');
+    search.type = 'search';
+    search.className = 'form-control mb-1';
+    search.placeholder = 'Search technologies…';
+    const results = document.createElement('div');
+    results.className = 'list-group mb-1';
+    const more = document.createElement('button');
+    more.type = 'button';
+    more.className = 'btn btn-link btn-sm d-none';
+    more.textContent = 'More results';
+    select.before(search, results, more);
+
+    let offset = 0;
+    let timer = null;
+    let controller = null;
+
+    function add(technology) {
+      let option = select.querySelector(`option[value="${technology.id}"]`);
+      if (!option) {
+        option = new Option(technology.name, technology.id);
+        select.add(option);
+      }
+      option.selected = true;
+    }
+
+    function render(technologies, append) {
+      if (!append) results.replaceChildren();
+      technologies.forEach(technology => {
+        const item = document.createElement('button');
+        item.type = 'button';
+        item.className = 'list-group-item list-group-item-action';
+        item.textContent = technology.name;
+        item.addEventListener('click', () => add(technology));
+        results.append(item);
+      });
+    }
+
+    function load(append) {
+      if (controller) controller.abort();
+      controller = new AbortController();
+      const url = new URL(select.dataset.autocompleteUrl, window.location.origin);
+      url.search = new URLSearchParams({q: search.value.trim(), limit: PAGE_SIZE, offset: offset});
+      fetch(url, {credentials: 'same-origin', headers: {Accept: 'application/json'}, signal: controller.signal})
+        .then(response => response.ok ? response.json() : Promise.reject(response))
+        .then(data => {
+          render(data.results, append);
+          more.classList.toggle('d-none', !data.more);
+        })
+        .catch(error => {
+          if (error.name !== 'AbortError') more.classList.add('d-none');
+        });
+    }
+
+    search.addEventListener('input', () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        offset = 0;
+        load(false);
+      }, 200);
+    });
+    more.addEventListener('click', () => {
+      offset += PAGE_SIZE;
+      load(true);
+    });
+  }
+
+  document.querySelectorAll('select[data-autocomplete-url]').forEach(init);
+})();